@@ -0,0 +1,44 @@
+"""Add sweep_watermarks table
+
+Revision ID: a1b5d9f3c7e2
+Revises: f6a0c4e8b2d1
+Create Date: 2026-10-17 15:00:00.000000
+
+증분 pulse sweep 의 high-water mark (shard 별 한 행). 비어 있으면 첫
+sweep 이 전체 평가를 하고 행을 만든다.
+
+monitoring_policies.quiet_end 인덱스 — "방해 금지 시간이 방금 끝난"
+사용자를 window 로 찾는 range scan 용.
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "a1b5d9f3c7e2"
+down_revision: Union[str, None] = "f6a0c4e8b2d1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sweep_watermarks",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("watermark", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_index(
+        op.f("ix_monitoring_policies_quiet_end"),
+        "monitoring_policies",
+        ["quiet_end"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_monitoring_policies_quiet_end"), table_name="monitoring_policies")
+    op.drop_table("sweep_watermarks")
@@ -0,0 +1,37 @@
+"""Composite (user_id, timestamp DESC, id DESC) index on activity_signals
+
+Revision ID: a4d2f8c6e0b7
+Revises: f1c7a3e9b5d2
+Create Date: 2026-10-17 21:00:00.000000
+
+`GET /signal/history` 의 keyset pagination — `(timestamp, id) < cursor`
+— 을 사용자 범위 안에서 index seek 한 번으로 처리한다. 선두 컬럼이
+user_id 이므로 기존 `ix_activity_signals_user_id` 는 중복이라 제거
+(가장 쓰기가 많은 테이블의 index 유지 비용 절감). partitioned table 의
+부모에 만들면 모든 월 partition 에 전파된다.
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "a4d2f8c6e0b7"
+down_revision: Union[str, None] = "f1c7a3e9b5d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_activity_signals_user_timestamp",
+        "activity_signals",
+        ["user_id", sa.text('"timestamp" DESC'), sa.text("id DESC")],
+    )
+    op.drop_index("ix_activity_signals_user_id", table_name="activity_signals")
+
+
+def downgrade() -> None:
+    op.create_index("ix_activity_signals_user_id", "activity_signals", ["user_id"])
+    op.drop_index("ix_activity_signals_user_timestamp", table_name="activity_signals")
@@ -0,0 +1,54 @@
+"""Add users.next_check_due_at for indexed inactivity sweeps
+
+Revision ID: a7c3e9d1f2b4
+Revises: b5c6d7e8f9a0
+Create Date: 2026-10-17 09:00:00.000000
+
+`last_active_at + monitoring_policies.threshold_hours` 를 미리 계산해 둔
+컬럼. PulseEngine 은 `next_check_due_at < now` 인덱스 range scan 으로
+due 사용자만 읽는다.
+
+Backfill: 정책이 있는 사용자만 채운다. last_active_at 이 NULL 인 사용자는
+"한 번도 활동 없음 = inactive" 이므로 now() 로 — 다음 sweep 에서 바로 검사.
+정책이 없는 사용자는 NULL (모니터링 대상 아님).
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "a7c3e9d1f2b4"
+down_revision: Union[str, None] = "b5c6d7e8f9a0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("next_check_due_at", sa.DateTime(), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE users u
+        SET next_check_due_at = COALESCE(
+            u.last_active_at + make_interval(hours => p.threshold_hours),
+            now() AT TIME ZONE 'utc'
+        )
+        FROM monitoring_policies p
+        WHERE p.user_id = u.id
+        """
+    )
+    op.create_index(
+        op.f("ix_users_next_check_due_at"),
+        "users",
+        ["next_check_due_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_users_next_check_due_at"), table_name="users")
+    op.drop_column("users", "next_check_due_at")
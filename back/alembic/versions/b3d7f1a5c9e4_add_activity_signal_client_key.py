@@ -0,0 +1,48 @@
+"""Add activity_signals.client_key for offline batch uploads
+
+Revision ID: b3d7f1a5c9e4
+Revises: a1b5d9f3c7e2
+Create Date: 2026-10-17 16:00:00.000000
+
+`POST /signal/heartbeat/batch` 는 기기가 만든 idempotency key 를 함께
+보낸다. (user_id, client_key) partial unique index 가 `ON CONFLICT DO
+NOTHING` 의 conflict target — 재전송된 업로드는 중복 없이 흡수된다.
+기존 행은 client_key 가 NULL 이라 인덱스에 들어가지 않는다.
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "b3d7f1a5c9e4"
+down_revision: Union[str, None] = "a1b5d9f3c7e2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "activity_signals",
+        sa.Column("client_key", sa.String(length=64), nullable=True),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_activity_signals_user_client_key",
+            "activity_signals",
+            ["user_id", "client_key"],
+            unique=True,
+            postgresql_where=sa.text("client_key IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "uq_activity_signals_user_client_key",
+            table_name="activity_signals",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("activity_signals", "client_key")
@@ -0,0 +1,50 @@
+"""Lease outbox rows while they are being sent
+
+Revision ID: b8e2c6a0d4f9
+Revises: a4d2f8c6e0b7
+Create Date: 2026-10-18 09:00:00.000000
+
+Dispatcher 가 claim 한 행을 SENDING 으로 바꾸고 커밋한 뒤 트랜잭션 밖에서
+발송한다 (외부 provider 호출 동안 row lock 을 잡지 않음). SENDING 행의
+`next_attempt_at` 은 lease 만료 시각 — 만료되면 다시 claim 된다.
+
+- outboxstatus 에 SENDING 추가 (downgrade 에서 값은 남겨둔다).
+- ix_notification_outbox_pending predicate 를 PENDING + SENDING 으로 확장.
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "b8e2c6a0d4f9"
+down_revision: Union[str, None] = "a4d2f8c6e0b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ADD VALUE 는 트랜잭션 밖에서 — 아래 인덱스 predicate 가 바로 쓴다.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE outboxstatus ADD VALUE IF NOT EXISTS 'SENDING'")
+    op.drop_index("ix_notification_outbox_pending", table_name="notification_outbox")
+    op.create_index(
+        "ix_notification_outbox_pending",
+        "notification_outbox",
+        ["next_attempt_at"],
+        unique=False,
+        postgresql_where=sa.text("status IN ('PENDING', 'SENDING')"),
+    )
+
+
+def downgrade() -> None:
+    op.execute("UPDATE notification_outbox SET status = 'PENDING' WHERE status = 'SENDING'")
+    op.drop_index("ix_notification_outbox_pending", table_name="notification_outbox")
+    op.create_index(
+        "ix_notification_outbox_pending",
+        "notification_outbox",
+        ["next_attempt_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
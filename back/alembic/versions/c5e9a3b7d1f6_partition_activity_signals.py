@@ -0,0 +1,157 @@
+"""Partition activity_signals by month; move client keys to their own table
+
+Revision ID: c5e9a3b7d1f6
+Revises: b3d7f1a5c9e4
+Create Date: 2026-10-17 17:00:00.000000
+
+`activity_signals` 를 `timestamp` 기준 월별 native range partition 으로
+재구성한다 (`activity_signals_yYYYYmMM`). 보존 기간이 지난 달은
+`signal_retention` 이 DETACH CONCURRENTLY + DROP 으로 통째로 버린다 —
+DELETE / vacuum 부담 없음.
+
+- partition key 는 PK 에 포함되어야 하므로 PK 는 (id, timestamp).
+- 같은 이유로 (user_id, client_key) unique index 를 둘 수 없어, batch
+  업로드 dedup 은 파티션 안 된 `signal_client_keys` 테이블로 옮긴다.
+- 기존 데이터가 있는 가장 오래된 달부터 현재 + 2개월까지 partition 을
+  만들고 한 번에 복사한다. 기존 테이블 크기에 비례하는 시간 동안
+  activity_signals 쓰기가 막히므로 점검 시간에 실행할 것.
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "c5e9a3b7d1f6"
+down_revision: Union[str, None] = "b3d7f1a5c9e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index("uq_activity_signals_user_client_key", table_name="activity_signals")
+    op.rename_table("activity_signals", "activity_signals_legacy")
+    op.execute("ALTER INDEX activity_signals_pkey RENAME TO activity_signals_legacy_pkey")
+    op.execute("ALTER INDEX ix_activity_signals_timestamp RENAME TO ix_activity_signals_legacy_timestamp")
+    op.execute("ALTER INDEX ix_activity_signals_user_id RENAME TO ix_activity_signals_legacy_user_id")
+
+    op.execute(
+        """
+        CREATE TABLE activity_signals (
+            id UUID NOT NULL,
+            user_id UUID NOT NULL REFERENCES users (id),
+            signal_type signaltype NOT NULL,
+            "timestamp" TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            device_info VARCHAR,
+            client_key VARCHAR(64),
+            PRIMARY KEY (id, "timestamp")
+        ) PARTITION BY RANGE ("timestamp")
+        """
+    )
+    op.create_index("ix_activity_signals_timestamp", "activity_signals", ["timestamp"])
+    op.create_index("ix_activity_signals_user_id", "activity_signals", ["user_id"])
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            m date;
+            last_month date;
+        BEGIN
+            SELECT date_trunc('month', coalesce(min("timestamp"), now() AT TIME ZONE 'utc'))::date
+              INTO m FROM activity_signals_legacy;
+            last_month := (date_trunc('month', now() AT TIME ZONE 'utc') + interval '2 months')::date;
+            WHILE m <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF activity_signals FOR VALUES FROM (%L) TO (%L)',
+                    'activity_signals_y' || to_char(m, 'YYYY') || 'm' || to_char(m, 'MM'),
+                    m,
+                    (m + interval '1 month')::date
+                );
+                m := (m + interval '1 month')::date;
+            END LOOP;
+        END $$
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO activity_signals (id, user_id, signal_type, "timestamp", device_info, client_key)
+        SELECT id, user_id, signal_type, "timestamp", device_info, client_key
+        FROM activity_signals_legacy
+        """
+    )
+
+    op.create_table(
+        "signal_client_keys",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("client_key", sa.String(length=64), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "client_key"),
+    )
+    op.create_index(
+        op.f("ix_signal_client_keys_created_at"),
+        "signal_client_keys",
+        ["created_at"],
+        unique=False,
+    )
+    op.execute(
+        """
+        INSERT INTO signal_client_keys (user_id, client_key, created_at)
+        SELECT user_id, client_key, max("timestamp")
+        FROM activity_signals_legacy
+        WHERE client_key IS NOT NULL
+        GROUP BY user_id, client_key
+        """
+    )
+    op.drop_table("activity_signals_legacy")
+
+
+def downgrade() -> None:
+    op.rename_table("activity_signals", "activity_signals_partitioned")
+    op.execute("ALTER INDEX ix_activity_signals_timestamp RENAME TO ix_activity_signals_partitioned_timestamp")
+    op.execute("ALTER INDEX ix_activity_signals_user_id RENAME TO ix_activity_signals_partitioned_user_id")
+    op.execute("ALTER INDEX activity_signals_pkey RENAME TO activity_signals_partitioned_pkey")
+
+    op.create_table(
+        "activity_signals",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "signal_type",
+            sa.Enum(
+                "APP_OPEN",
+                "APP_FOREGROUND",
+                "TOUCH_EVENT",
+                "HEARTBEAT",
+                "MANUAL_CHECKIN",
+                name="signaltype",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("timestamp", sa.DateTime(), nullable=False),
+        sa.Column("device_info", sa.String(), nullable=True),
+        sa.Column("client_key", sa.String(length=64), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.execute(
+        """
+        INSERT INTO activity_signals (id, user_id, signal_type, "timestamp", device_info, client_key)
+        SELECT id, user_id, signal_type, "timestamp", device_info, client_key
+        FROM activity_signals_partitioned
+        """
+    )
+    op.drop_table("activity_signals_partitioned")  # drops every partition with it
+    op.create_index("ix_activity_signals_timestamp", "activity_signals", ["timestamp"])
+    op.create_index("ix_activity_signals_user_id", "activity_signals", ["user_id"])
+    op.create_index(
+        "uq_activity_signals_user_client_key",
+        "activity_signals",
+        ["user_id", "client_key"],
+        unique=True,
+        postgresql_where=sa.text("client_key IS NOT NULL"),
+    )
+    op.drop_index(op.f("ix_signal_client_keys_created_at"), table_name="signal_client_keys")
+    op.drop_table("signal_client_keys")
@@ -0,0 +1,62 @@
+"""Add notification_outbox table
+
+Revision ID: c8d4f0a2e5b6
+Revises: a7c3e9d1f2b4
+Create Date: 2026-10-17 10:00:00.000000
+
+Transactional outbox — PulseEvent 변경과 같은 트랜잭션에서 알림 행을
+쓰고, NotificationDispatcher 가 `FOR UPDATE SKIP LOCKED` 로 배치 claim
+후 발송한다. FK 는 ON DELETE CASCADE — 계정 purge 시 함께 삭제.
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "c8d4f0a2e5b6"
+down_revision: Union[str, None] = "a7c3e9d1f2b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_outbox",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "kind",
+            sa.Enum("SOFT_CHECKIN", "GUARDIAN_ALERT", name="outboxkind"),
+            nullable=False,
+        ),
+        sa.Column("event_id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("PENDING", "SENT", "FAILED", name="outboxstatus"),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["event_id"], ["pulse_events.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_notification_outbox_pending",
+        "notification_outbox",
+        ["next_attempt_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notification_outbox_pending", table_name="notification_outbox")
+    op.drop_table("notification_outbox")
+    op.execute("DROP TYPE IF EXISTS outboxstatus")
+    op.execute("DROP TYPE IF EXISTS outboxkind")
@@ -0,0 +1,46 @@
+"""Add EMERGENCY / EXPIRED stage progression columns
+
+Revision ID: d2e6a8b0c4f7
+Revises: c8d4f0a2e5b6
+Create Date: 2026-10-17 12:00:00.000000
+
+- monitoring_policies.emergency_delay_minutes / event_expiry_hours —
+  정책별 타임아웃 (기존 행은 server_default 로 채움).
+- pulse_events.emergency_at — GUARDIAN_ALERT → EMERGENCY 시각.
+- outboxkind 에 EMERGENCY_ALERT 추가. Postgres 는 enum 값 삭제를
+  지원하지 않으므로 downgrade 에서 값은 남겨둔다 (사용되지 않을 뿐).
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "d2e6a8b0c4f7"
+down_revision: Union[str, None] = "c8d4f0a2e5b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "monitoring_policies",
+        sa.Column("emergency_delay_minutes", sa.Integer(), nullable=False, server_default="120"),
+    )
+    op.add_column(
+        "monitoring_policies",
+        sa.Column("event_expiry_hours", sa.Integer(), nullable=False, server_default="72"),
+    )
+    op.add_column("pulse_events", sa.Column("emergency_at", sa.DateTime(), nullable=True))
+
+    # ADD VALUE 는 트랜잭션 밖에서 실행해야 같은 배포의 코드가 바로 쓸 수 있다.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE outboxkind ADD VALUE IF NOT EXISTS 'EMERGENCY_ALERT'")
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM notification_outbox WHERE kind = 'EMERGENCY_ALERT'")
+    op.drop_column("pulse_events", "emergency_at")
+    op.drop_column("monitoring_policies", "event_expiry_hours")
+    op.drop_column("monitoring_policies", "emergency_delay_minutes")
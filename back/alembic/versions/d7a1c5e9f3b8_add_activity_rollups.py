@@ -0,0 +1,69 @@
+"""Add activity_rollups table
+
+Revision ID: d7a1c5e9f3b8
+Revises: c5e9a3b7d1f6
+Create Date: 2026-10-17 18:00:00.000000
+
+사용자 × 시간(UTC hour) × SignalType 별 signal 수. `activity_rollup`
+job 이 watermark (`sweep_watermarks.name = 'activity_rollup'`) 이후의
+닫힌 시간만 증분 집계한다. 첫 실행이 기존 이력 전체를 3시간 단위로
+따라잡는다. PK (user_id, hour, signal_type) 가 사용자별 기간 조회
+인덱스를 겸한다.
+
+watermark 행은 여기서 (가장 오래된 signal 의 시각으로) 미리 만든다.
+집계와 늦게 도착한 signal 쓰기가 이 행의 lock 으로 순서를 맞추므로,
+첫 집계 전에 행이 없으면 그 사이 쓰인 signal 이 집계에서 빠진다.
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "d7a1c5e9f3b8"
+down_revision: Union[str, None] = "c5e9a3b7d1f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "activity_rollups",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.Column(
+            "signal_type",
+            sa.Enum(
+                "APP_OPEN",
+                "APP_FOREGROUND",
+                "TOUCH_EVENT",
+                "HEARTBEAT",
+                "MANUAL_CHECKIN",
+                name="signaltype",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "hour", "signal_type"),
+    )
+    op.execute(
+        """
+        INSERT INTO sweep_watermarks (name, watermark, updated_at)
+        SELECT 'activity_rollup',
+               COALESCE(
+                   date_trunc('hour', min("timestamp")),
+                   date_trunc('hour', timezone('utc', now()))
+               ),
+               timezone('utc', now())
+        FROM activity_signals
+        ON CONFLICT (name) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM sweep_watermarks WHERE name = 'activity_rollup'")
+    op.drop_table("activity_rollups")
@@ -0,0 +1,39 @@
+"""Add activity_baselines table
+
+Revision ID: e2b8d4f6a1c3
+Revises: d7a1c5e9f3b8
+Create Date: 2026-10-17 19:00:00.000000
+
+사용자별 circadian baseline — 요일 × 시간(168 bucket) EWMA 활동 확률을
+float32 168개 (672 bytes) 고정 크기 blob 으로 저장한다. `activity_rollup`
+job 이 롤업 직후 `activity_baseline` watermark 이후의 시간을 접어 넣는다.
+첫 실행은 활동 이력이 있는 모든 사용자를 롤업 전체에서 재계산한다.
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "e2b8d4f6a1c3"
+down_revision: Union[str, None] = "d7a1c5e9f3b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "activity_baselines",
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("profile", sa.LargeBinary(), nullable=False),
+        sa.Column("observed_since", sa.DateTime(), nullable=False),
+        sa.Column("observed_through", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("activity_baselines")
@@ -0,0 +1,60 @@
+"""Add partial unique index for OPEN pulse events
+
+Revision ID: e4f8b2c6d0a9
+Revises: d2e6a8b0c4f7
+Create Date: 2026-10-17 13:00:00.000000
+
+사용자당 OPEN 이벤트는 하나 — `INSERT ... ON CONFLICT DO NOTHING` 의
+conflict target. SQLEnum 은 이름을 저장하므로 predicate 는 'OPEN'.
+
+인덱스 생성 전, 이미 존재하는 중복 OPEN 이벤트는 가장 최근 것만 남기고
+EXPIRED(auto_timeout) 로 닫는다. 인덱스는 CONCURRENTLY 로 만들어
+pulse_events 쓰기를 막지 않는다.
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "e4f8b2c6d0a9"
+down_revision: Union[str, None] = "d2e6a8b0c4f7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        UPDATE pulse_events
+        SET status = 'EXPIRED',
+            resolved_at = (now() AT TIME ZONE 'utc'),
+            resolution_method = 'auto_timeout'
+        WHERE status = 'OPEN'
+          AND id NOT IN (
+              SELECT DISTINCT ON (user_id) id
+              FROM pulse_events
+              WHERE status = 'OPEN'
+              ORDER BY user_id, created_at DESC
+          )
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_pulse_events_open_user",
+            "pulse_events",
+            ["user_id"],
+            unique=True,
+            postgresql_where=sa.text("status = 'OPEN'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "uq_pulse_events_open_user",
+            table_name="pulse_events",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,37 @@
+"""Add activity risk scores and outbox priority
+
+Revision ID: f1c7a3e9b5d2
+Revises: e2b8d4f6a1c3
+Create Date: 2026-10-17 20:00:00.000000
+
+- `activity_baselines.risk_score` / `risk_scored_at`: `activity_risk` job 이
+  매시간 최근 활동을 baseline 과 비교해 쓰는 점수 (NULL = 이력 부족).
+- `notification_outbox.priority`: 고위험 사용자의 알림을 먼저 claim.
+  기존 행은 0.
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "f1c7a3e9b5d2"
+down_revision: Union[str, None] = "e2b8d4f6a1c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("activity_baselines", sa.Column("risk_score", sa.Float(), nullable=True))
+    op.add_column("activity_baselines", sa.Column("risk_scored_at", sa.DateTime(), nullable=True))
+    op.add_column(
+        "notification_outbox",
+        sa.Column("priority", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("notification_outbox", "priority")
+    op.drop_column("activity_baselines", "risk_scored_at")
+    op.drop_column("activity_baselines", "risk_score")
@@ -0,0 +1,49 @@
+"""Add pulse_events.escalate_at with partial index
+
+Revision ID: f6a0c4e8b2d1
+Revises: e4f8b2c6d0a9
+Create Date: 2026-10-17 14:00:00.000000
+
+에스컬레이션 기한을 이벤트에 저장 — soft_check_sent_at +
+policy.escalation_delay_minutes (escalation_enabled=false 면 NULL).
+기존 OPEN/SOFT_CHECK 이벤트는 정책 값으로 backfill 한다.
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "f6a0c4e8b2d1"
+down_revision: Union[str, None] = "e4f8b2c6d0a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("pulse_events", sa.Column("escalate_at", sa.DateTime(), nullable=True))
+    op.execute(
+        """
+        UPDATE pulse_events AS e
+        SET escalate_at = e.soft_check_sent_at
+            + make_interval(mins => p.escalation_delay_minutes)
+        FROM monitoring_policies AS p
+        WHERE p.user_id = e.user_id
+          AND p.escalation_enabled
+          AND e.status = 'OPEN'
+          AND e.current_stage = 'SOFT_CHECK'
+        """
+    )
+    op.create_index(
+        "ix_pulse_events_escalate_at",
+        "pulse_events",
+        ["escalate_at"],
+        unique=False,
+        postgresql_where=sa.text("status = 'OPEN' AND current_stage = 'SOFT_CHECK'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pulse_events_escalate_at", table_name="pulse_events")
+    op.drop_column("pulse_events", "escalate_at")
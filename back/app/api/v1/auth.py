@@ -1,11 +1,11 @@
 import logging
-from datetime import datetime
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import clock
 from app.core.rate_limit import LOGIN_LIMITER, REGISTER_LIMITER
 from app.core.security import create_access_token, create_refresh_token, decode_refresh_token
 from app.db.session import get_db
@@ -199,7 +199,7 @@ async def complete_onboarding(
 ):
     """Mark onboarding as completed. Idempotent — safe to call multiple times."""
     if current_user.onboarding_completed_at is None:
-        current_user.onboarding_completed_at = datetime.utcnow()
+        current_user.onboarding_completed_at = clock.utcnow()
         db.add(current_user)
         await db.commit()
     return OnboardingResponse(
@@ -6,6 +6,7 @@ from typing import Annotated, Any
 from fastapi import APIRouter, Depends, status, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import clock
 from app.api.deps import get_db, get_current_user
 from app.core.rate_limit import GUARDIAN_INVITE_LIMITER
 from app.models.user import User
@@ -36,8 +37,8 @@ async def create_invitation(
 
     code = await guardian_service.create_invitation_code(current_user.id)
     # Expiration is hardcoded to 24h in service for now
-    from datetime import datetime, timedelta
-    expires_at = datetime.utcnow() + timedelta(days=1)
+    from datetime import timedelta
+    expires_at = clock.utcnow() + timedelta(days=1)
 
     audit_logger.info(
         "guardian_invitation_created",
@@ -1,16 +1,20 @@
 """Pulse API endpoints for Guardian Pulse."""
 
 from typing import Annotated
-from datetime import datetime
 
 from fastapi import APIRouter, Depends, status, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, and_
 
+from app.core import clock
+from app.db.expressions import is_const
 from app.api.deps import get_db, get_current_user
 from app.models.user import User
 from app.models.pulse_event import PulseEvent, PulseStatus
 from app.schemas.pulse import PulseResponseRequest, PulseResponseResponse
+from app.services.deadline_queue import pulse_deadlines
+from app.services.pulse_engine import mark_user_active
+from app.services.status_stream import publish_activity, publish_pulse
 
 router = APIRouter(prefix="/pulse", tags=["pulse"])
 
@@ -25,19 +29,18 @@ async def respond_to_pulse(
     
     User confirms they are okay.
     1. Updates any OPEN pulse events to RESOLVED.
-    2. Updates user's last_active_at.
+    2. Updates user's last_active_at (and next_check_due_at).
     """
     # 1. Update User's last_active_at
-    now = datetime.utcnow()
+    now = clock.utcnow()
     
-    current_user.last_active_at = now
-    db.add(current_user)
+    due_at = await mark_user_active(db, current_user.id, now)
     
     # 2. Find and resolve open pulse events
     query = select(PulseEvent).where(
         and_(
             PulseEvent.user_id == current_user.id,
-            PulseEvent.status == PulseStatus.OPEN,
+            is_const(PulseEvent.status, PulseStatus.OPEN),
         )
     )
     
@@ -53,9 +56,14 @@ async def respond_to_pulse(
         event.resolved_at = now
         event.resolved_by = current_user.id
         event.resolution_method = "user_response"
+        pulse_deadlines.discard(("event", event.id))
         resolved_count += 1
     
     await db.commit()
+
+    publish_activity(current_user.id, now, due_at)
+    for event in events:
+        publish_pulse(current_user.id, event.id, PulseStatus.RESOLVED)
     
     return PulseResponseResponse(
         success=True,
@@ -2,6 +2,7 @@
 
 import logging
 from typing import Annotated
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
@@ -17,12 +18,24 @@ from app.schemas.settings import (
     UpsellClickRequest,
     UpsellClickResponse,
 )
+from app.services import pulse_engine
 
 logger = logging.getLogger("inrem.upsell")
 
 router = APIRouter(prefix="/settings", tags=["settings"])
 
 
+async def _create_default_policy(db: AsyncSession, user_id: UUID) -> MonitoringPolicy:
+    """Create the default policy and schedule the user's first inactivity check."""
+    policy = MonitoringPolicy(user_id=user_id)
+    db.add(policy)
+    await db.flush()
+    await pulse_engine.refresh_next_check_due(db, user_id)
+    await db.commit()
+    await db.refresh(policy)
+    return policy
+
+
 @router.get("/policy", response_model=MonitoringPolicyResponse)
 async def get_policy(
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -35,11 +48,7 @@ async def get_policy(
     policy = result.scalar_one_or_none()
     
     if not policy:
-        # Create default policy if not exists
-        policy = MonitoringPolicy(user_id=current_user.id)
-        db.add(policy)
-        await db.commit()
-        await db.refresh(policy)
+        policy = await _create_default_policy(db, current_user.id)
     
     return policy
 
@@ -57,17 +66,18 @@ async def update_policy(
     policy = result.scalar_one_or_none()
     
     if not policy:
-        # Create default policy if not exists
-        policy = MonitoringPolicy(user_id=current_user.id)
-        db.add(policy)
-        await db.commit()
-        await db.refresh(policy)
+        policy = await _create_default_policy(db, current_user.id)
     
     # Update fields
     update_dict = update_data.model_dump(exclude_unset=True)
     for field, value in update_dict.items():
         setattr(policy, field, value)
 
+    if {"threshold_hours", "quiet_start", "quiet_end", "is_active"} & update_dict.keys():
+        await pulse_engine.refresh_next_check_due(db, current_user.id)
+    if {"escalation_enabled", "escalation_delay_minutes"} & update_dict.keys():
+        await pulse_engine.refresh_escalate_at(db, current_user.id)
+
     await db.commit()
     await db.refresh(policy)
 
@@ -1,26 +1,42 @@
 """Signal API endpoints for Guardian Pulse."""
 
+from datetime import datetime
+from functools import partial
 from typing import Annotated
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_current_user
-from app.core.rate_limit import HEARTBEAT_LIMITER
+from app.api.deps import get_db, get_current_user, oauth2_scheme
+from app.core import clock
+from app.core.config import settings
+from app.core.rate_limit import HEARTBEAT_BATCH_LIMITER, HEARTBEAT_LIMITER
+from app.core.security import access_token_expires_at
+from app.db.session import async_session
+from app.db.expressions import is_const
+from app.models.activity_signal import SignalType
+from app.models.pulse_event import PulseEvent, PulseStatus
 from app.models.user import User
+from app.repositories import user_repository
 from app.schemas.signal import (
+    HeartbeatBatchRequest,
+    HeartbeatBatchResponse,
     HeartbeatRequest,
     HeartbeatResponse,
+    SignalHistoryResponse,
     StatusResponse,
 )
-from app.services import signal_service
+from app.services import guardian_service, signal_service, status_stream
+from app.services.heartbeat_buffer import heartbeat_buffer
 
 router = APIRouter(prefix="/signal", tags=["signal"])
 
 
 @router.post("/heartbeat", response_model=HeartbeatResponse, status_code=status.HTTP_200_OK)
 async def send_heartbeat(
-    db: Annotated[AsyncSession, Depends(get_db)],
     current_user: Annotated[User, Depends(get_current_user)],
     request: HeartbeatRequest | None = None,
 ):
@@ -34,6 +50,9 @@ async def send_heartbeat(
     The server will:
     - Update the user's last_active_at timestamp
     - Record the activity signal for analytics
+
+    Both are written behind: the heartbeat is buffered in-process and
+    flushed in batches within `HEARTBEAT_FLUSH_INTERVAL_SECONDS`.
     """
     # Rate-limit: 분당 60회 (1초 1회). 정상 흐름은 app_open + ~30s 주기 →
     # 충분히 여유 있지만 무한 reset 공격은 차단.
@@ -42,17 +61,48 @@ async def send_heartbeat(
     signal_type = request.signal_type if request else None
     device_info = request.device_info if request else None
 
-    signal, last_active_at = await signal_service.record_heartbeat(
-        db=db,
+    heartbeat = signal_service.buffer_heartbeat(
         user_id=current_user.id,
-        signal_type=signal_type,
+        signal_type=signal_type or SignalType.HEARTBEAT,
         device_info=device_info,
     )
     
     return HeartbeatResponse(
         success=True,
-        last_active_at=last_active_at,
-        signal_id=signal.id,
+        last_active_at=heartbeat.timestamp,
+        signal_id=heartbeat.id,
+    )
+
+
+@router.post(
+    "/heartbeat/batch",
+    response_model=HeartbeatBatchResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def send_heartbeat_batch(
+    request: HeartbeatBatchRequest,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+):
+    """Upload the signals a device recorded while offline (≤500 per call).
+
+    Each signal carries a device-generated `client_key`; re-sending the
+    same upload after a timeout is safe (duplicates are skipped).
+    Timestamps are clamped against the server clock and `last_active_at`
+    advances to the latest accepted one.
+    """
+    HEARTBEAT_BATCH_LIMITER.check(f"hbb:{current_user.id}")
+
+    result = await signal_service.record_heartbeat_batch(
+        db=db,
+        user_id=current_user.id,
+        items=request.signals,
+    )
+    return HeartbeatBatchResponse(
+        accepted=result.accepted,
+        duplicates=result.duplicates,
+        dropped=result.dropped,
+        last_active_at=result.last_active_at,
     )
 
 
@@ -67,6 +117,127 @@ async def get_status(
     signal.
     """
     return StatusResponse(
-        last_active_at=current_user.last_active_at,
+        last_active_at=_last_active_at(current_user),
         deletion_requested_at=current_user.deletion_requested_at,
     )
+
+
+def _last_active_at(user: User):
+    # Read-your-writes: a heartbeat still in this worker's buffer is newer
+    # than the stored value.
+    last_active_at = user.last_active_at
+    pending = heartbeat_buffer.pending_last_active(user.id)
+    if pending is not None and (last_active_at is None or pending > last_active_at):
+        last_active_at = pending
+    return last_active_at
+
+
+@router.get("/stream")
+async def stream_status(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    token: Annotated[str, Depends(oauth2_scheme)],
+):
+    """Server-Sent Events stream of the Pulse status — replaces polling `/status`.
+
+    Authenticated on connect; every keepalive re-checks that the access
+    token has not expired and the user is still active, and closes the
+    stream otherwise. Events:
+    - `status` — snapshot on connect: `last_active_at`,
+      `next_check_due_at`, `deletion_requested_at` and the open pulse
+      event (`event_id`, `status`, `stage`) or null.
+    - `activity` — `last_active_at` / `next_check_due_at` changed.
+    - `pulse` — the open pulse event changed stage or was closed.
+
+    A `: keepalive` comment is sent every
+    `STATUS_STREAM_KEEPALIVE_SECONDS` on an idle stream. Reconnect and
+    you get a fresh snapshot.
+    """
+    if status_stream.status_hub.count(current_user.id) >= settings.STATUS_STREAM_MAX_PER_USER:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="열려 있는 상태 스트림이 너무 많아요.",
+        )
+    event = (
+        await db.execute(
+            select(PulseEvent.id, PulseEvent.status, PulseEvent.current_stage)
+            .where(PulseEvent.user_id == current_user.id, is_const(PulseEvent.status, PulseStatus.OPEN))
+            .limit(1)
+        )
+    ).first()
+    snapshot = {
+        **StatusResponse(
+            last_active_at=_last_active_at(current_user),
+            deletion_requested_at=current_user.deletion_requested_at,
+        ).model_dump(mode="json"),
+        "next_check_due_at": status_stream.iso(current_user.next_check_due_at),
+        "pulse": (
+            {
+                "event_id": str(event.id),
+                "status": event.status.value,
+                "stage": event.current_stage.value,
+            }
+            if event is not None
+            else None
+        ),
+    }
+    # The snapshot is read before the response starts: the stream itself
+    # holds no DB session.
+    authorized = partial(_stream_authorized, current_user.id, access_token_expires_at(token))
+    return StreamingResponse(
+        status_stream.sse_events(current_user.id, snapshot, authorized),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _stream_authorized(user_id: UUID, expires_at: datetime | None) -> bool:
+    """Whether an open `/stream` may go on: token unexpired, user still active."""
+    if expires_at is None or clock.utcnow() >= expires_at:
+        return False
+    async with async_session() as db:
+        user = await user_repository.get_user_by_id(db, user_id)
+    return user is not None and user.is_active
+
+
+@router.get("/history", response_model=SignalHistoryResponse)
+async def get_history(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    ward_id: UUID | None = Query(
+        default=None,
+        description="보호 대상자의 이력 조회 (보호자만). 생략 시 본인.",
+    ),
+    cursor: str | None = Query(default=None, max_length=200),
+    limit: int = Query(default=50, ge=1, le=200),
+    since: datetime | None = None,
+    signal_type: list[SignalType] | None = Query(default=None),
+    resolution: signal_service.HistoryResolution = "raw",
+):
+    """Page through activity history, newest first (timeline screens).
+
+    Cursor (keyset) pagination: every page costs the same however deep
+    the history. `resolution=hour|day` returns per-bucket counts from the
+    hourly rollups instead of individual signals — for long ranges.
+    """
+    user_id = current_user.id
+    if ward_id is not None and ward_id != current_user.id:
+        if not await guardian_service.is_guardian_of(db, current_user.id, ward_id):
+            raise HTTPException(status_code=404, detail="Ward not found")
+        user_id = ward_id
+
+    page = await signal_service.get_signal_history(
+        db,
+        user_id,
+        cursor=cursor,
+        limit=limit,
+        since=since,
+        signal_types=signal_type,
+        resolution=resolution,
+    )
+    return SignalHistoryResponse(
+        resolution=resolution,
+        signals=page.signals,
+        buckets=page.buckets,
+        next_cursor=page.next_cursor,
+    )
@@ -0,0 +1,153 @@
+"""Injectable clock — the single source of "now" for services and schedulers.
+
+Everything time-dependent (pulse sweeps, timers, purge grace, deadline
+queue, scheduler loops) reads time and sleeps through the process-wide
+clock instead of calling `datetime.utcnow()` / `asyncio.sleep()`:
+
+    from app.core import clock
+    now = clock.utcnow()
+    await clock.sleep(600)
+
+Production uses `SystemClock`. Tests and soak simulations install a
+`ManualClock` and fast-forward it, so 30 days of scheduler behaviour run
+in seconds:
+
+    manual = ManualClock(datetime(2026, 1, 1))
+    clock.set_clock(manual)
+    await manual.advance(timedelta(days=30))
+
+What deliberately stays on wall-clock time: JWT expiry (python-jose
+validates `exp` against the system clock), rate-limit windows and
+latency measurements (`time.perf_counter`), and provider call timeouts.
+
+Convention: naive UTC datetimes, matching the DB columns.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+
+
+class Clock(ABC):
+    """Interface. `now()` is naive UTC."""
+
+    @abstractmethod
+    def now(self) -> datetime: ...
+
+    @abstractmethod
+    async def sleep(self, seconds: float) -> None: ...
+
+    @abstractmethod
+    async def wait(self, event: asyncio.Event, timeout: float) -> bool:
+        """Wait for `event` up to `timeout` seconds. True if it was set."""
+
+
+class SystemClock(Clock):
+    """Real time."""
+
+    def now(self) -> datetime:
+        return datetime.utcnow()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(max(0.0, seconds))
+
+    async def wait(self, event: asyncio.Event, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(event.wait(), timeout=max(0.0, timeout))
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class ManualClock(Clock):
+    """Clock that only moves when `advance()` / `set()` is called.
+
+    Sleepers wake in deadline order; after each wake-up the event loop
+    gets `settle_iterations` turns so the woken tasks run (and schedule
+    their next sleep) before time moves on.
+    """
+
+    def __init__(self, start: datetime, *, settle_iterations: int = 50) -> None:
+        self._now = start
+        self.settle_iterations = settle_iterations
+        self._sleepers: list[tuple[datetime, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    def now(self) -> datetime:
+        return self._now
+
+    async def sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._sleepers,
+            (self._now + timedelta(seconds=seconds), next(self._seq), future),
+        )
+        await future
+
+    async def wait(self, event: asyncio.Event, timeout: float) -> bool:
+        if event.is_set():
+            return True
+        waiter = asyncio.ensure_future(event.wait())
+        timer = asyncio.ensure_future(self.sleep(timeout))
+        try:
+            done, _ = await asyncio.wait({waiter, timer}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            # Also on cancellation of the waiting task.
+            waiter.cancel()
+            timer.cancel()
+        return waiter in done
+
+    async def _settle(self) -> None:
+        for _ in range(self.settle_iterations):
+            await asyncio.sleep(0)
+
+    async def advance(self, delta: timedelta | float) -> None:
+        """Move time forward, waking every sleeper whose deadline passes."""
+        if not isinstance(delta, timedelta):
+            delta = timedelta(seconds=delta)
+        await self.set(self._now + delta)
+
+    async def set(self, target: datetime) -> None:
+        """Jump to `target` (never backwards), stepping through sleeper deadlines."""
+        await self._settle()  # let freshly created tasks register their sleeps
+        while self._sleepers and self._sleepers[0][0] <= target:
+            wake_at, _, future = heapq.heappop(self._sleepers)
+            self._now = max(self._now, wake_at)
+            if not future.done():
+                future.set_result(None)
+            await self._settle()
+        self._now = max(self._now, target)
+        await self._settle()
+
+
+_clock: Clock = SystemClock()
+
+
+def get_clock() -> Clock:
+    return _clock
+
+
+def set_clock(new_clock: Clock) -> Clock:
+    """Install `new_clock` process-wide. Returns the previous one (to restore)."""
+    global _clock
+    previous, _clock = _clock, new_clock
+    return previous
+
+
+def utcnow() -> datetime:
+    """Current naive-UTC time from the installed clock."""
+    return _clock.now()
+
+
+async def sleep(seconds: float) -> None:
+    await _clock.sleep(seconds)
+
+
+async def wait(event: asyncio.Event, timeout: float) -> bool:
+    return await _clock.wait(event, timeout)
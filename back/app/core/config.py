@@ -21,6 +21,8 @@ class Settings(BaseSettings):
     # Observability
     LOG_LEVEL: str = "INFO"
     SENTRY_DSN: str | None = None  # Optional: errors → Sentry when set
+    # Bearer token Prometheus sends to scrape /metrics. Unset → no /metrics.
+    METRICS_TOKEN: str | None = None
 
     # CORS — comma-separated list of allowed origins.
     # Empty / unset 이면 RN dev 환경(localhost·LAN IP) 만 허용 (개발 안전).
@@ -33,6 +35,78 @@ class Settings(BaseSettings):
     GMAIL_APP_PASSWORD: str | None = None
     GMAIL_FROM_NAME: str | None = None  # 발신자 표시 이름, 기본 "InRem"
 
+    # Background sweeps — number of hash shards the pulse sweep is split
+    # into. Each shard is claimed with a Postgres advisory lock, so N
+    # workers/nodes can sweep in parallel without double notifications.
+    PULSE_SHARD_COUNT: int = 1
+
+    # Notification fan-out — max in-flight push/email calls per sweep and
+    # per-call timeout (seconds). A hung FCM call can't stall the sweep.
+    NOTIFICATION_CONCURRENCY: int = 50
+    NOTIFICATION_TIMEOUT_SECONDS: float = 10.0
+
+    # Notification outbox dispatcher — rows claimed per batch, delivery
+    # attempts before a row is marked FAILED, idle poll interval (seconds),
+    # and how long a claimed batch is leased to its dispatcher (must exceed
+    # the time to send one batch; an expired lease is claimed again).
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 5.0
+    OUTBOX_LEASE_SECONDS: float = 300.0
+
+    # Heartbeat write-behind buffer — `last_active_at` is coalesced per user
+    # and flushed every FLUSH_INTERVAL seconds or once MAX_ENTRIES users are
+    # pending. The pulse sweep evaluates inactivity as of
+    # `now - MAX_STALENESS`, so MAX_STALENESS must exceed the flush interval
+    # (plus flush time) on every worker.
+    HEARTBEAT_FLUSH_INTERVAL_SECONDS: float = 2.0
+    HEARTBEAT_BUFFER_MAX_ENTRIES: int = 1000
+    HEARTBEAT_MAX_STALENESS_SECONDS: float = 10.0
+
+    # Activity signal ingest queue — rows written per batch (COPY on
+    # Postgres), idle flush interval, queue size at which heartbeats are
+    # rejected with 503 (backpressure), and failed writes of a batch
+    # before it is retried row by row (dropping rows the DB rejects).
+    SIGNAL_INGEST_BATCH_SIZE: int = 1000
+    SIGNAL_INGEST_FLUSH_INTERVAL_SECONDS: float = 1.0
+    SIGNAL_INGEST_QUEUE_MAX: int = 50_000
+    SIGNAL_INGEST_MAX_ATTEMPTS: int = 3
+
+    # Offline batch upload — signals older than this are dropped (device
+    # clock nonsense or a week+ offline); future ones are clamped to now.
+    SIGNAL_BATCH_MAX_AGE_HOURS: int = 7 * 24
+
+    # Hourly activity rollups — an hour is rolled up once it ended this
+    # many seconds ago (covers the ingest queue flush delay).
+    ACTIVITY_ROLLUP_SETTLE_SECONDS: int = 5 * 60
+
+    # Circadian baselines (168 hour-of-week EWMA buckets per user) — weeks
+    # for an old observation to lose half its weight, weeks observed before
+    # deviations are flagged, and the expected active hours a silence must
+    # have missed to count as "much later than usual".
+    BASELINE_HALF_LIFE_WEEKS: float = 4.0
+    BASELINE_MIN_WEEKS: int = 2
+    BASELINE_DEVIATION_HOURS: float = 3.0
+
+    # Activity risk scoring (hourly, after the rollup) — hours of recent
+    # activity compared with the baseline, users per NumPy chunk, and the
+    # score from which the user's alerts are dispatched first.
+    ACTIVITY_RISK_WINDOW_HOURS: int = 24
+    ACTIVITY_RISK_CHUNK_USERS: int = 5000
+    ACTIVITY_RISK_PRIORITY_SCORE: float = 2.0
+
+    # Status stream (`GET /signal/stream`, SSE) — seconds between keepalive
+    # comments on an idle stream, and open streams allowed per user.
+    STATUS_STREAM_KEEPALIVE_SECONDS: float = 25.0
+    STATUS_STREAM_MAX_PER_USER: int = 5
+
+    # activity_signals retention (Postgres monthly partitions) — full
+    # months kept before the current one, partitions created ahead, and
+    # whether closed months get a BRIN index on `timestamp`.
+    SIGNAL_RETENTION_MONTHS: int = 13
+    SIGNAL_PARTITIONS_AHEAD: int = 2
+    SIGNAL_BRIN_CLOSED_PARTITIONS: bool = True
+
     # Database
     POSTGRES_SERVER: str
     POSTGRES_USER: str
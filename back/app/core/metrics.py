@@ -0,0 +1,201 @@
+"""In-process metrics registry with Prometheus text exposition.
+
+No client library — counters, gauges and histograms are plain dicts
+behind a lock, rendered by `GET /metrics` in the Prometheus text format
+(v0.0.4) so any scraper (Prometheus, Grafana Agent, Datadog OpenMetrics)
+can collect them.
+
+Usage:
+    SWEEPS = metrics.counter("inrem_pulse_sweeps_total", "Pulse sweeps run")
+    SWEEPS.inc()
+    LATENCY = metrics.histogram("inrem_x_seconds", "...", buckets=(0.1, 1, 10))
+    LATENCY.observe(0.42, phase="select")
+
+Values are per process. With several uvicorn workers each one exposes
+its own numbers — scrape every worker (or sum in the query).
+"""
+from __future__ import annotations
+
+import math
+from threading import Lock
+from typing import Iterable
+
+LabelKey = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _label_key(labels: dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    body = ",".join(
+        '%s="%s"' % (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in pairs
+    )
+    return "{%s}" % body
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+        self._lock = Lock()
+
+    def _samples(self) -> Iterable[str]:  # pragma: no cover - overridden
+        return ()
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        super().__init__(name, documentation)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1, **labels: object) -> None:
+        if amount < 0:
+            raise ValueError("counters can only increase")
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: object) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down (last value wins)."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        super().__init__(name, documentation)
+        self._values: dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: object) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def value(self, **labels: object) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram (`_bucket`, `_sum`, `_count` series)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label key → (per-bucket counts, sum)
+        self._values: dict[LabelKey, tuple[list[int], float]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels: object) -> int:
+        counts, _ = self._values.get(_label_key(labels)) or ([0], 0.0)
+        return sum(counts)
+
+    def _samples(self) -> Iterable[str]:
+        with self._lock:
+            items = [(k, (list(c), s)) for k, (c, s) in self._values.items()]
+        lines: list[str] = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = (("le", _format_value(bound)),)
+                lines.append(f"{self.name}_bucket{_format_labels(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every metric of the process. Registering a name twice returns the same object."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = Lock()
+
+    def _register(self, cls: type[_Metric], name: str, *args: object) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(name)
+            if existing is not None:
+                if not isinstance(existing, cls):
+                    raise ValueError(f"metric {name} already registered as {existing.kind}")
+                return existing
+            metric = cls(name, *args)
+            self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        return self._register(Counter, name, documentation)  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str) -> Gauge:
+        return self._register(Gauge, name, documentation)  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, buckets)  # type: ignore[return-value]
+
+    def render(self) -> str:
+        """Prometheus text exposition of every registered metric."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(m.render() for m in metrics) + "\n"
+
+
+metrics = MetricsRegistry()
+"""Process-wide registry; exposed at `GET /metrics`."""
@@ -82,6 +82,13 @@ infinitely by hammering heartbeats. Legitimate flow is `app_open` +
 periodic foreground heartbeats every ~30s — well under this ceiling.
 """
 
+HEARTBEAT_BATCH_LIMITER = SlidingWindowRateLimiter(limit=10, window_seconds=60.0)
+"""Per-user limiter for `/signal/heartbeat/batch` (10 uploads / minute).
+
+A device uploads once after reconnecting (plus a retry or two); each
+upload carries up to 500 signals.
+"""
+
 UPSELL_CLICK_LIMITER = SlidingWindowRateLimiter(limit=30, window_seconds=60.0)
 """Per-user limiter for `/settings/upsell/click` (30 clicks / minute).
 
@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Any, Literal
 
 from jose import JWTError, jwt
@@ -80,13 +80,32 @@ def decode_refresh_token(token: str) -> str | None:
     return _decode_with_type(token, expected_type=REFRESH_TYPE)
 
 
-def _decode_with_type(token: str, *, expected_type: TokenType) -> str | None:
+def access_token_expires_at(token: str) -> datetime | None:
+    """`exp` of a valid access token as naive UTC, or None if invalid.
+
+    Lets long-lived connections (status stream) end when the token they
+    were opened with expires.
+    """
+    payload = _decode_payload(token, expected_type=ACCESS_TYPE)
+    if payload is None or not isinstance(payload.get("exp"), (int, float)):
+        return None
+    return datetime.fromtimestamp(payload["exp"], timezone.utc).replace(tzinfo=None)
+
+
+def _decode_payload(token: str, *, expected_type: TokenType) -> dict | None:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
     except JWTError:
         return None
     if payload.get("type") != expected_type:
         return None
+    return payload
+
+
+def _decode_with_type(token: str, *, expected_type: TokenType) -> str | None:
+    payload = _decode_payload(token, expected_type=expected_type)
+    if payload is None:
+        return None
     subject = payload.get("sub")
     if not isinstance(subject, str):
         return None
@@ -0,0 +1,56 @@
+"""Postgres advisory locks for coordinating background sweeps across workers.
+
+Every uvicorn worker / node runs the same schedulers. Before a sweep (or a
+shard of one) runs, the worker calls `pg_try_advisory_lock`; if another
+worker already holds it the sweep is skipped for this tick.
+
+Locks are session-level and tied to one connection, so the sweep's
+session is pinned to that connection for its whole lifetime (commits
+included). If a worker dies, Postgres drops the connection and releases
+its locks — the next worker to tick takes the shard over.
+
+On non-Postgres dialects (SQLite tests) locking is a no-op.
+"""
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+# First key of the two-int advisory lock form — one per sweep type.
+PULSE_SHARD_LOCK = 7301
+ACCOUNT_PURGE_LOCK = 7302
+SIGNAL_RETENTION_LOCK = 7303
+ACTIVITY_ROLLUP_LOCK = 7304
+
+
+@asynccontextmanager
+async def try_advisory_lock(
+    engine: AsyncEngine,
+    lock_class: int,
+    lock_id: int = 0,
+) -> AsyncIterator[AsyncSession | None]:
+    """Try to take `(lock_class, lock_id)` without blocking.
+
+    Yields a session bound to the lock-holding connection, or `None` when
+    another worker holds the lock.
+    """
+    async with engine.connect() as conn:
+        use_lock = conn.dialect.name == "postgresql"
+        if use_lock:
+            acquired = (
+                await conn.execute(select(func.pg_try_advisory_lock(lock_class, lock_id)))
+            ).scalar()
+            await conn.commit()
+            if not acquired:
+                yield None
+                return
+        try:
+            async with AsyncSession(bind=conn, expire_on_commit=False) as session:
+                yield session
+        finally:
+            if use_lock:
+                await conn.execute(select(func.pg_advisory_unlock(lock_class, lock_id)))
+                await conn.commit()
@@ -0,0 +1,137 @@
+"""Dialect-portable SQL expressions for set-based queries.
+
+Production runs on Postgres, but the integration tests use in-memory
+SQLite. These constructs let a single query be compiled for both without
+`if dialect == ...` branches at the call site.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import DateTime, Integer, Text, Uuid, cast, func, literal, literal_column
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class add_minutes(FunctionElement):
+    """`timestamp + N minutes` where N may be a column expression.
+
+    Usage: `add_minutes(User.last_active_at, MonitoringPolicy.threshold_hours * 60)`.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+    name = "add_minutes"
+
+
+@compiles(add_minutes)
+def _add_minutes_default(element: add_minutes, compiler: Any, **kw: Any) -> str:
+    ts, minutes = list(element.clauses)
+    return "(%s + make_interval(mins => %s))" % (
+        compiler.process(ts, **kw),
+        compiler.process(minutes, **kw),
+    )
+
+
+@compiles(add_minutes, "sqlite")
+def _add_minutes_sqlite(element: add_minutes, compiler: Any, **kw: Any) -> str:
+    ts, minutes = list(element.clauses)
+    # SQLite `datetime()` drops microseconds — fine for tests.
+    return "datetime(%s, '+' || (%s) || ' minutes')" % (
+        compiler.process(ts, **kw),
+        compiler.process(minutes, **kw),
+    )
+
+
+class hour_floor(FunctionElement):
+    """Timestamp truncated to the hour (`date_trunc('hour', ts)`)."""
+
+    type = DateTime()
+    inherit_cache = True
+    name = "hour_floor"
+
+
+@compiles(hour_floor)
+def _hour_floor_default(element: hour_floor, compiler: Any, **kw: Any) -> str:
+    (ts,) = list(element.clauses)
+    return "date_trunc('hour', %s)" % compiler.process(ts, **kw)
+
+
+@compiles(hour_floor, "sqlite")
+def _hour_floor_sqlite(element: hour_floor, compiler: Any, **kw: Any) -> str:
+    (ts,) = list(element.clauses)
+    # Same text format SQLAlchemy's DateTime stores on SQLite, so the
+    # result compares / conflicts equal to bound datetimes.
+    return "strftime('%%Y-%%m-%%d %%H:00:00.000000', %s)" % compiler.process(ts, **kw)
+
+
+class new_uuid(FunctionElement):
+    """Server-side random UUID, so `INSERT ... SELECT` can mint primary keys."""
+
+    type = Uuid()
+    inherit_cache = True
+    name = "new_uuid"
+
+
+@compiles(new_uuid)
+def _new_uuid_default(element: new_uuid, compiler: Any, **kw: Any) -> str:
+    return "gen_random_uuid()"
+
+
+@compiles(new_uuid, "sqlite")
+def _new_uuid_sqlite(element: new_uuid, compiler: Any, **kw: Any) -> str:
+    # SQLAlchemy stores UUIDs on SQLite as 32-char hex strings.
+    return "lower(hex(randomblob(16)))"
+
+
+class shard_of(FunctionElement):
+    """Stable hash shard `0 .. shard_count-1` of a UUID column.
+
+    Usage: `shard_of(User.id, 4) == 2`.
+    """
+
+    type = Integer()
+    inherit_cache = True
+    name = "shard_of"
+
+
+@compiles(shard_of)
+def _shard_of_default(element: shard_of, compiler: Any, **kw: Any) -> str:
+    column, shard_count = list(element.clauses)
+    # Mask the sign bit instead of abs(): abs(-2^31) overflows int4.
+    hashed = func.hashtext(cast(column, Text)).op("&")(literal_column("2147483647"))
+    return compiler.process(hashed % shard_count, **kw)
+
+
+@compiles(shard_of, "sqlite")
+def _shard_of_sqlite(element: shard_of, compiler: Any, **kw: Any) -> str:
+    column, shard_count = list(element.clauses)
+    # Last hex digit of the stored UUID — 16 buckets is plenty for tests.
+    digit = func.instr(literal_column("'0123456789abcdef'"), func.substr(column, -1)) - 1
+    return compiler.process(digit % shard_count, **kw)
+
+
+def is_const(column: Any, value: Any):
+    """`column = <value>` with the value inlined in the SQL, not bound.
+
+    Use for the constant side of partial-index predicates
+    (`WHERE status = 'OPEN'`). With a bind parameter Postgres can only
+    prove the index predicate for a custom plan; once a prepared statement
+    (asyncpg caches them) switches to a generic plan the partial index is
+    no longer usable.
+
+    Usage: `is_const(PulseEvent.status, PulseStatus.OPEN)`.
+    """
+    return column == literal(value, column.type, literal_execute=True)
+
+
+def dialect_insert(db: AsyncSession, entity: Any):
+    """`INSERT` construct of the session's dialect, for `ON CONFLICT` clauses.
+
+    Postgres and SQLite share the `on_conflict_do_nothing` /
+    `on_conflict_do_update` API, so callers stay dialect-agnostic.
+    """
+    dialect = {"postgresql": postgresql, "sqlite": sqlite}[db.get_bind().dialect.name]
+    return dialect.insert(entity)
@@ -1,7 +1,12 @@
+import secrets
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from typing import Annotated
+
+from fastapi import FastAPI, Header, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.core.config import settings
+from app.core.metrics import metrics
 from app.core.logging import configure_logging, configure_sentry
 from app.api.v1 import api_v1_router
 from app.services.scheduler import start_scheduler, stop_scheduler
@@ -63,3 +68,18 @@ def read_root():
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics_endpoint(authorization: Annotated[str | None, Header()] = None):
+    """Prometheus text exposition of in-process metrics (pulse sweep, outbox).
+
+    Internal only: served when `METRICS_TOKEN` is set, to scrapers sending
+    `Authorization: Bearer <METRICS_TOKEN>`. Otherwise it does not exist.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if not secrets.compare_digest(authorization or "", f"Bearer {token}"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
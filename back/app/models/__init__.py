@@ -5,9 +5,13 @@ from app.models.record import Record
 from app.models.audit import AuditLog
 
 # Guardian Pulse models
-from app.models.activity_signal import ActivitySignal, SignalType
+from app.models.activity_signal import ActivitySignal, SignalClientKey, SignalType
 from app.models.monitoring_policy import MonitoringPolicy, SensitivityLevel
 from app.models.pulse_event import PulseEvent, PulseStage, PulseStatus
+from app.models.activity_rollup import ActivityRollup
+from app.models.activity_baseline import ActivityBaseline
 
 from app.models.user_config import UserConfig
 from app.models.timer_status import TimerStatus, TimerState
+from app.models.notification_outbox import NotificationOutbox, OutboxKind, OutboxStatus
+from app.models.sweep_watermark import SweepWatermark
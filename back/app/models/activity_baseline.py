@@ -0,0 +1,33 @@
+"""ActivityBaseline model — per-user circadian (hour-of-week) activity profile.
+
+`profile` is a fixed-size blob: 168 little-endian float32 EWMA values,
+one per hour of the week (Monday 00:00 UTC = bucket 0). See
+`activity_baseline` for how it is maintained and read, and
+`activity_risk` for the risk score written next to it.
+"""
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, LargeBinary
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core import clock
+from app.db.base import Base
+
+
+class ActivityBaseline(Base):
+    """EWMA probability of the user being active in each hour of the week."""
+    __tablename__ = "activity_baselines"
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    profile = Column(LargeBinary, nullable=False)  # 168 × float32 (672 bytes)
+    # Hours folded into the profile: [observed_since, observed_through).
+    observed_since = Column(DateTime, nullable=False)
+    observed_through = Column(DateTime, nullable=False)
+    # Recent activity deficit vs. the profile (`activity_risk`); NULL until
+    # the baseline has enough history.
+    risk_score = Column(Float, nullable=True)
+    risk_scored_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, nullable=False, default=clock.utcnow, onupdate=clock.utcnow)
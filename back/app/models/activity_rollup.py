@@ -0,0 +1,26 @@
+"""ActivityRollup model — per-user, per-hour signal counts.
+
+Maintained incrementally from `activity_signals` by `activity_rollup`
+(watermark job + late batch uploads), so trend / baseline / dashboard
+queries read a few hundred rows instead of scanning raw signals.
+"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+from app.models.activity_signal import SignalType
+
+
+class ActivityRollup(Base):
+    """Number of `signal_type` signals of one user within one UTC hour."""
+    __tablename__ = "activity_rollups"
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    hour = Column(DateTime, primary_key=True)  # start of the hour (naive UTC)
+    signal_type = Column(SQLEnum(SignalType), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
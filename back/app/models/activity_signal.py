@@ -4,14 +4,14 @@ Tracks user activity signals (app opens, touch events, etc.)
 to determine "Last Active" status.
 """
 
-from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
 
+from app.core import clock
 from app.db.base import Base
 
 
@@ -31,14 +31,49 @@ class ActivitySignal(Base):
     The most recent signal determines the user's last_active_at.
     """
     __tablename__ = "activity_signals"
+    # Postgres: native monthly range partitions on `timestamp`
+    # (`activity_signals_yYYYYmMM`), created ahead and dropped by
+    # `signal_retention`. The partition key must be part of the PK.
+    __table_args__ = {"postgresql_partition_by": "RANGE (timestamp)"}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    # Indexed by `ix_activity_signals_user_timestamp` (leading column).
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     signal_type = Column(SQLEnum(SignalType), nullable=False, default=SignalType.HEARTBEAT)
-    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    timestamp = Column(DateTime, primary_key=True, default=clock.utcnow, index=True)
     
     # Optional metadata
     device_info = Column(String, nullable=True)  # e.g., "iPhone 14, iOS 17.2"
+    client_key = Column(String(64), nullable=True)  # batch upload idempotency key (see SignalClientKey)
     
     # Relationships
     user = relationship("User", back_populates="activity_signals")
+
+
+# History pages (`signal_service.get_signal_history`): keyset seek on
+# `(timestamp, id) < cursor` within one user, newest first.
+Index(
+    "ix_activity_signals_user_timestamp",
+    ActivitySignal.user_id,
+    ActivitySignal.timestamp.desc(),
+    ActivitySignal.id.desc(),
+)
+
+
+class SignalClientKey(Base):
+    """Client idempotency keys of batch-uploaded signals.
+
+    A unique index on the partitioned `activity_signals` would have to
+    include `timestamp`, and a retried upload may clamp a future
+    timestamp differently — so dedup lives in this small, unpartitioned
+    table. Keys are pruned once no retry can still carry them.
+    """
+    __tablename__ = "signal_client_keys"
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    client_key = Column(String(64), primary_key=True)
+    created_at = Column(DateTime, nullable=False, default=clock.utcnow, index=True)
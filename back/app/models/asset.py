@@ -10,11 +10,11 @@ service name) live in plaintext columns for search/UX.
 """
 import enum
 import uuid
-from datetime import datetime
 
 from sqlalchemy import Column, String, ForeignKey, Text, DateTime, Enum
 from sqlalchemy.dialects.postgresql import UUID
 
+from app.core import clock
 from app.db.base import Base
 
 
@@ -73,7 +73,7 @@ class Asset(Base):
     # Freeform memo
     note = Column(Text, nullable=True)
 
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=clock.utcnow, nullable=False)
     updated_at = Column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime, default=clock.utcnow, onupdate=clock.utcnow, nullable=False
     )
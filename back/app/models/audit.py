@@ -1,7 +1,7 @@
 from sqlalchemy import Column, String, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-from datetime import datetime
+from app.core import clock
 from app.db.base import Base
 
 class AuditLog(Base):
@@ -11,4 +11,4 @@ class AuditLog(Base):
     actor = Column(String, nullable=False)
     action = Column(String, nullable=False)
     target_id = Column(String, nullable=False)
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, default=clock.utcnow)
@@ -1,12 +1,12 @@
 """Guardian model for managing protective relationships."""
 
-from datetime import datetime
 from uuid import uuid4
 
 from sqlalchemy import Column, DateTime, ForeignKey, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
+from app.core import clock
 from app.db.base import Base
 
 
@@ -30,7 +30,7 @@ class Guardian(Base):
     guardian_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
 
     alias = Column(String, nullable=True)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=clock.utcnow)
 
     # Relationships
     ward = relationship("User", foreign_keys=[ward_id], back_populates="guardians")
@@ -37,11 +37,13 @@ class MonitoringPolicy(Base):
     
     # Quiet hours (no monitoring during sleep)
     quiet_start = Column(Time, nullable=False, default=time(23, 0))  # 11 PM
-    quiet_end = Column(Time, nullable=False, default=time(7, 0))    # 7 AM
+    quiet_end = Column(Time, nullable=False, default=time(7, 0), index=True)  # 7 AM; indexed for the incremental sweep
     
     # Escalation settings
     escalation_enabled = Column(Boolean, default=True)
     escalation_delay_minutes = Column(Integer, default=60)  # Wait 1 hour before notifying guardian
+    emergency_delay_minutes = Column(Integer, nullable=False, default=120)  # GUARDIAN_ALERT → EMERGENCY
+    event_expiry_hours = Column(Integer, nullable=False, default=72)  # Unresolved OPEN event → EXPIRED
     
     # Sensitivity
     sensitivity = Column(SQLEnum(SensitivityLevel), default=SensitivityLevel.NORMAL)
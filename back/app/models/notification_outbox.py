@@ -0,0 +1,74 @@
+"""NotificationOutbox model — transactional outbox for Guardian Pulse alerts.
+
+The pulse engine writes one row per notification in the *same*
+transaction as the PulseEvent change that caused it, so a crash can no
+longer lose an alert between "event committed" and "FCM called". The
+`NotificationDispatcher` leases pending rows in batches
+(`FOR UPDATE SKIP LOCKED`, then SENDING), sends them and records the
+delivery state.
+"""
+
+from enum import Enum
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Text, text, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID
+import uuid
+
+from app.core import clock
+from app.db.base import Base
+
+
+class OutboxKind(str, Enum):
+    """Which notification a row represents."""
+    SOFT_CHECKIN = "soft_checkin"      # Level 1 push to the user
+    GUARDIAN_ALERT = "guardian_alert"  # Level 2 multicast (+ email fallback) to guardians
+    EMERGENCY_ALERT = "emergency_alert"  # Level 3 to guardians + the user
+
+
+class OutboxStatus(str, Enum):
+    """Delivery state of an outbox row."""
+    PENDING = "pending"  # Waiting for (re)delivery at next_attempt_at
+    SENDING = "sending"  # Leased by a dispatcher until next_attempt_at
+    SENT = "sent"        # Provider accepted it
+    FAILED = "failed"    # Gave up (max attempts or nobody to notify)
+
+
+class NotificationOutbox(Base):
+    """One pending/sent notification."""
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        # Dispatcher claim query only ever looks at PENDING rows and
+        # SENDING rows whose lease may have expired.
+        Index(
+            "ix_notification_outbox_pending",
+            "next_attempt_at",
+            postgresql_where=text("status IN ('PENDING', 'SENDING')"),
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(SQLEnum(OutboxKind), nullable=False)
+
+    # The event that triggered it and the user it is about (the ward).
+    event_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("pulse_events.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # Delivery state
+    status = Column(SQLEnum(OutboxStatus), nullable=False, default=OutboxStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    # PENDING: when to (re)try. SENDING: when the dispatcher's lease expires.
+    next_attempt_at = Column(DateTime, nullable=False, default=clock.utcnow)
+    # Claimed before lower priorities (1 = user at high activity risk).
+    priority = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime, nullable=False, default=clock.utcnow)
+    sent_at = Column(DateTime, nullable=True)
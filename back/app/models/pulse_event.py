@@ -3,14 +3,14 @@
 Tracks the lifecycle of a welfare check event from trigger to resolution.
 """
 
-from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, Enum as SQLEnum, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
 
+from app.core import clock
 from app.db.base import Base
 
 
@@ -18,7 +18,7 @@ class PulseStage(str, Enum):
     """Current escalation stage of a pulse event."""
     SOFT_CHECK = "soft_check"       # Level 1: User notification sent
     GUARDIAN_ALERT = "guardian_alert"  # Level 2: Guardian notified
-    EMERGENCY = "emergency"         # Level 3: Emergency escalation (future)
+    EMERGENCY = "emergency"         # Level 3: Guardians alerted, still no response
 
 
 class PulseStatus(str, Enum):
@@ -36,6 +36,23 @@ class PulseEvent(Base):
     Tracks progression through escalation stages until resolution.
     """
     __tablename__ = "pulse_events"
+    __table_args__ = (
+        # At most one OPEN event per user, enforced by the DB so concurrent
+        # sweeps can't double-alert. SQLEnum stores names → 'OPEN'.
+        Index(
+            "uq_pulse_events_open_user",
+            "user_id",
+            unique=True,
+            postgresql_where=text("status = 'OPEN'"),
+            sqlite_where=text("status = 'OPEN'"),
+        ),
+        # Escalation sweep: range scan over open soft checks only.
+        Index(
+            "ix_pulse_events_escalate_at",
+            "escalate_at",
+            postgresql_where=text("status = 'OPEN' AND current_stage = 'SOFT_CHECK'"),
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
@@ -45,9 +62,13 @@ class PulseEvent(Base):
     current_stage = Column(SQLEnum(PulseStage), nullable=False, default=PulseStage.SOFT_CHECK)
     
     # Timestamps
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=clock.utcnow)
     soft_check_sent_at = Column(DateTime, nullable=True)
+    # soft_check_sent_at + policy.escalation_delay_minutes; NULL = escalation
+    # disabled. Written at creation and on policy change (pulse_engine).
+    escalate_at = Column(DateTime, nullable=True)
     guardian_notified_at = Column(DateTime, nullable=True)
+    emergency_at = Column(DateTime, nullable=True)
     resolved_at = Column(DateTime, nullable=True)
     
     # Resolution details — resolver 가 다른 사용자(보호자) 일 수 있다.
@@ -0,0 +1,20 @@
+"""SweepWatermark model — high-water marks for incremental background sweeps.
+
+One row per sweep (and per shard of a sharded sweep). The pulse engine
+stores the `now` of its last completed run here, so the next run only
+looks at users whose state could have changed since then.
+"""
+
+from sqlalchemy import Column, DateTime, String
+
+from app.core import clock
+from app.db.base import Base
+
+
+class SweepWatermark(Base):
+    """Last processed instant of a named sweep."""
+    __tablename__ = "sweep_watermarks"
+
+    name = Column(String, primary_key=True)  # e.g. "pulse_sweep", "pulse_sweep:2/4"
+    watermark = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False, default=clock.utcnow)
@@ -1,8 +1,8 @@
-from datetime import datetime
 from sqlalchemy import Column, String, Boolean, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
+from app.core import clock
 from app.db.base import Base
 
 
@@ -27,7 +27,14 @@ class User(Base):
     fcm_token = Column(String, nullable=True)  # Firebase Cloud Messaging token
 
     # Guardian Pulse: Last activity tracking
-    last_active_at = Column(DateTime, nullable=True, default=datetime.utcnow)
+    last_active_at = Column(DateTime, nullable=True, default=clock.utcnow)
+
+    # Precomputed `last_active_at + policy.threshold_hours`. The pulse sweep
+    # range-scans this index (`next_check_due_at < now`) so its cost scales
+    # with the users actually due, not the whole table. Kept current by
+    # every writer of last_active_at / threshold_hours — see
+    # `pulse_engine.next_check_due_expr`. NULL = no MonitoringPolicy yet.
+    next_check_due_at = Column(DateTime, nullable=True, index=True)
     
     # ──────────────────────────────────────────────────────────────────
     # Cascade policy (PRD §6 — 잊혀질 권리)
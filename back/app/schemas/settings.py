@@ -39,6 +39,8 @@ class MonitoringPolicyResponse(BaseModel):
     quiet_end: time = time(7, 0)
     escalation_enabled: bool = True
     escalation_delay_minutes: int = 60
+    emergency_delay_minutes: int = 120
+    event_expiry_hours: int = 72
     sensitivity: SensitivityLevel = SensitivityLevel.NORMAL
     is_active: bool = True
     sms_fallback_enabled: bool = False
@@ -63,6 +65,8 @@ class MonitoringPolicyUpdate(BaseModel):
     quiet_end: time | None = None
     escalation_enabled: bool | None = None
     escalation_delay_minutes: int | None = Field(None, ge=0, le=1440)  # 0 to 24h
+    emergency_delay_minutes: int | None = Field(None, ge=0, le=2880)  # 0 to 48h after guardian alert
+    event_expiry_hours: int | None = Field(None, ge=1, le=720)  # 1h to 30 days
     sensitivity: SensitivityLevel | None = None
     is_active: bool | None = None
     sms_fallback_enabled: bool | None = None
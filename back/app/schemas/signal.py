@@ -3,7 +3,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.activity_signal import SignalType
 
@@ -24,6 +24,27 @@ class HeartbeatResponse(BaseModel):
     signal_id: UUID
 
 
+class HeartbeatBatchItem(BaseModel):
+    """One signal recorded on the device while it was offline."""
+    client_key: str = Field(..., min_length=1, max_length=64)  # idempotency key, unique per user
+    timestamp: datetime  # device time; tz-aware values are converted to UTC
+    signal_type: SignalType = SignalType.HEARTBEAT
+    device_info: str | None = None
+
+
+class HeartbeatBatchRequest(BaseModel):
+    """Request body for the offline batch upload."""
+    signals: list[HeartbeatBatchItem] = Field(..., min_length=1, max_length=500)
+
+
+class HeartbeatBatchResponse(BaseModel):
+    """Result of an offline batch upload."""
+    accepted: int  # newly stored
+    duplicates: int  # client_key already stored (retry) or repeated in the batch
+    dropped: int  # older than SIGNAL_BATCH_MAX_AGE_HOURS
+    last_active_at: datetime | None  # latest accepted timestamp (after clamping)
+
+
 class ActivitySignalResponse(BaseModel):
     """Response model for activity signal data."""
     id: UUID
@@ -35,6 +56,27 @@ class ActivitySignalResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ActivityBucketResponse(BaseModel):
+    """Signal counts of one hour / day (down-sampled history)."""
+    start: datetime  # bucket start (UTC)
+    total: int
+    counts: dict[SignalType, int]
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SignalHistoryResponse(BaseModel):
+    """One page of activity history, newest first.
+
+    `signals` for `resolution=raw`, `buckets` for `hour` / `day`. Pass
+    `next_cursor` back as `cursor` for the next (older) page; null = end.
+    """
+    resolution: str
+    signals: list[ActivitySignalResponse] = []
+    buckets: list[ActivityBucketResponse] = []
+    next_cursor: str | None = None
+
+
 class StatusResponse(BaseModel):
     """Read-only Pulse status snapshot — no side effects.
 
@@ -24,6 +24,7 @@ from fastapi import HTTPException, status
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import clock
 from app.models.user import User
 
 audit_logger = logging.getLogger("inrem.audit.account")
@@ -39,7 +40,7 @@ async def request_deletion(db: AsyncSession, *, user: User) -> User:
     blocked separately in `auth_service.authenticate_user`.
     """
     if user.deletion_requested_at is None:
-        user.deletion_requested_at = datetime.utcnow()
+        user.deletion_requested_at = clock.utcnow()
         await db.commit()
         await db.refresh(user)
     return user
@@ -67,11 +68,11 @@ def grace_remaining(user: User) -> timedelta | None:
     if user.deletion_requested_at is None:
         return None
     deadline = user.deletion_requested_at + timedelta(days=GRACE_PERIOD_DAYS)
-    return max(timedelta(0), deadline - datetime.utcnow())
+    return max(timedelta(0), deadline - clock.utcnow())
 
 
 def _grace_expired(requested_at: datetime) -> bool:
-    return datetime.utcnow() - requested_at > timedelta(days=GRACE_PERIOD_DAYS)
+    return clock.utcnow() - requested_at > timedelta(days=GRACE_PERIOD_DAYS)
 
 
 async def purge_expired_deletions(db: AsyncSession) -> list[UUID]:
@@ -85,7 +86,7 @@ async def purge_expired_deletions(db: AsyncSession) -> list[UUID]:
     are missing `cascade="all, delete"` on a side, that table's rows will
     survive; add explicit `delete()` calls here as needed.
     """
-    cutoff = datetime.utcnow() - timedelta(days=GRACE_PERIOD_DAYS)
+    cutoff = clock.utcnow() - timedelta(days=GRACE_PERIOD_DAYS)
     rows = await db.execute(
         select(User).where(
             User.deletion_requested_at.is_not(None),
@@ -104,7 +105,7 @@ async def purge_expired_deletions(db: AsyncSession) -> list[UUID]:
             extra={
                 "user_id": str(user.id),
                 "requested_at": user.deletion_requested_at.isoformat(),
-                "purged_at": datetime.utcnow().isoformat(),
+                "purged_at": clock.utcnow().isoformat(),
             },
         )
         await db.delete(user)
@@ -0,0 +1,305 @@
+"""Per-user circadian baselines — the bio-rhythm model of normal activity.
+
+Each user has a 168-bucket profile (`activity_baselines.profile`), one
+bucket per UTC hour of the week. Bucket `b` is an EWMA of "was the user
+active in that hour" (any signal), so it estimates the probability that
+the user is active at that time of week; old weeks fade with a half-life
+of `BASELINE_HALF_LIFE_WEEKS`.
+
+Maintenance — incremental, from `activity_rollups`:
+
+- `update_baselines` (after each rollup run) folds the newly rolled hours
+  `[observed_through, rollup watermark)` of every user with activity in
+  them. Users with no activity are skipped; their silent hours are folded
+  (as zeros) with their next active hour, so an ongoing silence never
+  drags its own baseline down while it is being judged.
+- `fold` applies one EWMA step per hour: O(1) per observation, and
+  vectorized over a `(weeks, 168)` grid, so a full recompute from a
+  year of rollups (`rebuild_baseline`) is a handful of NumPy operations.
+  `observe` is the scalar reference it mirrors (see tests).
+
+Reading — `missed_active_hours` takes whole columns (profiles, silence
+windows) and returns the number of hours the user would normally have
+been active in during their current silence. The pulse engine flags
+silences that exceed `BASELINE_DEVIATION_HOURS` long before
+`threshold_hours` (`pulse_engine.find_unusual_silences`).
+
+Signals added to already-folded hours later (offline batch uploads) are
+not re-folded; they only affect hours older than the last active one.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Sequence
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.activity_baseline import ActivityBaseline
+from app.models.activity_rollup import ActivityRollup
+from app.services.activity_rollup import ROLLUP_WATERMARK, floor_hour
+from app.services.watermark_service import advance_watermark, get_watermark
+
+BUCKETS = 7 * 24
+PROFILE_DTYPE = np.dtype("<f4")
+BASELINE_WATERMARK = "activity_baseline"
+
+# Users whose baselines are folded per transaction.
+USER_CHUNK = 500
+
+_EPOCH = datetime(1970, 1, 1)
+_HOUR = timedelta(hours=1)
+# 1970-01-01 was a Thursday: epoch hour 0 is bucket 3 × 24 (Monday = 0).
+_EPOCH_BUCKET = 3 * 24
+
+
+def decay_rate(half_life_weeks: float | None = None) -> float:
+    """EWMA weight of a new observation (one per bucket per week)."""
+    if half_life_weeks is None:
+        half_life_weeks = settings.BASELINE_HALF_LIFE_WEEKS
+    return 1.0 - 0.5 ** (1.0 / half_life_weeks)
+
+
+def hour_index(value: datetime) -> int:
+    """Whole hours since the Unix epoch (naive UTC)."""
+    return (value - _EPOCH) // _HOUR
+
+
+def bucket_of_hour(index):
+    """Bucket of an `hour_index` (int or array) — Monday 00:00–01:00 UTC is 0."""
+    return (index + _EPOCH_BUCKET) % BUCKETS
+
+
+def bucket_of(value: datetime) -> int:
+    """Hour-of-week bucket of `value`."""
+    return bucket_of_hour(hour_index(value))
+
+
+def empty_profile() -> np.ndarray:
+    return np.zeros(BUCKETS, dtype=np.float64)
+
+
+def encode(profile: np.ndarray) -> bytes:
+    """Fixed-size blob (168 × little-endian float32)."""
+    return np.asarray(profile, dtype=PROFILE_DTYPE).tobytes()
+
+
+def decode(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=PROFILE_DTYPE, count=BUCKETS).astype(np.float64)
+
+
+def observe(profile: np.ndarray, bucket: int, active: bool, alpha: float) -> None:
+    """One EWMA step for one hour, in place (scalar reference for `fold`)."""
+    profile[bucket] += alpha * (float(active) - profile[bucket])
+
+
+def fold(
+    profile: np.ndarray,
+    start_bucket: int,
+    activity: np.ndarray,
+    alpha: float,
+) -> np.ndarray:
+    """`observe` every hour of `activity` in order, vectorized.
+
+    Args:
+        profile: Current 168-bucket profile (not modified).
+        start_bucket: Bucket of `activity[0]`.
+        activity: One boolean / 0-1 value per consecutive hour.
+        alpha: EWMA weight (`decay_rate`).
+
+    Returns:
+        The updated profile.
+    """
+    n = len(activity)
+    if n == 0:
+        return profile.copy()
+    weeks = -(-(start_bucket + n) // BUCKETS)
+    grid = np.zeros(weeks * BUCKETS)
+    valid = np.zeros(weeks * BUCKETS, dtype=bool)
+    grid[start_bucket : start_bucket + n] = activity
+    valid[start_bucket : start_bucket + n] = True
+    grid = grid.reshape(weeks, BUCKETS)
+    valid = valid.reshape(weeks, BUCKETS)
+
+    keep = 1.0 - alpha
+    # Observations of the same bucket after row r → how often its
+    # contribution decays before the end of the window.
+    later = np.cumsum(valid[::-1], axis=0)[::-1] - valid
+    weights = np.where(valid, alpha * keep**later, 0.0)
+    return profile * keep ** valid.sum(axis=0) + (weights * grid).sum(axis=0)
+
+
+def bucket_counts(since: datetime, through: datetime) -> np.ndarray:
+    """Hours of `[since, through)` falling into each bucket."""
+    n = max(0, hour_index(through) - hour_index(since))
+    weeks, rest = divmod(n, BUCKETS)
+    offset = (np.arange(BUCKETS) - bucket_of(since)) % BUCKETS
+    return weeks + (offset < rest)
+
+
+def normalized(
+    profile: np.ndarray,
+    since: datetime,
+    through: datetime,
+    alpha: float | None = None,
+) -> np.ndarray:
+    """Bias-corrected profile: buckets start at 0, so divide by the weight seen so far."""
+    if alpha is None:
+        alpha = decay_rate()
+    seen = 1.0 - (1.0 - alpha) ** bucket_counts(since, through)
+    return np.divide(profile, seen, out=np.zeros(BUCKETS), where=seen > 0)
+
+
+def missed_active_hours(
+    profiles: np.ndarray,
+    start_buckets: np.ndarray,
+    hours: np.ndarray,
+) -> np.ndarray:
+    """Expected active hours in each user's silence window.
+
+    Args:
+        profiles: `(n, 168)` normalized profiles.
+        start_buckets: `(n,)` bucket of each window's first hour.
+        hours: `(n,)` window lengths in whole hours (negative = 0).
+
+    Returns:
+        `(n,)` sums of the profile over each window (wrapping around the
+        week as often as needed).
+    """
+    profiles = np.asarray(profiles, dtype=np.float64).reshape(-1, BUCKETS)
+    hours = np.maximum(np.asarray(hours, dtype=np.int64), 0)
+    start = np.asarray(start_buckets, dtype=np.int64)
+    weeks, rest = np.divmod(hours, BUCKETS)
+    # Prefix sums over two weeks, so any window of < 168 hours is one slice.
+    prefix = np.zeros((len(profiles), 2 * BUCKETS + 1))
+    np.cumsum(np.tile(profiles, 2), axis=1, out=prefix[:, 1:])
+    rows = np.arange(len(profiles))
+    partial = prefix[rows, start + rest] - prefix[rows, start]
+    return weeks * profiles.sum(axis=1) + partial
+
+
+def _fold_hours(
+    profile: np.ndarray,
+    since: datetime,
+    upto: datetime,
+    active_hours: Sequence[datetime],
+    alpha: float,
+) -> np.ndarray:
+    first = hour_index(since)
+    activity = np.zeros(hour_index(upto) - first)
+    activity[[hour_index(h) - first for h in active_hours]] = 1.0
+    return fold(profile, bucket_of(since), activity, alpha)
+
+
+async def _active_hours(
+    db: AsyncSession,
+    user_ids: Sequence[UUID],
+    upto: datetime,
+    since: datetime | None = None,
+) -> dict[UUID, list[datetime]]:
+    stmt = (
+        select(ActivityRollup.user_id, ActivityRollup.hour)
+        .where(ActivityRollup.user_id.in_(user_ids), ActivityRollup.hour < upto)
+        .group_by(ActivityRollup.user_id, ActivityRollup.hour)
+    )
+    if since is not None:
+        stmt = stmt.where(ActivityRollup.hour >= since)
+    hours: dict[UUID, list[datetime]] = defaultdict(list)
+    for user_id, hour in (await db.execute(stmt)).all():
+        hours[user_id].append(hour)
+    return hours
+
+
+async def _update_chunk(db: AsyncSession, user_ids: Sequence[UUID], upto: datetime) -> int:
+    baselines = {
+        b.user_id: b
+        for b in (
+            await db.execute(select(ActivityBaseline).where(ActivityBaseline.user_id.in_(user_ids)))
+        ).scalars()
+    }
+    # New users need their whole history, known ones only the unfolded tail.
+    since = None
+    if len(baselines) == len(user_ids):
+        since = min(b.observed_through for b in baselines.values())
+    hours = await _active_hours(db, user_ids, upto, since)
+
+    alpha = decay_rate()
+    updated = 0
+    for user_id in user_ids:
+        baseline = baselines.get(user_id)
+        if baseline is None:
+            active = hours.get(user_id)
+            if not active:
+                continue
+            start = floor_hour(min(active))
+            profile = _fold_hours(empty_profile(), start, upto, active, alpha)
+            db.add(
+                ActivityBaseline(
+                    user_id=user_id,
+                    profile=encode(profile),
+                    observed_since=start,
+                    observed_through=upto,
+                )
+            )
+        else:
+            start = baseline.observed_through
+            if start >= upto:
+                continue
+            active = [h for h in hours.get(user_id, ()) if h >= start]
+            profile = _fold_hours(decode(baseline.profile), start, upto, active, alpha)
+            baseline.profile = encode(profile)
+            baseline.observed_through = upto
+        updated += 1
+    return updated
+
+
+async def update_baselines(db: AsyncSession, upto: datetime | None = None) -> int:
+    """Fold rolled-up hours into the baselines of users active since the last run.
+
+    `upto` defaults to the rollup watermark (hours before it are final).
+    Commits per chunk of `USER_CHUNK` users, then advances the
+    `activity_baseline` watermark; a crash replays the window and already
+    folded hours are skipped via `observed_through`. Returns the number
+    of baselines written.
+    """
+    if upto is None:
+        upto = await get_watermark(db, ROLLUP_WATERMARK)
+        if upto is None:
+            return 0
+    since = await get_watermark(db, BASELINE_WATERMARK)
+    stmt = select(ActivityRollup.user_id).distinct().where(ActivityRollup.hour < upto)
+    if since is not None:
+        stmt = stmt.where(ActivityRollup.hour >= since)
+    user_ids = list((await db.execute(stmt)).scalars().all())
+
+    updated = 0
+    for i in range(0, len(user_ids), USER_CHUNK):
+        updated += await _update_chunk(db, user_ids[i : i + USER_CHUNK], upto)
+        await db.commit()
+    await advance_watermark(db, BASELINE_WATERMARK, upto)
+    await db.commit()
+    return updated
+
+
+async def rebuild_baseline(
+    db: AsyncSession,
+    user_id: UUID,
+    upto: datetime | None = None,
+) -> ActivityBaseline | None:
+    """Recompute one user's baseline from all of their rollups. Commits.
+
+    For backfills and after changing `BASELINE_HALF_LIFE_WEEKS`. Returns
+    None if the user has no rolled-up activity.
+    """
+    if upto is None:
+        upto = await get_watermark(db, ROLLUP_WATERMARK)
+        if upto is None:
+            return None
+    await db.execute(delete(ActivityBaseline).where(ActivityBaseline.user_id == user_id))
+    await _update_chunk(db, [user_id], upto)
+    await db.commit()
+    return await db.get(ActivityBaseline, user_id)
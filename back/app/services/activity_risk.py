@@ -0,0 +1,214 @@
+"""Batch activity risk scoring over the hourly rollups.
+
+Hourly (after the rollup run, see `ActivityRollupScheduler`), every
+monitored user with a warmed-up circadian baseline gets a risk score for
+the last `ACTIVITY_RISK_WINDOW_HOURS` rolled-up hours:
+
+    expected = Σ p_h            (normalized baseline of each hour's bucket)
+    observed = Σ x_h            (1 if the user had any signal that hour)
+    risk     = max(0, (expected - observed) / sqrt(Σ p_h (1 - p_h) + 1))
+
+i.e. how many standard deviations less active than usual the user was
+(the `+ 1` keeps near-deterministic profiles from producing huge scores
+off a single missed hour). Over-activity is not a risk: scores are
+clipped at 0.
+
+Users are processed in keyset chunks of `ACTIVITY_RISK_CHUNK_USERS`. Per
+chunk: one query for baselines, one for the window's rollup hours, a
+`(users × hours)` NumPy matrix for both expected and observed, and one
+executemany UPDATE — so the population is scored in a few seconds per
+million users on one core, well inside the rollup interval.
+
+The pulse engine reads `activity_baselines.risk_score` when it enqueues
+alerts: users at or above `ACTIVITY_RISK_PRIORITY_SCORE` get priority in
+the notification outbox (`pulse_engine.enqueue_notifications`).
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.activity_baseline import ActivityBaseline
+from app.models.activity_rollup import ActivityRollup
+from app.models.monitoring_policy import MonitoringPolicy
+from app.models.user import User
+from app.services import activity_baseline
+from app.services.activity_rollup import ROLLUP_WATERMARK
+from app.services.watermark_service import advance_watermark, get_watermark
+
+RISK_WATERMARK = "activity_risk"
+
+SCORING_SECONDS = metrics.histogram(
+    "inrem_activity_risk_scoring_seconds",
+    "Duration of one full activity risk scoring run",
+)
+USERS_SCORED = metrics.counter(
+    "inrem_activity_risk_users_scored_total",
+    "Users given an activity risk score",
+)
+
+
+@dataclass
+class RiskScoringResult:
+    """One `score_users` run."""
+
+    window_end: datetime | None = None
+    users: int = 0
+    high_risk: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+
+def risk_scores(expected: np.ndarray, observed: np.ndarray) -> np.ndarray:
+    """Row-wise activity deficit score of `(users × hours)` matrices.
+
+    Args:
+        expected: Activity probability per user and hour (normalized profile).
+        observed: 0/1 activity per user and hour.
+
+    Returns:
+        `(users,)` scores ≥ 0.
+    """
+    deficit = expected.sum(axis=1) - observed.sum(axis=1)
+    variance = (expected * (1.0 - expected)).sum(axis=1)
+    return np.maximum(deficit / np.sqrt(variance + 1.0), 0.0)
+
+
+async def _score_chunk(
+    db: AsyncSession,
+    after: UUID | None,
+    window_start: datetime,
+    window_end: datetime,
+) -> tuple[list[UUID], np.ndarray]:
+    """Score the next chunk of monitored users (by user id). Does not commit."""
+    stmt = (
+        select(
+            ActivityBaseline.user_id,
+            ActivityBaseline.profile,
+            ActivityBaseline.observed_since,
+            ActivityBaseline.observed_through,
+        )
+        .join(User, User.id == ActivityBaseline.user_id)
+        .join(MonitoringPolicy, MonitoringPolicy.user_id == ActivityBaseline.user_id)
+        .where(
+            User.is_active == True,
+            User.is_deceased == False,
+            MonitoringPolicy.is_active == True,
+        )
+        .order_by(ActivityBaseline.user_id)
+        .limit(settings.ACTIVITY_RISK_CHUNK_USERS)
+    )
+    if after is not None:
+        stmt = stmt.where(ActivityBaseline.user_id > after)
+    rows = (await db.execute(stmt)).all()
+    if not rows:
+        return [], np.empty(0)
+
+    user_ids = [row.user_id for row in rows]
+    first_hour = activity_baseline.hour_index(window_start)
+    hours = activity_baseline.hour_index(window_end) - first_hour
+    column = {user_id: i for i, user_id in enumerate(user_ids)}
+
+    observed = np.zeros((len(rows), hours))
+    active = await db.execute(
+        select(ActivityRollup.user_id, ActivityRollup.hour)
+        .where(
+            ActivityRollup.user_id >= user_ids[0],
+            ActivityRollup.user_id <= user_ids[-1],
+            ActivityRollup.hour >= window_start,
+            ActivityRollup.hour < window_end,
+        )
+        .group_by(ActivityRollup.user_id, ActivityRollup.hour)
+    )
+    for user_id, hour in active.all():
+        i = column.get(user_id)
+        if i is not None:  # in the id range but not monitored
+            observed[i, activity_baseline.hour_index(hour) - first_hour] = 1.0
+
+    alpha = activity_baseline.decay_rate()
+    profiles = np.stack(
+        [
+            activity_baseline.normalized(
+                activity_baseline.decode(row.profile),
+                row.observed_since,
+                row.observed_through,
+                alpha,
+            )
+            for row in rows
+        ]
+    )
+    buckets = activity_baseline.bucket_of_hour(np.arange(first_hour, first_hour + hours))
+    scores = risk_scores(profiles[:, buckets], observed)
+
+    # Not enough history → no score (NULL), rather than a noisy one.
+    min_history = timedelta(weeks=settings.BASELINE_MIN_WEEKS)
+    warm = np.array([row.observed_through - row.observed_since >= min_history for row in rows])
+    await db.execute(
+        update(ActivityBaseline),
+        [
+            {
+                "user_id": user_id,
+                "risk_score": float(score) if ok else None,
+                "risk_scored_at": window_end,
+            }
+            for user_id, score, ok in zip(user_ids, scores, warm)
+        ],
+    )
+    return user_ids, np.where(warm, scores, np.nan)
+
+
+async def score_users(db: AsyncSession, window_end: datetime | None = None) -> RiskScoringResult:
+    """Score every monitored user over the hours before `window_end`. Commits per chunk.
+
+    `window_end` defaults to the rollup watermark; a run for an hour that
+    was already scored (`activity_risk` watermark) is skipped.
+    """
+    if window_end is None:
+        window_end = await get_watermark(db, ROLLUP_WATERMARK)
+        if window_end is None:
+            return RiskScoringResult()
+        last = await get_watermark(db, RISK_WATERMARK)
+        if last is not None and last >= window_end:
+            return RiskScoringResult(window_end=last)
+    window_start = window_end - timedelta(hours=settings.ACTIVITY_RISK_WINDOW_HOURS)
+
+    started = time.perf_counter()
+    result = RiskScoringResult(window_end=window_end)
+    after = None
+    while True:
+        user_ids, scores = await _score_chunk(db, after, window_start, window_end)
+        if not user_ids:
+            break
+        await db.commit()
+        result.chunks += 1
+        result.users += len(user_ids)
+        result.high_risk += int(np.sum(scores >= settings.ACTIVITY_RISK_PRIORITY_SCORE))
+        after = user_ids[-1]
+    await advance_watermark(db, RISK_WATERMARK, window_end)
+    await db.commit()
+
+    result.seconds = time.perf_counter() - started
+    SCORING_SECONDS.observe(result.seconds)
+    USERS_SCORED.inc(result.users)
+    return result
+
+
+async def high_risk_users(db: AsyncSession, user_ids: set[UUID]) -> set[UUID]:
+    """Those of `user_ids` whose latest risk score reaches `ACTIVITY_RISK_PRIORITY_SCORE`."""
+    if not user_ids:
+        return set()
+    result = await db.execute(
+        select(ActivityBaseline.user_id).where(
+            ActivityBaseline.user_id.in_(user_ids),
+            ActivityBaseline.risk_score >= settings.ACTIVITY_RISK_PRIORITY_SCORE,
+        )
+    )
+    return set(result.scalars().all())
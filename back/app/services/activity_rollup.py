@@ -0,0 +1,199 @@
+"""Hourly activity rollups (`activity_rollups`) maintained incrementally.
+
+Analytics over `activity_signals` (trends, baselines, dashboards) used
+to scan raw rows. The rollup table holds one row per
+`(user, hour, signal_type)` with a count; a year of one user's history
+is at most a few thousand rows.
+
+Maintenance:
+
+- `roll_up` (scheduler, every 10 min): aggregates the closed hours
+  `[watermark, cutoff)` with one `INSERT ... SELECT ... GROUP BY ... ON
+  CONFLICT DO UPDATE` and advances the `activity_rollup` watermark. An
+  hour is closed once it ended `ACTIVITY_ROLLUP_SETTLE_SECONDS` ago, which
+  covers the ingest queue's flush delay. A long backlog is processed in
+  spans of `MAX_ROLLUP_SPAN`, one transaction each, so ingest writers
+  only ever wait for one short span.
+- `add_late_signals` (ingest paths): signals written with a timestamp
+  *before* the watermark — offline batch uploads, a queue backlog after
+  a DB outage — are added to their hour directly, in the writer's
+  transaction.
+
+The two never double count: `roll_up` holds the watermark row `FOR
+UPDATE` from before it aggregates until it commits, writers read it `FOR
+SHARE`. A writer either commits first (its rows are in the aggregate and
+below the old watermark → not added late) or waits and sees the new
+watermark. This needs the row to exist before any writer runs: migration
+d7a1c5e9f3b8 seeds it, and `roll_up` creates it (before aggregating
+anything) on a database built without migrations.
+
+Reads (`hourly_counts`) take rolled-up hours from the table and only the
+not-yet-rolled tail (normally the current partial hour) from raw rows.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import clock
+from app.core.config import settings
+from app.db.expressions import dialect_insert, hour_floor
+from app.models.activity_rollup import ActivityRollup
+from app.models.activity_signal import ActivitySignal, SignalType
+from app.models.sweep_watermark import SweepWatermark
+from app.services.watermark_service import advance_watermark, get_watermark
+
+ROLLUP_WATERMARK = "activity_rollup"
+
+# Longest window one `roll_up` call aggregates (first run / catch-up).
+# Ingest writers wait on the watermark row while a span is aggregated.
+MAX_ROLLUP_SPAN = timedelta(hours=3)
+
+# `(hour, signal_type, count)`
+HourlyCount = tuple[datetime, SignalType, int]
+
+
+@dataclass
+class RollupResult:
+    """One `roll_up` call: the window aggregated and whether it reached the cutoff."""
+
+    since: datetime | None = None
+    upto: datetime | None = None
+    rows: int = 0
+    caught_up: bool = True
+
+
+def floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _upsert_counts(insert_stmt):
+    return insert_stmt.on_conflict_do_update(
+        index_elements=[ActivityRollup.user_id, ActivityRollup.hour, ActivityRollup.signal_type],
+        set_={"count": ActivityRollup.count + insert_stmt.excluded["count"]},
+    )
+
+
+async def roll_up(db: AsyncSession, now: datetime | None = None) -> RollupResult:
+    """Aggregate the next window of closed hours and advance the watermark. Commits."""
+    if now is None:
+        now = clock.utcnow()
+    cutoff = floor_hour(now - timedelta(seconds=settings.ACTIVITY_ROLLUP_SETTLE_SECONDS))
+
+    since = await get_watermark(db, ROLLUP_WATERMARK, for_update=True)
+    if since is None:
+        # No row to lock yet: create it from the oldest signal, then lock it.
+        since = await _seed_watermark(db, cutoff)
+    upto = min(cutoff, since + MAX_ROLLUP_SPAN)
+    if upto <= since:
+        await db.commit()  # release the row lock
+        return RollupResult(since=since, upto=since)
+
+    hour = hour_floor(ActivitySignal.timestamp)
+    aggregate = (
+        select(ActivitySignal.user_id, hour, ActivitySignal.signal_type, func.count())
+        .where(ActivitySignal.timestamp >= since, ActivitySignal.timestamp < upto)
+        .group_by(ActivitySignal.user_id, hour, ActivitySignal.signal_type)
+    )
+    stmt = _upsert_counts(
+        dialect_insert(db, ActivityRollup).from_select(
+            ["user_id", "hour", "signal_type", "count"], aggregate
+        ),
+    )
+    result = await db.execute(stmt)
+    await advance_watermark(db, ROLLUP_WATERMARK, upto)
+    await db.commit()
+    return RollupResult(since=since, upto=upto, rows=result.rowcount or 0, caught_up=upto >= cutoff)
+
+
+async def _seed_watermark(db: AsyncSession, cutoff: datetime) -> datetime:
+    """Create the `activity_rollup` watermark row and lock it. Commits first."""
+    first = await db.scalar(select(func.min(ActivitySignal.timestamp)))
+    stmt = dialect_insert(db, SweepWatermark).values(
+        name=ROLLUP_WATERMARK,
+        watermark=floor_hour(first) if first is not None else cutoff,
+        updated_at=clock.utcnow(),
+    )
+    await db.execute(stmt.on_conflict_do_nothing(index_elements=[SweepWatermark.name]))
+    await db.commit()
+    return await get_watermark(db, ROLLUP_WATERMARK, for_update=True)
+
+
+async def add_late_signals(
+    db: AsyncSession,
+    signals: Iterable[tuple[UUID, datetime, SignalType]],
+) -> int:
+    """Count `(user_id, timestamp, signal_type)` rows the rollup job already passed.
+
+    Call in the transaction that inserts the signals. Does not commit.
+    Returns the number of signals added to rollups.
+    """
+    watermark = await get_watermark(db, ROLLUP_WATERMARK, shared=True)
+    if watermark is None:
+        return 0  # no migrations and `roll_up` never ran: nothing rolled up yet
+    counts = Counter(
+        (user_id, floor_hour(timestamp), signal_type)
+        for user_id, timestamp, signal_type in signals
+        if timestamp < watermark
+    )
+    if not counts:
+        return 0
+    await db.execute(
+        _upsert_counts(
+            dialect_insert(db, ActivityRollup).values(
+                [
+                    {"user_id": user_id, "hour": hour, "signal_type": signal_type, "count": n}
+                    for (user_id, hour, signal_type), n in counts.items()
+                ]
+            ),
+        )
+    )
+    return sum(counts.values())
+
+
+async def hourly_counts(
+    db: AsyncSession,
+    user_id: UUID,
+    start: datetime,
+    end: datetime,
+) -> list[HourlyCount]:
+    """Per-hour signal counts of `user_id` for hours in `[floor_hour(start), end)`.
+
+    Rolled-up hours come from `activity_rollups`; only hours at or after
+    the watermark (the current partial hour, normally) are aggregated
+    from raw signals. Sorted by hour, then signal type.
+    """
+    start = floor_hour(start)
+    watermark = await get_watermark(db, ROLLUP_WATERMARK)
+    split = min(max(watermark or start, start), end)
+
+    rows: list[HourlyCount] = []
+    if split > start:
+        rolled = await db.execute(
+            select(ActivityRollup.hour, ActivityRollup.signal_type, ActivityRollup.count).where(
+                ActivityRollup.user_id == user_id,
+                ActivityRollup.hour >= start,
+                ActivityRollup.hour < split,
+            )
+        )
+        rows.extend((h, t, n) for h, t, n in rolled.all())
+    if end > split:
+        hour = hour_floor(ActivitySignal.timestamp)
+        raw = await db.execute(
+            select(hour, ActivitySignal.signal_type, func.count())
+            .where(
+                ActivitySignal.user_id == user_id,
+                ActivitySignal.timestamp >= split,
+                ActivitySignal.timestamp < end,
+            )
+            .group_by(hour, ActivitySignal.signal_type)
+        )
+        rows.extend((h, t, n) for h, t, n in raw.all())
+    rows.sort(key=lambda row: (row[0], row[1].value))
+    return rows
@@ -0,0 +1,108 @@
+"""In-memory deadline queue for exact-time pulse checks.
+
+`PulseScheduler` used to discover due users only on its 10-minute poll, so
+a soft check could fire up to one interval late. This module keeps a
+min-heap of the deadlines that fall inside the *next* poll window:
+
+- `users.next_check_due_at` → soft check creation.
+- open SOFT_CHECK events' escalation time → guardian alert.
+
+The scheduler seeds it from the DB on every reconciliation sweep
+(index range scans, bounded by the horizon) and sleeps until the earliest
+deadline. Heartbeats / policy changes call `schedule()` so a deadline that
+moved is invalidated without touching the DB.
+
+The queue never decides anything — firing just runs the normal set-based
+sweep, which re-checks every condition in SQL. A stale entry therefore
+costs one cheap extra sweep, never a wrong alert.
+
+Single-process only; each worker keeps its own queue (see scheduler
+module docstring for multi-instance notes).
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+from datetime import datetime, timedelta
+from typing import Hashable, Iterable
+
+from app.core import clock
+
+
+class DeadlineQueue:
+    """Min-heap of `(due_at, key)` with lazy invalidation.
+
+    Only the most recent `schedule()` per key is live; superseded heap
+    entries are skipped when popped.
+    """
+
+    def __init__(self, horizon_seconds: float) -> None:
+        self.horizon_seconds = horizon_seconds
+        self._heap: list[tuple[datetime, int, Hashable]] = []
+        self._live: dict[Hashable, datetime] = {}
+        self._seq = 0  # tie-breaker so keys never get compared
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def schedule(self, key: Hashable, due_at: datetime | None, *, now: datetime | None = None) -> None:
+        """Set (or move) the deadline for `key`.
+
+        Deadlines past the horizon are dropped — the next reconciliation
+        seed picks them up once they come into range.
+        """
+        if now is None:
+            now = clock.utcnow()
+        if due_at is None or due_at > now + timedelta(seconds=self.horizon_seconds):
+            self._live.pop(key, None)
+            return
+
+        earliest = self.next_deadline()
+        self._live[key] = due_at
+        self._seq += 1
+        heapq.heappush(self._heap, (due_at, self._seq, key))
+        if earliest is None or due_at < earliest:
+            self._wakeup.set()
+
+    def discard(self, key: Hashable) -> None:
+        self._live.pop(key, None)
+
+    def replace_all(self, items: Iterable[tuple[Hashable, datetime]]) -> None:
+        """Reset the queue to exactly `items` (used by the reconciliation seed)."""
+        self._live = dict(items)
+        self._heap = []
+        for key, due_at in self._live.items():
+            self._seq += 1
+            self._heap.append((due_at, self._seq, key))
+        heapq.heapify(self._heap)
+        self._wakeup.set()
+
+    def next_deadline(self) -> datetime | None:
+        """Earliest live deadline, discarding stale heap heads."""
+        while self._heap:
+            due_at, _, key = self._heap[0]
+            if self._live.get(key) == due_at:
+                return due_at
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: datetime) -> list[Hashable]:
+        """Remove and return every key whose deadline is `<= now`."""
+        fired: list[Hashable] = []
+        while True:
+            due_at = self.next_deadline()
+            if due_at is None or due_at > now:
+                return fired
+            _, _, key = heapq.heappop(self._heap)
+            del self._live[key]
+            fired.append(key)
+
+    async def wait(self, timeout: float) -> None:
+        """Sleep up to `timeout` seconds, waking early if an earlier deadline arrives."""
+        self._wakeup.clear()
+        await clock.wait(self._wakeup, timeout)
+
+
+# Horizon = one reconciliation interval (scheduler.CHECK_INTERVAL_SECONDS).
+pulse_deadlines = DeadlineQueue(horizon_seconds=10 * 60)
@@ -7,13 +7,14 @@ and listing/removing guardians.
 import logging
 import random
 import string
-from datetime import datetime, timedelta
+from datetime import timedelta
 from uuid import UUID
 
 from sqlalchemy import select, delete, and_
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import clock
 from app.models.user import User
 from app.models.guardian import Guardian
 
@@ -41,7 +42,7 @@ async def create_invitation_code(user_id: UUID, expires_minutes: int = 60 * 24)
         The generated invitation code.
     """
     # Clean up expired codes
-    now = datetime.utcnow()
+    now = clock.utcnow()
     expired = [k for k, v in _invitation_codes.items() if v["expires_at"] < now]
     for k in expired:
         del _invitation_codes[k]
@@ -77,7 +78,7 @@ async def accept_invitation(db: AsyncSession, guardian_id: UUID, code: str) -> G
     if not data:
         raise ValueError("Invalid invitation code")
         
-    if data["expires_at"] < datetime.utcnow():
+    if data["expires_at"] < clock.utcnow():
         del _invitation_codes[code]
         raise ValueError("Invitation code expired")
         
@@ -101,7 +102,7 @@ async def accept_invitation(db: AsyncSession, guardian_id: UUID, code: str) -> G
     guardian = Guardian(
         ward_id=ward_id,
         guardian_id=guardian_id,
-        created_at=datetime.utcnow()
+        created_at=clock.utcnow()
     )
     
     db.add(guardian)
@@ -130,6 +131,29 @@ async def get_guardians(db: AsyncSession, user_id: UUID) -> list[User]:
     return result.scalars().all()
 
 
+async def get_guardians_for_wards(
+    db: AsyncSession,
+    ward_ids: list[UUID],
+) -> dict[UUID, list[User]]:
+    """Guardians of many wards in one joined query, grouped by ward_id.
+
+    Used by the pulse engine's escalation pass instead of calling
+    `get_guardians` once per escalated event.
+    """
+    if not ward_ids:
+        return {}
+    stmt = (
+        select(Guardian.ward_id, User)
+        .join(User, Guardian.guardian_id == User.id)
+        .where(Guardian.ward_id.in_(set(ward_ids)))
+    )
+    result = await db.execute(stmt)
+    grouped: dict[UUID, list[User]] = {}
+    for ward_id, guardian in result.all():
+        grouped.setdefault(ward_id, []).append(guardian)
+    return grouped
+
+
 async def get_wards(db: AsyncSession, user_id: UUID) -> list[User]:
     """Get list of wards this user is protecting."""
     stmt = (
@@ -141,6 +165,17 @@ async def get_wards(db: AsyncSession, user_id: UUID) -> list[User]:
     return result.scalars().all()
 
 
+async def is_guardian_of(db: AsyncSession, guardian_id: UUID, ward_id: UUID) -> bool:
+    """Whether `guardian_id` is watching over `ward_id`."""
+    stmt = select(Guardian.id).where(
+        and_(
+            Guardian.ward_id == ward_id,
+            Guardian.guardian_id == guardian_id,
+        )
+    )
+    return (await db.execute(stmt.limit(1))).first() is not None
+
+
 async def remove_guardian(db: AsyncSession, ward_id: UUID, guardian_id: UUID) -> bool:
     """Remove a guardian relationship."""
     stmt = delete(Guardian).where(
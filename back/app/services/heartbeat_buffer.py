@@ -0,0 +1,173 @@
+"""Write-behind buffer for heartbeats.
+
+`POST /signal/heartbeat` used to INSERT an activity signal, UPDATE
+`users.last_active_at`, commit and refresh — per call, with foreground
+devices calling every ~30s. Now the signal row goes to the bulk ingest
+queue (`signal_ingest`) and `last_active_at` to this in-process buffer,
+coalesced per user (latest wins): N heartbeats of one user between
+flushes cost a single row in one `UPDATE users ... FROM (VALUES ...)`.
+
+The `HeartbeatFlusher` loop (scheduler) flushes every
+`HEARTBEAT_FLUSH_INTERVAL_SECONDS`, early once
+`HEARTBEAT_BUFFER_MAX_ENTRIES` users are pending, and once more on
+shutdown.
+
+Bounded staleness: a heartbeat reaches the DB within the flush interval
+(plus flush time). The pulse sweep evaluates inactivity as of
+`now - HEARTBEAT_MAX_STALENESS_SECONDS` (`pulse_engine.sweep_cutoff`),
+so a heartbeat still sitting in any worker's buffer can never make the
+sweep see a user as inactive. A flush that fails puts its entries back
+(latest timestamp still wins) and is retried on the next tick.
+
+Single-process; every worker has its own buffer. A hard crash loses at
+most one flush interval of heartbeats — the next heartbeat (≤30s later)
+restores `last_active_at`.
+
+Each flushed user's new `last_active_at` / `next_check_due_at` is pushed
+to their open status streams (`status_stream`).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DateTime, column, or_, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import clock
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.user import User
+from app.services.deadline_queue import pulse_deadlines
+from app.services.pulse_engine import next_check_due_expr
+from app.services.status_stream import publish_activity
+
+logger = logging.getLogger(__name__)
+
+FLUSH_SECONDS = metrics.histogram(
+    "inrem_heartbeat_flush_seconds",
+    "Heartbeat buffer flush duration",
+)
+FLUSHED_USERS = metrics.counter(
+    "inrem_heartbeat_flushed_users_total",
+    "users.last_active_at rows written by heartbeat buffer flushes",
+)
+PENDING_USERS = metrics.gauge(
+    "inrem_heartbeat_pending_users",
+    "Users with a buffered last_active_at not yet flushed",
+)
+
+
+class HeartbeatBuffer:
+    """Per-user latest activity, flushed in batches."""
+
+    def __init__(self, max_entries: int | None = None) -> None:
+        self.max_entries = max_entries or settings.HEARTBEAT_BUFFER_MAX_ENTRIES
+        self._last_active: dict[UUID, datetime] = {}
+        self._flush_lock = asyncio.Lock()
+        # Set when the buffer reaches `max_entries` — wakes the flusher early.
+        self.full = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._last_active)
+
+    def add(self, user_id: UUID, now: datetime | None = None) -> datetime:
+        """Record activity of `user_id` at `now`. Returns the timestamp used."""
+        if now is None:
+            now = clock.utcnow()
+        self._merge(user_id, now)
+        PENDING_USERS.set(len(self._last_active))
+        if len(self._last_active) >= self.max_entries:
+            self.full.set()
+        return now
+
+    def pending_last_active(self, user_id: UUID) -> datetime | None:
+        """Buffered (not yet flushed) activity of `user_id`, for read-your-writes."""
+        return self._last_active.get(user_id)
+
+    def _merge(self, user_id: UUID, at: datetime) -> None:
+        current = self._last_active.get(user_id)
+        if current is None or at > current:
+            self._last_active[user_id] = at
+
+    def _drain(self) -> dict[UUID, datetime]:
+        last_active, self._last_active = self._last_active, {}
+        self.full.clear()
+        return last_active
+
+    def _restore(self, last_active: dict[UUID, datetime]) -> None:
+        for user_id, at in last_active.items():
+            self._merge(user_id, at)
+
+    async def flush(self, db: AsyncSession) -> int:
+        """Write everything buffered so far and commit.
+
+        Entries added while the flush awaits the DB go to the next flush.
+        On error the drained entries are put back and the error re-raised.
+
+        Returns:
+            Number of users flushed.
+        """
+        async with self._flush_lock:
+            last_active = self._drain()
+            PENDING_USERS.set(0)
+            if not last_active:
+                return 0
+            started = time.perf_counter()
+            try:
+                due = await _write(db, last_active)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                self._restore(last_active)
+                PENDING_USERS.set(len(self._last_active))
+                raise
+            finally:
+                FLUSH_SECONDS.observe(time.perf_counter() - started)
+
+        for user_id, due_at in due:
+            pulse_deadlines.schedule(("user", user_id), due_at)
+            publish_activity(user_id, last_active[user_id], due_at)
+        FLUSHED_USERS.inc(len(last_active))
+        return len(last_active)
+
+
+async def _write(
+    db: AsyncSession,
+    last_active: dict[UUID, datetime],
+) -> list[tuple[UUID, datetime | None]]:
+    """One UPDATE ... FROM (VALUES ...) over every buffered user.
+
+    Returns `(user_id, next_check_due_at)` of the users actually moved.
+    """
+    # `WITH hb(user_id, at) AS (VALUES ...)` rather than an aliased
+    # `FROM (VALUES ...) AS hb(...)` — SQLite has no column-alias lists on
+    # subqueries; Postgres plans both the same.
+    batch = (
+        values(
+            column("user_id", User.__table__.c.id.type),
+            column("at", DateTime()),
+            name="hb",
+        )
+        .data(list(last_active.items()))
+        .cte("hb")
+    )
+    result = await db.execute(
+        update(User)
+        .add_cte(batch)
+        .where(
+            User.id == batch.c.user_id,
+            # Never move activity backwards (a synchronous write may be newer).
+            or_(User.last_active_at.is_(None), User.last_active_at < batch.c.at),
+        )
+        .values(last_active_at=batch.c.at, next_check_due_at=next_check_due_expr(batch.c.at))
+        .returning(User.id, User.next_check_due_at)
+        .execution_options(synchronize_session=False)
+    )
+    return [(row[0], row[1]) for row in result.all()]
+
+
+heartbeat_buffer = HeartbeatBuffer()
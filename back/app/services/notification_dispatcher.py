@@ -0,0 +1,210 @@
+"""Notification outbox dispatcher.
+
+Detection (pulse engine) and delivery (this module) are decoupled through
+the `notification_outbox` table:
+
+1. The engine inserts PENDING rows in the same transaction as the
+   PulseEvent change.
+2. `claim_batch()` leases up to `OUTBOX_BATCH_SIZE` due rows: picked with
+   `FOR UPDATE SKIP LOCKED` (several workers can dispatch in parallel
+   without double-sending), set to SENDING with `next_attempt_at` pushed
+   `OUTBOX_LEASE_SECONDS` ahead, and committed. No row lock is held while
+   the NotificationProvider / EmailProvider are called (bounded fan-out).
+3. Each row is marked SENT, or rescheduled with exponential backoff, or
+   marked FAILED after `OUTBOX_MAX_ATTEMPTS` — or at once when the
+   failure is permanent (no guardians to alert, user gone). Rows whose
+   PulseEvent was closed (the ward responded, event expired) or moved
+   past the row's stage are marked FAILED without being sent.
+
+A dispatcher that dies mid-batch leaves its rows SENDING; they are
+claimed again once the lease runs out.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import clock
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.expressions import is_const
+from app.models.notification_outbox import NotificationOutbox, OutboxKind, OutboxStatus
+from app.models.pulse_event import PulseEvent, PulseStage, PulseStatus
+from app.models.user import User
+from app.services.guardian_service import get_guardians_for_wards
+from app.services.notification_fanout import FanoutResult, fan_out
+from app.services.notification_service import (
+    send_emergency_notification,
+    send_guardian_notification,
+    send_soft_checkin_notification,
+)
+
+logger = logging.getLogger(__name__)
+
+DISPATCH_BATCH_SECONDS = metrics.histogram(
+    "inrem_notification_dispatch_batch_seconds", "Time to send and record one outbox batch"
+)
+OUTBOX_ROWS = metrics.counter(
+    "inrem_notification_outbox_rows_total", "Outbox rows processed, by kind and outcome"
+)
+
+# Backoff: 30s, 60s, 120s, ... capped at 30 min.
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 30 * 60
+
+
+# Event stage each kind of row is sent for (stages are declared in order).
+KIND_STAGE = {
+    OutboxKind.SOFT_CHECKIN: PulseStage.SOFT_CHECK,
+    OutboxKind.GUARDIAN_ALERT: PulseStage.GUARDIAN_ALERT,
+    OutboxKind.EMERGENCY_ALERT: PulseStage.EMERGENCY,
+}
+STAGE_ORDER = {stage: i for i, stage in enumerate(PulseStage)}
+
+
+def is_stale(kind: OutboxKind, status: PulseStatus, stage: PulseStage) -> bool:
+    """Whether the event moved on since the row was queued (nothing to send)."""
+    return status != PulseStatus.OPEN or STAGE_ORDER[stage] > STAGE_ORDER[KIND_STAGE[kind]]
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff before attempt number `attempts + 1`."""
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+async def claim_batch(
+    db: AsyncSession,
+    now: datetime,
+    limit: int,
+) -> list[NotificationOutbox]:
+    """Lease up to `limit` due rows to this dispatcher and commit.
+
+    Due: PENDING rows whose `next_attempt_at` passed, and SENDING rows
+    whose lease expired (their dispatcher died). Higher `priority` first
+    (high-risk users, see `activity_risk`), then oldest due. Each claim
+    counts as an attempt, so a row that keeps killing its dispatcher still
+    ends up FAILED.
+    """
+    result = await db.execute(
+        select(NotificationOutbox)
+        .where(
+            or_(
+                is_const(NotificationOutbox.status, OutboxStatus.PENDING),
+                is_const(NotificationOutbox.status, OutboxStatus.SENDING),
+            ),
+            NotificationOutbox.next_attempt_at <= now,
+        )
+        .order_by(NotificationOutbox.priority.desc(), NotificationOutbox.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = []
+    for row in result.scalars().all():
+        if row.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            # Lease expired on the last attempt.
+            row.status = OutboxStatus.FAILED
+            row.last_error = "max attempts reached"
+            OUTBOX_ROWS.inc(kind=row.kind.value, outcome="failed")
+            continue
+        row.status = OutboxStatus.SENDING
+        row.attempts += 1
+        row.next_attempt_at = now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+        claimed.append(row)
+    await db.commit()
+    return claimed
+
+
+async def dispatch_batch(
+    db: AsyncSession,
+    now: datetime | None = None,
+    limit: int | None = None,
+) -> tuple[int, FanoutResult]:
+    """Claim, send and record one batch. Returns `(claimed, fan-out result)`."""
+    if now is None:
+        now = clock.utcnow()
+    started = time.perf_counter()
+    rows = await claim_batch(db, now, limit or settings.OUTBOX_BATCH_SIZE)
+    if not rows:
+        return 0, FanoutResult()
+
+    # Two queries for the whole batch: the wards with the current state of
+    # their events, then all their guardians.
+    users: dict[UUID, User] = {}
+    events: dict[UUID, tuple[PulseStatus, PulseStage]] = {}
+    for user, event_id, status, stage in await db.execute(
+        select(User, PulseEvent.id, PulseEvent.status, PulseEvent.current_stage)
+        .join(PulseEvent, PulseEvent.user_id == User.id)
+        .where(PulseEvent.id.in_({row.event_id for row in rows}))
+    ):
+        users[user.id] = user
+        events[event_id] = (status, stage)
+    alert_wards = [row.user_id for row in rows if row.kind != OutboxKind.SOFT_CHECKIN]
+    guardians_by_ward = await get_guardians_for_wards(db, alert_wards)
+
+    # Nothing is locked any more; don't sit in a transaction while sending.
+    await db.commit()
+
+    delivered: dict[UUID, bool] = {}
+    # Failures a retry can't fix: recorded as FAILED on the first attempt.
+    permanent: dict[UUID, str] = {
+        row.id: "event closed"
+        for row in rows
+        if row.event_id in events and is_stale(row.kind, *events[row.event_id])
+    }
+
+    def _call(row: NotificationOutbox):
+        async def _send() -> bool:
+            user = users.get(row.user_id)
+            guardians = guardians_by_ward.get(row.user_id, [])
+            if user is None:
+                permanent[row.id] = "user not found"
+                ok = False
+            elif row.kind == OutboxKind.SOFT_CHECKIN:
+                ok = await send_soft_checkin_notification(user, row.event_id)
+            elif row.kind == OutboxKind.EMERGENCY_ALERT:
+                ok = (await send_emergency_notification(user, guardians, row.event_id)) > 0
+            elif not guardians:
+                permanent[row.id] = "no guardians to alert"
+                ok = False
+            else:
+                ok = (await send_guardian_notification(user, guardians, row.event_id)) > 0
+            delivered[row.id] = ok
+            return ok
+
+        return _send
+
+    result = await fan_out(_call(row) for row in rows if row.id not in permanent)
+
+    for row in rows:
+        if delivered.get(row.id):
+            row.status = OutboxStatus.SENT
+            row.sent_at = now
+            row.last_error = None
+            outcome = "sent"
+        elif row.id in permanent:
+            row.status = OutboxStatus.FAILED
+            row.last_error = permanent[row.id]
+            outcome = "failed"
+        elif row.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            row.status = OutboxStatus.FAILED
+            row.last_error = "max attempts reached"
+            outcome = "failed"
+        else:
+            row.status = OutboxStatus.PENDING
+            row.next_attempt_at = now + retry_delay(row.attempts)
+            row.last_error = "timed out or rejected by provider"
+            outcome = "retry"
+        OUTBOX_ROWS.inc(kind=row.kind.value, outcome=outcome)
+    await db.commit()
+    DISPATCH_BATCH_SECONDS.observe(time.perf_counter() - started)
+
+    logger.info(
+        "notification_outbox_dispatched",
+        extra={"claimed": len(rows), **result.as_dict()},
+    )
+    return len(rows), result
@@ -0,0 +1,80 @@
+"""Bounded-concurrency fan-out for push/email dispatch.
+
+The pulse engine used to await each notification in turn, so one slow
+FCM call delayed every later user in the sweep. `fan_out()` runs the
+calls concurrently under a semaphore, gives each one a timeout, and
+aggregates the outcome into sent / failed / timed-out counts. The outbox
+dispatcher logs them per batch and, merged, per drain (one per pulse
+sweep). Wall time ≈ slowest batch, not the sum of all calls.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Iterable
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# A zero-arg coroutine factory. Truthy result = delivered.
+NotificationCall = Callable[[], Awaitable[object]]
+
+
+@dataclass
+class FanoutResult:
+    """Aggregated outcome of one fan-out batch."""
+
+    sent: int = 0
+    failed: int = 0
+    timed_out: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.sent + self.failed + self.timed_out
+
+    def merge(self, other: "FanoutResult") -> "FanoutResult":
+        return FanoutResult(
+            sent=self.sent + other.sent,
+            failed=self.failed + other.failed,
+            timed_out=self.timed_out + other.timed_out,
+        )
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+async def fan_out(
+    calls: Iterable[NotificationCall],
+    *,
+    concurrency: int | None = None,
+    timeout: float | None = None,
+) -> FanoutResult:
+    """Run `calls` with at most `concurrency` in flight, each capped at `timeout` s.
+
+    Exceptions are counted as failures (and logged) — one broken provider
+    call never aborts the rest of the batch.
+    """
+    limit = asyncio.Semaphore(concurrency or settings.NOTIFICATION_CONCURRENCY)
+    per_call = timeout if timeout is not None else settings.NOTIFICATION_TIMEOUT_SECONDS
+    result = FanoutResult()
+
+    async def _run(call: NotificationCall) -> None:
+        async with limit:
+            try:
+                ok = await asyncio.wait_for(call(), timeout=per_call)
+            except asyncio.TimeoutError:
+                result.timed_out += 1
+                return
+            except Exception as e:
+                logger.error("notification_call_failed", extra={"error": str(e)})
+                result.failed += 1
+                return
+        if ok:
+            result.sent += 1
+        else:
+            result.failed += 1
+
+    await asyncio.gather(*(_run(call) for call in calls))
+    return result
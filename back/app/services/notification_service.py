@@ -266,16 +266,60 @@ async def send_guardian_notification(
     )
 
     if result["failure_count"] > 0:
-        from app.services.email_service import send_guardian_email_alert
-
-        failed_tokens_set = set(result["failed_tokens"])
-        for g in guardians:
-            should_email = (not g.fcm_token) or (g.fcm_token in failed_tokens_set)
-            if should_email and g.email:
-                try:
-                    await send_guardian_email_alert(g.email, ward.email, event_id)
-                    logger.info(f"[Email] Fallback email sent to {g.email}")
-                except Exception as e:
-                    logger.error(f"[Email] Fallback failed for {g.email}: {e}")
+        await _guardian_email_fallback(ward, guardians, result["failed_tokens"], event_id)
 
     return result["success_count"]
+
+
+async def send_emergency_notification(
+    ward: User,
+    guardians: list[User],
+    event_id: UUID,
+) -> int:
+    """Level 3 — guardians were alerted and nobody has responded yet.
+
+    Re-alerts every guardian (email fallback like Level 2) and pings the
+    ward one more time. Returns the number of successful pushes.
+    """
+    tokens = [g.fcm_token for g in guardians if g.fcm_token]
+    if ward.fcm_token:
+        tokens.append(ward.fcm_token)
+    if not tokens:
+        logger.warning(f"[FCM] No valid tokens for emergency of user {ward.id}")
+        return 0
+
+    result = await send_multicast_notification(
+        tokens=tokens,
+        title="긴급: 응답 없음",
+        body=f"{ward.email}님이 보호자 알림 이후에도 응답이 없습니다. 즉시 확인해 주세요.",
+        data={
+            "type": "EMERGENCY_ALERT",
+            "event_id": str(event_id),
+            "ward_id": str(ward.id),
+            "severity": "CRITICAL",
+        },
+    )
+
+    if result["failure_count"] > 0:
+        await _guardian_email_fallback(ward, guardians, result["failed_tokens"], event_id)
+
+    return result["success_count"]
+
+
+async def _guardian_email_fallback(
+    ward: User,
+    guardians: list[User],
+    failed_tokens: list[str],
+    event_id: UUID,
+) -> None:
+    from app.services.email_service import send_guardian_email_alert
+
+    failed_tokens_set = set(failed_tokens)
+    for g in guardians:
+        should_email = (not g.fcm_token) or (g.fcm_token in failed_tokens_set)
+        if should_email and g.email:
+            try:
+                await send_guardian_email_alert(g.email, ward.email, event_id)
+                logger.info(f"[Email] Fallback email sent to {g.email}")
+            except Exception as e:
+                logger.error(f"[Email] Fallback failed for {g.email}: {e}")
@@ -0,0 +1,299 @@
+"""Policy what-if simulator — replay `activity_signals` under a candidate policy.
+
+Answers "what would happen if we changed RELAXED/NORMAL/STRICT thresholds
+or the default escalation delay?" before shipping the change. The stored
+activity history is turned into *gaps* (time between consecutive
+signals of a user) and the pulse engine's decision rules are replayed
+over every gap at once with NumPy:
+
+1. The soft check is due `threshold` after the last activity and opens at
+   the first instant outside the user's quiet hours (`pulse_batch`
+   quiet-hours rule; the deadline queue makes real sweeps near-exact).
+2. The next signal of the user ends the gap — it resolves any open
+   event, exactly like `/pulse/respond` or a heartbeat would.
+3. Escalation fires `escalation_delay_minutes` after the soft check,
+   EMERGENCY `emergency_delay_minutes` after that, both only while the
+   event is still open (before the next signal and before expiry).
+4. An unanswered event expires after `event_expiry_hours`; the user is
+   re-armed immediately (`advance_stale_events`), so a long gap can yield
+   several cycles. Cycles are replayed in rounds, each round vectorized.
+
+A *false alarm* is an escalation after which the user came back on their
+own within `false_alarm_window` — guardians were alerted for nothing.
+
+Users are processed in chunks (keyset pagination on user id), so memory
+stays bounded and months of history for the whole base fit in minutes.
+See `tests/scripts/simulate_policy.py` for the CLI.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.activity_signal import ActivitySignal
+from app.models.monitoring_policy import MonitoringPolicy, SensitivityLevel
+from app.services.pulse_batch import (
+    US_PER_DAY,
+    US_PER_HOUR,
+    datetimes_to_array,
+    quiet_hours_mask,
+    times_to_us,
+)
+
+US_PER_MINUTE = 60_000_000
+
+
+@dataclass
+class CandidatePolicy:
+    """Overrides applied on top of each user's stored MonitoringPolicy.
+
+    `None` keeps the user's current value.
+    """
+
+    thresholds: dict[SensitivityLevel, int] = field(default_factory=dict)
+    escalation_delay_minutes: int | None = None
+    emergency_delay_minutes: int | None = None
+    event_expiry_hours: int | None = None
+
+
+@dataclass
+class SimulationResult:
+    """Counts produced by one replay."""
+
+    users: int = 0
+    gaps: int = 0
+    soft_checks: int = 0
+    escalations: int = 0
+    emergencies: int = 0
+    false_alarms: int = 0
+    users_alerted: int = 0
+
+    def merge(self, other: "SimulationResult") -> None:
+        for name, value in asdict(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class PolicyArrays:
+    """Per-user policy values in replay units (µs), aligned with user index."""
+
+    threshold_us: np.ndarray
+    quiet_start_us: np.ndarray
+    quiet_end_us: np.ndarray
+    escalation_enabled: np.ndarray
+    escalation_delay_us: np.ndarray
+    emergency_delay_us: np.ndarray
+    expiry_us: np.ndarray
+
+
+def _to_us(values: np.ndarray) -> np.ndarray:
+    return values.astype("datetime64[us]").astype(np.int64)
+
+
+def defer_past_quiet_hours(
+    due_us: np.ndarray,
+    quiet_start_us: np.ndarray,
+    quiet_end_us: np.ndarray,
+) -> np.ndarray:
+    """First instant at or after `due` that is outside quiet hours.
+
+    Quiet hours are inclusive of `quiet_end` (`is_within_quiet_hours`), so
+    a due time inside them moves to `quiet_end + 1µs`.
+    """
+    tod = due_us % US_PER_DAY
+    quiet = quiet_hours_mask(tod, quiet_start_us, quiet_end_us)
+    shift = (quiet_end_us - tod) % US_PER_DAY + 1
+    return np.where(quiet, due_us + shift, due_us)
+
+
+def replay_gaps(
+    user_idx: np.ndarray,
+    signal_us: np.ndarray,
+    end_us: int,
+    policy: PolicyArrays,
+    *,
+    start_us: int,
+    false_alarm_window_us: int,
+) -> SimulationResult:
+    """Replay the engine over every activity gap.
+
+    Args:
+        user_idx: int array, index into `policy` arrays; sorted by
+            `(user_idx, signal_us)`.
+        signal_us: Signal timestamps (µs since epoch).
+        end_us: End of the replay window; trailing gaps are cut here.
+        policy: Per-user policy arrays.
+        start_us: Alerts before this instant are not counted (the seed
+            signal before the window only establishes "last active").
+        false_alarm_window_us: See module docstring.
+    """
+    n = len(signal_us)
+    result = SimulationResult(gaps=n)
+    if n == 0:
+        return result
+
+    # Gap i runs from signal i to the next signal of the same user (or end).
+    same_user_next = np.zeros(n, dtype=bool)
+    same_user_next[:-1] = user_idx[1:] == user_idx[:-1]
+    gap_end = np.full(n, end_us, dtype=np.int64)
+    gap_end[:-1] = np.where(same_user_next[:-1], signal_us[1:], end_us)
+    resumed = same_user_next  # gap ended by real activity, not the window
+
+    thr = policy.threshold_us[user_idx]
+    qs = policy.quiet_start_us[user_idx]
+    qe = policy.quiet_end_us[user_idx]
+    enabled = policy.escalation_enabled[user_idx]
+    esc_delay = policy.escalation_delay_us[user_idx]
+    emg_delay = policy.emergency_delay_us[user_idx]
+    expiry = policy.expiry_us[user_idx]
+
+    alerted = np.zeros(len(policy.threshold_us), dtype=bool)
+    users = user_idx
+    due = signal_us + thr
+    while len(due):
+        open_at = defer_past_quiet_hours(due, qs, qe)
+        fires = open_at < gap_end
+        counted = fires & (open_at >= start_us)
+        expire_at = open_at + expiry
+
+        esc_at = open_at + esc_delay
+        esc = counted & enabled & (esc_at < gap_end) & (esc_at < expire_at)
+        emg_at = esc_at + emg_delay
+        emg = esc & (emg_at < gap_end) & (emg_at < expire_at)
+        false_alarm = esc & resumed & (gap_end - esc_at <= false_alarm_window_us)
+
+        result.soft_checks += int(counted.sum())
+        result.escalations += int(esc.sum())
+        result.emergencies += int(emg.sum())
+        result.false_alarms += int(false_alarm.sum())
+        alerted[users[counted]] = True
+
+        # Unanswered → EXPIRED, due again immediately (re-armed to expiry
+        # time). Only those gaps go into the next round.
+        again = fires & (expire_at < gap_end)
+        due = expire_at[again]
+        users, gap_end, resumed = users[again], gap_end[again], resumed[again]
+        qs, qe, enabled = qs[again], qe[again], enabled[again]
+        esc_delay, emg_delay, expiry = esc_delay[again], emg_delay[again], expiry[again]
+    result.users_alerted = int(alerted.sum())
+    return result
+
+
+def build_policy_arrays(
+    rows: list[tuple],
+    candidate: CandidatePolicy | None,
+) -> PolicyArrays:
+    """Rows of `(sensitivity, threshold_hours, quiet_start, quiet_end,
+    escalation_enabled, escalation_delay_minutes, emergency_delay_minutes,
+    event_expiry_hours)` → arrays, with `candidate` overrides applied."""
+    candidate = candidate or CandidatePolicy()
+    sensitivity = [r[0] or SensitivityLevel.NORMAL for r in rows]
+    threshold = np.array(
+        [candidate.thresholds.get(s, r[1]) for s, r in zip(sensitivity, rows)],
+        dtype=np.int64,
+    )
+
+    def _column(i: int, override: int | None, default: int) -> np.ndarray:
+        if override is not None:
+            return np.full(len(rows), override, dtype=np.int64)
+        return np.array([default if r[i] is None else r[i] for r in rows], dtype=np.int64)
+
+    return PolicyArrays(
+        threshold_us=threshold * US_PER_HOUR,
+        quiet_start_us=times_to_us([r[2] for r in rows]),
+        quiet_end_us=times_to_us([r[3] for r in rows]),
+        escalation_enabled=np.array([bool(r[4]) for r in rows], dtype=bool),
+        escalation_delay_us=_column(5, candidate.escalation_delay_minutes, 60) * US_PER_MINUTE,
+        emergency_delay_us=_column(6, candidate.emergency_delay_minutes, 120) * US_PER_MINUTE,
+        expiry_us=_column(7, candidate.event_expiry_hours, 72) * US_PER_HOUR,
+    )
+
+
+async def simulate(
+    db: AsyncSession,
+    start: datetime,
+    end: datetime,
+    candidate: CandidatePolicy | None = None,
+    *,
+    false_alarm_window: timedelta = timedelta(hours=24),
+    chunk_users: int = 2_000,
+) -> SimulationResult:
+    """Replay `[start, end)` of stored activity for every monitored user.
+
+    `candidate=None` replays the policies as stored (the baseline).
+    """
+    total = SimulationResult()
+    start_us = int(_to_us(np.array([start], dtype="datetime64[us]"))[0])
+    end_us = int(_to_us(np.array([end], dtype="datetime64[us]"))[0])
+    last_user: UUID | None = None
+
+    while True:
+        stmt = (
+            select(
+                MonitoringPolicy.user_id,
+                MonitoringPolicy.sensitivity,
+                MonitoringPolicy.threshold_hours,
+                MonitoringPolicy.quiet_start,
+                MonitoringPolicy.quiet_end,
+                MonitoringPolicy.escalation_enabled,
+                MonitoringPolicy.escalation_delay_minutes,
+                MonitoringPolicy.emergency_delay_minutes,
+                MonitoringPolicy.event_expiry_hours,
+            )
+            .where(MonitoringPolicy.is_active == True)
+            .order_by(MonitoringPolicy.user_id)
+            .limit(chunk_users)
+        )
+        if last_user is not None:
+            stmt = stmt.where(MonitoringPolicy.user_id > last_user)
+        policies = (await db.execute(stmt)).all()
+        if not policies:
+            return total
+        last_user = policies[-1][0]
+        index = {row[0]: i for i, row in enumerate(policies)}
+        arrays = build_policy_arrays([tuple(row[1:]) for row in policies], candidate)
+
+        # Last activity before the window seeds the first gap.
+        seeds = (
+            await db.execute(
+                select(ActivitySignal.user_id, func.max(ActivitySignal.timestamp))
+                .where(
+                    ActivitySignal.user_id.in_(index.keys()),
+                    ActivitySignal.timestamp < start,
+                )
+                .group_by(ActivitySignal.user_id)
+            )
+        ).all()
+        signals = (
+            await db.execute(
+                select(ActivitySignal.user_id, ActivitySignal.timestamp).where(
+                    ActivitySignal.user_id.in_(index.keys()),
+                    ActivitySignal.timestamp >= start,
+                    ActivitySignal.timestamp < end,
+                )
+            )
+        ).all()
+
+        rows = seeds + signals
+        user_idx = np.fromiter((index[r[0]] for r in rows), dtype=np.int64, count=len(rows))
+        signal_us = _to_us(datetimes_to_array([r[1] for r in rows]))
+        order = np.lexsort((signal_us, user_idx))
+
+        chunk = replay_gaps(
+            user_idx[order],
+            signal_us[order],
+            end_us,
+            arrays,
+            start_us=start_us,
+            false_alarm_window_us=int(false_alarm_window.total_seconds() * 1_000_000),
+        )
+        chunk.users = len(policies)
+        total.merge(chunk)
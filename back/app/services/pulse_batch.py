@@ -0,0 +1,109 @@
+"""Vectorized (NumPy) versions of the pulse engine's scalar rules.
+
+`pulse_engine.is_within_quiet_hours` / `is_user_inactive` evaluate one
+user at a time. The functions here take whole columns and return boolean
+masks, so simulators and policy what-if tooling can evaluate millions of
+users in milliseconds. They are exact mirrors of the scalar versions
+(same boundary inclusiveness, same overnight wrap-around) — see
+`tests/test_pulse_batch.py`.
+
+Representation (chosen so results are bit-exact, no float rounding):
+- times of day → int64 microseconds since midnight (`times_to_us`).
+- timestamps   → `datetime64[us]`, `NaT` = never active (`datetimes_to_array`).
+"""
+from __future__ import annotations
+
+from datetime import datetime, time
+from typing import Sequence
+
+import numpy as np
+
+US_PER_SECOND = 1_000_000
+US_PER_HOUR = 3600 * US_PER_SECOND
+US_PER_DAY = 24 * US_PER_HOUR
+
+
+def time_to_us(value: time) -> int:
+    """Microseconds since midnight for a `datetime.time`."""
+    return (
+        (value.hour * 3600 + value.minute * 60 + value.second) * US_PER_SECOND
+        + value.microsecond
+    )
+
+
+def times_to_us(values: Sequence[time]) -> np.ndarray:
+    """Convert a sequence of `time` objects to an int64 µs-of-day array."""
+    return np.fromiter((time_to_us(v) for v in values), dtype=np.int64, count=len(values))
+
+
+def datetimes_to_array(values: Sequence[datetime | None]) -> np.ndarray:
+    """Convert naive datetimes (None allowed) to `datetime64[us]` with NaT."""
+    return np.array(
+        [np.datetime64("NaT") if v is None else np.datetime64(v, "us") for v in values],
+        dtype="datetime64[us]",
+    )
+
+
+def _us_of_day(value: time | np.ndarray | int) -> np.ndarray:
+    if isinstance(value, time):
+        return np.int64(time_to_us(value))
+    return np.asarray(value, dtype=np.int64)
+
+
+def quiet_hours_mask(
+    current_time: time | np.ndarray,
+    quiet_start: np.ndarray,
+    quiet_end: np.ndarray,
+) -> np.ndarray:
+    """Element-wise `is_within_quiet_hours`.
+
+    Args:
+        current_time: One `time` for everyone, or an array of µs-of-day.
+        quiet_start: µs-of-day array (see `times_to_us`).
+        quiet_end: µs-of-day array.
+
+    Returns:
+        Boolean mask — True where the current time is inside quiet hours.
+    """
+    cur = _us_of_day(current_time)
+    start = _us_of_day(quiet_start)
+    end = _us_of_day(quiet_end)
+    same_day = (start <= cur) & (cur <= end)
+    overnight = (cur >= start) | (cur <= end)
+    return np.where(start <= end, same_day, overnight)
+
+
+def inactive_mask(
+    last_active_at: np.ndarray,
+    threshold_hours: np.ndarray,
+    now: datetime | np.datetime64,
+) -> np.ndarray:
+    """Element-wise `is_user_inactive`.
+
+    Args:
+        last_active_at: `datetime64[us]` array, NaT = never active.
+        threshold_hours: Integer array of per-user thresholds.
+        now: Evaluation instant.
+
+    Returns:
+        Boolean mask — True where the user is past their threshold.
+    """
+    last = np.asarray(last_active_at, dtype="datetime64[us]")
+    never = np.isnat(last)
+    elapsed = np.datetime64(now, "us") - last
+    threshold = np.asarray(threshold_hours, dtype=np.int64) * US_PER_HOUR
+    # NaT comparisons are False, so `never` carries those rows.
+    return never | (elapsed > threshold.astype("timedelta64[us]"))
+
+
+def soft_check_due_mask(
+    last_active_at: np.ndarray,
+    threshold_hours: np.ndarray,
+    quiet_start: np.ndarray,
+    quiet_end: np.ndarray,
+    now: datetime,
+) -> np.ndarray:
+    """Users the sweep would open a SOFT_CHECK for (ignoring open events)."""
+    return inactive_mask(last_active_at, threshold_hours, now) & ~quiet_hours_mask(
+        now.time(), quiet_start, quiet_end
+    )
@@ -4,17 +4,147 @@ This module contains the core logic for detecting inactive users
 and creating PulseEvents to trigger welfare checks.
 """
 
+import logging
+import time as perf
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, time, timedelta
-from typing import Sequence
-from uuid import UUID
+from typing import Iterator
+from uuid import UUID, uuid4
 
-from sqlalchemy import select, and_
+import numpy as np
+from sqlalchemy import (
+    DateTime,
+    Time,
+    and_,
+    case,
+    cast,
+    func,
+    insert,
+    literal,
+    not_,
+    null,
+    or_,
+    select,
+    text,
+    true,
+    union,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
+from app.core import clock
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.db.expressions import add_minutes, dialect_insert, is_const, new_uuid, shard_of
+from app.services import activity_baseline, activity_risk
+from app.services.activity_rollup import floor_hour
+from app.services.deadline_queue import pulse_deadlines
+from app.services.status_stream import publish_pulse
+from app.services.watermark_service import advance_watermark, get_watermark
 from app.models.user import User
+from app.models.activity_baseline import ActivityBaseline
 from app.models.monitoring_policy import MonitoringPolicy
+from app.models.notification_outbox import NotificationOutbox, OutboxKind, OutboxStatus
 from app.models.pulse_event import PulseEvent, PulseStage, PulseStatus
-from app.services.notification_service import send_soft_checkin_notification
+
+logger = logging.getLogger(__name__)
+
+SWEEP_PHASE_SECONDS = metrics.histogram(
+    "inrem_pulse_sweep_phase_seconds", "Time spent per pulse sweep phase"
+)
+SWEEP_USERS = metrics.counter(
+    "inrem_pulse_sweep_users_total", "Users seen by pulse sweeps, by outcome"
+)
+SWEEP_OVERRUNS = metrics.counter(
+    "inrem_pulse_sweep_overruns_total", "Sweeps that took longer than the scheduler interval"
+)
+DETECTION_LAG_SECONDS = metrics.histogram(
+    "inrem_pulse_detection_lag_seconds",
+    "Delay between a user's next_check_due_at and their soft check being opened",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 3600),
+)
+UNUSUAL_SILENCES = metrics.counter(
+    "inrem_pulse_unusual_silences_total",
+    "Silences flagged as much longer than the user's circadian baseline",
+)
+LAST_SWEEP_TIMESTAMP = metrics.gauge(
+    "inrem_pulse_last_sweep_timestamp_seconds", "Unix time the last pulse sweep finished"
+)
+
+
+@dataclass
+class SweepStats:
+    """Instrumentation for one pulse sweep (one shard, or all of them merged).
+
+    Phases (milliseconds):
+    - `candidate_selection` — counting due users / quiet-hour skips.
+    - `event_creation` — the INSERT ... SELECT and loading the new events.
+    - `notification_enqueue` — writing outbox rows (delivery itself is
+      asynchronous, see `notification_dispatcher`).
+    - `escalation` — the SOFT_CHECK → GUARDIAN_ALERT pass.
+    - `stage_progression` — GUARDIAN_ALERT → EMERGENCY and OPEN → EXPIRED.
+    - `baseline_deviation` — silences compared with circadian baselines.
+    """
+
+    users_evaluated: int = 0
+    quiet_hours_skipped: int = 0
+    newly_inactive: int = 0
+    escalated: int = 0
+    emergencies: int = 0
+    expired: int = 0
+    unusual_silences: int = 0
+    max_detection_lag_seconds: float = 0.0
+    phase_ms: dict[str, float] = field(default_factory=dict)
+    total_ms: float = 0.0
+    overrun: bool = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = perf.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (perf.perf_counter() - started) * 1000
+            self.phase_ms[name] = self.phase_ms.get(name, 0.0) + elapsed
+
+    def merge(self, other: "SweepStats") -> None:
+        self.users_evaluated += other.users_evaluated
+        self.quiet_hours_skipped += other.quiet_hours_skipped
+        self.newly_inactive += other.newly_inactive
+        self.escalated += other.escalated
+        self.emergencies += other.emergencies
+        self.expired += other.expired
+        self.unusual_silences += other.unusual_silences
+        self.max_detection_lag_seconds = max(
+            self.max_detection_lag_seconds, other.max_detection_lag_seconds
+        )
+        for name, ms in other.phase_ms.items():
+            self.phase_ms[name] = self.phase_ms.get(name, 0.0) + ms
+        self.total_ms += other.total_ms
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data["phase_ms"] = {k: round(v, 2) for k, v in self.phase_ms.items()}
+        data["total_ms"] = round(self.total_ms, 2)
+        return data
+
+    def record(self) -> None:
+        """Publish to the metrics registry (call once per finished sweep)."""
+        for name, ms in self.phase_ms.items():
+            SWEEP_PHASE_SECONDS.observe(ms / 1000, phase=name)
+        SWEEP_PHASE_SECONDS.observe(self.total_ms / 1000, phase="total")
+        SWEEP_USERS.inc(self.users_evaluated, outcome="evaluated")
+        SWEEP_USERS.inc(self.quiet_hours_skipped, outcome="quiet_hours_skipped")
+        SWEEP_USERS.inc(self.newly_inactive, outcome="newly_inactive")
+        SWEEP_USERS.inc(self.escalated, outcome="escalated")
+        SWEEP_USERS.inc(self.emergencies, outcome="emergency")
+        SWEEP_USERS.inc(self.expired, outcome="expired")
+        UNUSUAL_SILENCES.inc(self.unusual_silences)
+        if self.overrun:
+            SWEEP_OVERRUNS.inc()
+        LAST_SWEEP_TIMESTAMP.set(perf.time())
 
 
 def is_within_quiet_hours(
@@ -61,7 +191,7 @@ def is_user_inactive(
         return True  # Never active = inactive
     
     if now is None:
-        now = datetime.utcnow()
+        now = clock.utcnow()
     
     inactive_duration = now - last_active_at
     threshold = timedelta(hours=threshold_hours)
@@ -69,182 +199,744 @@ def is_user_inactive(
     return inactive_duration > threshold
 
 
-async def get_users_to_check(db: AsyncSession) -> Sequence[tuple[User, MonitoringPolicy]]:
-    """Get all active users with their monitoring policies.
-    
-    Returns users who have monitoring enabled and are not deceased.
+# `(shard_index, shard_count)` — restricts a sweep to one hash shard of users.
+Shard = tuple[int, int]
+
+# Incremental sweeps: a window at least this long contains every time of
+# day (so every quiet_end) — fall back to a full evaluation.
+FULL_SWEEP_WINDOW = timedelta(days=1)
+
+
+def sweep_cutoff(now: datetime) -> datetime:
+    """Instant the sweep judges inactivity at.
+
+    Heartbeats are written behind (`heartbeat_buffer`) and may reach the
+    DB up to `HEARTBEAT_MAX_STALENESS_SECONDS` late; everything before
+    the cutoff is guaranteed to be flushed.
     """
+    return now - timedelta(seconds=settings.HEARTBEAT_MAX_STALENESS_SECONDS)
+
+
+def watermark_name(shard: Shard | None) -> str:
+    """`sweep_watermarks.name` of the pulse sweep (per shard)."""
+    if shard is None:
+        return "pulse_sweep"
+    index, count = shard
+    return f"pulse_sweep:{index}/{count}"
+
+
+def _shard_clause(user_id_column, shard: Shard | None):
+    if shard is None:
+        return true()
+    index, count = shard
+    return shard_of(user_id_column, count) == index
+
+
+def _quiet_hours_clause(current_time: time):
+    """SQL mirror of `is_within_quiet_hours` over MonitoringPolicy columns."""
+    now_t = literal(current_time, Time())
+    start = MonitoringPolicy.quiet_start
+    end = MonitoringPolicy.quiet_end
+    return or_(
+        and_(start <= end, start <= now_t, now_t <= end),
+        and_(start > end, or_(now_t >= start, now_t <= end)),
+    )
+
+
+def next_check_due_expr(last_active_at):
+    """SQL expression for `users.next_check_due_at` given a last_active_at.
+
+    `last_active_at` may be a column or a bound value. The threshold comes
+    from a correlated subquery on the user's MonitoringPolicy, so callers
+    can refresh the due time in the same UPDATE that bumps activity.
+    """
+    threshold_hours = (
+        select(MonitoringPolicy.threshold_hours)
+        .where(MonitoringPolicy.user_id == User.id)
+        .scalar_subquery()
+    )
+    return add_minutes(last_active_at, threshold_hours * 60)
+
+
+def _rearmed_due_expr(now: datetime):
+    """`next_check_due_at` recomputed from the stored last_active_at, never before `now`.
+
+    A user who has never been active is counted from `now`. A due time
+    that would land in the past is clamped to `now`: the incremental
+    sweep only looks at due times after its watermark, so a past value
+    would never be picked up.
+    """
+    now_value = literal(now, DateTime())
+    due = next_check_due_expr(func.coalesce(User.last_active_at, now_value))
+    return case((due < now_value, now_value), else_=due)
+
+
+async def mark_user_active(db: AsyncSession, user_id: UUID, now: datetime) -> datetime | None:
+    """Bump `last_active_at` to `now` and reschedule the user's next check.
+
+    Returns the new `next_check_due_at`. Does not commit.
+    """
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(last_active_at=now, next_check_due_at=next_check_due_expr(now))
+        .returning(User.next_check_due_at)
+    )
+    due_at = result.scalar_one_or_none()
+    pulse_deadlines.schedule(("user", user_id), due_at, now=now)
+    return due_at
+
+
+async def refresh_next_check_due(
+    db: AsyncSession,
+    user_id: UUID,
+    now: datetime | None = None,
+) -> datetime | None:
+    """Recompute `next_check_due_at` from the stored last_active_at.
+
+    Call after the user's policy changes (threshold, quiet hours, on/off).
+    Never-active users and past due times are handled as in
+    `_rearmed_due_expr`. Does not commit.
+    """
+    if now is None:
+        now = clock.utcnow()
     result = await db.execute(
-        select(User, MonitoringPolicy)
+        update(User)
+        .where(User.id == user_id)
+        .values(next_check_due_at=_rearmed_due_expr(now))
+        .returning(User.next_check_due_at)
+    )
+    due_at = result.scalar_one_or_none()
+    pulse_deadlines.schedule(("user", user_id), due_at, now=now)
+    return due_at
+
+
+async def get_upcoming_deadlines(
+    db: AsyncSession,
+    now: datetime,
+    until: datetime,
+    shard: Shard | None = None,
+) -> list[tuple[tuple[str, UUID], datetime]]:
+    """Soft-check and escalation deadlines in `(now, until]`, for the deadline queue.
+
+    Past-due rows are deliberately excluded: they are either being handled
+    by the current sweep or blocked (quiet hours, open event), and the
+    reconciliation sweep retries those anyway. Soft checks are past due
+    only once they are behind `sweep_cutoff(now)`.
+    """
+    users = await db.execute(
+        select(User.id, User.next_check_due_at)
         .join(MonitoringPolicy, User.id == MonitoringPolicy.user_id)
         .where(
             and_(
+                User.next_check_due_at > sweep_cutoff(now),
+                User.next_check_due_at <= until,
                 User.is_active == True,
                 User.is_deceased == False,
                 MonitoringPolicy.is_active == True,
+                _shard_clause(User.id, shard),
             )
         )
     )
-    return result.all()
+    events = await db.execute(
+        select(PulseEvent.id, PulseEvent.escalate_at).where(
+            and_(
+                is_const(PulseEvent.status, PulseStatus.OPEN),
+                is_const(PulseEvent.current_stage, PulseStage.SOFT_CHECK),
+                PulseEvent.escalate_at > now,
+                PulseEvent.escalate_at <= until,
+                _shard_clause(PulseEvent.user_id, shard),
+            )
+        )
+    )
+    return [(("user", uid), due) for uid, due in users.all()] + [
+        (("event", eid), due) for eid, due in events.all()
+    ]
 
 
-async def has_open_pulse_event(db: AsyncSession, user_id: UUID) -> bool:
-    """Check if user already has an open PulseEvent.
-    
-    Prevents duplicate events for the same inactivity period.
+def _escalate_at_expr(soft_check_sent_at):
+    """`soft_check_sent_at + escalation delay`, NULL when escalation is off.
+
+    References MonitoringPolicy columns — use inside a query that joins
+    (or correlates to) the policy.
     """
+    return case(
+        (
+            MonitoringPolicy.escalation_enabled == True,
+            add_minutes(soft_check_sent_at, MonitoringPolicy.escalation_delay_minutes),
+        ),
+        else_=null(),
+    )
+
+
+async def refresh_escalate_at(db: AsyncSession, user_id: UUID) -> None:
+    """Recompute `escalate_at` of the user's open soft check after a policy change.
+
+    Does not commit.
+    """
+    policy_escalate_at = (
+        select(_escalate_at_expr(PulseEvent.soft_check_sent_at))
+        .where(MonitoringPolicy.user_id == PulseEvent.user_id)
+        .scalar_subquery()
+    )
     result = await db.execute(
-        select(PulseEvent)
+        update(PulseEvent)
+        .where(
+            PulseEvent.user_id == user_id,
+            is_const(PulseEvent.status, PulseStatus.OPEN),
+            is_const(PulseEvent.current_stage, PulseStage.SOFT_CHECK),
+        )
+        .values(escalate_at=policy_escalate_at)
+        .returning(PulseEvent.id, PulseEvent.escalate_at)
+        .execution_options(synchronize_session=False)
+    )
+    for event_id, escalate_at in result.all():
+        pulse_deadlines.schedule(("event", event_id), escalate_at)
+
+
+def _insert_open_event(db: AsyncSession):
+    """`INSERT INTO pulse_events` that skips users who already have an OPEN event.
+
+    `ON CONFLICT (user_id) WHERE status = 'OPEN' DO NOTHING` targets the
+    partial unique index `uq_pulse_events_open_user`, so two workers
+    sweeping the same users can never both create an event.
+    """
+    return dialect_insert(db, PulseEvent).on_conflict_do_nothing(
+        index_elements=[PulseEvent.user_id],
+        # Literal, matching the index predicate verbatim: Postgres must be
+        # able to prove the implication at plan time (no bind params).
+        index_where=text("status = 'OPEN'"),
+    )
+
+
+def _window_clause(since: datetime | None, now: datetime):
+    """Users whose eligibility could have changed in `[since, now)`.
+
+    - threshold crossed: `next_check_due_at` in the window (index range);
+    - quiet hours ended: `quiet_end` time of day in the window — users
+      who were due earlier but skipped while quiet.
+
+    Everything else that makes a user eligible again (heartbeat, policy
+    change, event expiry) moves `next_check_due_at` to `now` or later, so
+    it lands in a future window. `since=None` or a window of a day or
+    more means a full evaluation.
+    """
+    if since is None or now - since >= FULL_SWEEP_WINDOW:
+        return true()
+    crossed = select(User.id).where(
+        User.next_check_due_at >= since,
+        User.next_check_due_at < now,
+    )
+    start_t, end_t = literal(since.time(), Time()), literal(now.time(), Time())
+    quiet_end = MonitoringPolicy.quiet_end
+    if since.time() <= now.time():
+        ended = and_(quiet_end >= start_t, quiet_end < end_t)
+    else:  # window crosses midnight
+        ended = or_(quiet_end >= start_t, quiet_end < end_t)
+    quiet_ended = select(MonitoringPolicy.user_id).where(ended)
+    # correlate(None): these are standalone id sets, not correlated to the
+    # outer users/policies FROM.
+    return User.id.in_(union(crossed.correlate(None), quiet_ended.correlate(None)))
+
+
+def _due_user_filters(now: datetime, shard: Shard | None, since: datetime | None = None):
+    """Users past `next_check_due_at` with no OPEN event (quiet hours not applied).
+
+    With `since`, only users in the incremental window (`_window_clause`).
+    """
+    open_event = (
+        select(PulseEvent.id)
         .where(
             and_(
-                PulseEvent.user_id == user_id,
-                PulseEvent.status == PulseStatus.OPEN,
+                PulseEvent.user_id == User.id,
+                is_const(PulseEvent.status, PulseStatus.OPEN),
             )
         )
-        .limit(1)
+        .exists()
+    )
+    return and_(
+        User.is_active == True,
+        User.is_deceased == False,
+        MonitoringPolicy.is_active == True,
+        # Index range scan — equivalent to `is_user_inactive`.
+        User.next_check_due_at < now,
+        not_(open_event),
+        _shard_clause(User.id, shard),
+        _window_clause(since, now),
     )
-    return result.scalar_one_or_none() is not None
 
 
-async def create_pulse_event(
+async def _count_due_users(
     db: AsyncSession,
-    user_id: UUID,
-    stage: PulseStage = PulseStage.SOFT_CHECK,
-) -> PulseEvent:
-    """Create a new PulseEvent for an inactive user.
-    
-    Args:
-        db: Database session.
-        user_id: ID of the inactive user.
-        stage: Initial escalation stage.
-        
-    Returns:
-        Created PulseEvent.
-    """
-    now = datetime.utcnow()
-    
-    event = PulseEvent(
-        user_id=user_id,
-        status=PulseStatus.OPEN,
-        current_stage=stage,
-        created_at=now,
-        soft_check_sent_at=now if stage == PulseStage.SOFT_CHECK else None,
-    )
-    
-    db.add(event)
-    await db.commit()
-    await db.refresh(event)
-    
-    return event
+    now: datetime,
+    shard: Shard | None,
+    since: datetime | None = None,
+    as_of: datetime | None = None,
+) -> tuple[int, int]:
+    """`(due users, of which in quiet hours)` — one aggregate over the same index range."""
+    in_quiet = case((_quiet_hours_clause(now.time()), 1), else_=0)
+    row = (
+        await db.execute(
+            select(func.count(), func.coalesce(func.sum(in_quiet), 0))
+            .select_from(User)
+            .join(MonitoringPolicy, User.id == MonitoringPolicy.user_id)
+            .where(_due_user_filters(as_of or now, shard, since))
+        )
+    ).one()
+    return int(row[0]), int(row[1])
 
 
-    return created_events
+async def create_due_pulse_events(
+    db: AsyncSession,
+    now: datetime,
+    shard: Shard | None = None,
+    stats: SweepStats | None = None,
+    since: datetime | None = None,
+    as_of: datetime | None = None,
+) -> list[PulseEvent]:
+    """Open a SOFT_CHECK PulseEvent for every user who is due, in one statement.
 
+    Candidate selection (active/monitored user, outside quiet hours,
+    `next_check_due_at` in the past, no OPEN event yet) and the insert happen in
+    a single `INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING`, so the
+    cost is constant in the number of users. The NOT EXISTS filter keeps
+    users with an open event out of the SELECT; the conflict clause is
+    what makes concurrent sweeps safe — only rows actually inserted are
+    returned (and notified). The SOFT_CHECKIN outbox rows are written in the
+    same transaction; a second query loads the new events with their users.
 
-async def check_escalations(db: AsyncSession) -> list[PulseEvent]:
-    """Check for open events that need escalation.
-    
-    Escalates from SOFT_CHECK -> GUARDIAN_ALERT if:
-    - Status is OPEN
-    - Current stage is SOFT_CHECK
-    - Time since soft_check_sent_at > policy.escalation_delay_minutes
+    When `stats` is given, one extra aggregate query fills in the
+    evaluated / quiet-hour counters. `since` (the previous watermark)
+    limits evaluation to the incremental window; None = everyone.
+    `as_of` (default `now`) is the instant due-ness is judged at — the
+    sweep passes `sweep_cutoff(now)` so buffered heartbeats are respected.
     """
-    now = datetime.utcnow()
-    escalated_events: list[PulseEvent] = []
-    
-    # query for candidate events
-    # We join User and MonitoringPolicy to get escalation settings
-    stmt = (
-        select(PulseEvent, MonitoringPolicy, User)
-        .join(User, PulseEvent.user_id == User.id)
+    if stats is None:
+        stats = SweepStats()
+    else:
+        with stats.phase("candidate_selection"):
+            evaluated, quiet = await _count_due_users(db, now, shard, since, as_of)
+        stats.users_evaluated += evaluated
+        stats.quiet_hours_skipped += quiet
+
+    candidates = (
+        select(
+            new_uuid(),
+            User.id,
+            # Explicit CAST: Postgres won't coerce a text param into an enum
+            # column inside INSERT ... SELECT.
+            cast(PulseStatus.OPEN, PulseEvent.__table__.c.status.type),
+            cast(PulseStage.SOFT_CHECK, PulseEvent.__table__.c.current_stage.type),
+            literal(now, DateTime()),
+            literal(now, DateTime()),
+            _escalate_at_expr(literal(now, DateTime())),
+        )
         .join(MonitoringPolicy, User.id == MonitoringPolicy.user_id)
         .where(
             and_(
-                PulseEvent.status == PulseStatus.OPEN,
-                PulseEvent.current_stage == PulseStage.SOFT_CHECK,
-                MonitoringPolicy.escalation_enabled == True,
+                _due_user_filters(as_of or now, shard, since),
+                not_(_quiet_hours_clause(now.time())),
             )
         )
     )
-    
-    result = await db.execute(stmt)
-    candidates = result.all()
-    
-    for event, policy, user in candidates:
-        if not event.soft_check_sent_at:
-            continue
-            
-        # Check if delay time has passed
-        time_since_soft_check = now - event.soft_check_sent_at
-        delay_threshold = timedelta(minutes=policy.escalation_delay_minutes)
-        
-        if time_since_soft_check > delay_threshold:
-            # Escalate!
-            event.current_stage = PulseStage.GUARDIAN_ALERT
-            event.guardian_notified_at = now
-            db.add(event)
-            escalated_events.append(event)
-            
-            print(f"[PulseEngine] Escalating event {event.id} for user {user.email}")
-            
-            # Notify Guardians
-            # Need to fetch guardians
-            from app.services.guardian_service import get_guardians
-            from app.services.notification_service import send_guardian_notification
-            
-            guardians = await get_guardians(db, user.id)
-            if guardians:
-               count = await send_guardian_notification(user, guardians, event.id)
-               print(f"[PulseEngine] Sent alert to {count} guardians")
-            else:
-               print(f"[PulseEngine] No guardians found for {user.email}")
+    stmt = (
+        _insert_open_event(db)
+        .from_select(
+            [
+                "id",
+                "user_id",
+                "status",
+                "current_stage",
+                "created_at",
+                "soft_check_sent_at",
+                "escalate_at",
+            ],
+            candidates,
+        )
+        .returning(PulseEvent.id, PulseEvent.user_id)
+    )
+    with stats.phase("event_creation"):
+        created = (await db.execute(stmt)).all()
+    with stats.phase("notification_enqueue"):
+        # Same transaction as the events: an alert can't be lost to a crash.
+        await enqueue_notifications(db, OutboxKind.SOFT_CHECKIN, created, now)
+    with stats.phase("event_creation"):
+        await db.commit()
+    created_ids = [event_id for event_id, _ in created]
+    stats.newly_inactive += len(created_ids)
+    for event_id, user_id in created:
+        publish_pulse(user_id, event_id, PulseStatus.OPEN, PulseStage.SOFT_CHECK)
 
-    await db.commit()
+    if not created_ids:
+        return []
+
+    with stats.phase("event_creation"):
+        result = await db.execute(
+            select(PulseEvent)
+            .options(joinedload(PulseEvent.user))
+            .where(PulseEvent.id.in_(created_ids))
+        )
+        events = list(result.scalars().all())
+
+    for event in events:
+        due_at = event.user.next_check_due_at
+        if due_at is not None:
+            lag = max(0.0, (now - due_at).total_seconds())
+            DETECTION_LAG_SECONDS.observe(lag)
+            stats.max_detection_lag_seconds = max(stats.max_detection_lag_seconds, lag)
+    return events
+
+
+async def find_unusual_silences(
+    db: AsyncSession,
+    as_of: datetime,
+    shard: Shard | None = None,
+    since: datetime | None = None,
+    stats: SweepStats | None = None,
+) -> list[tuple[UUID, float]]:
+    """Users whose silence just became much longer than usual for them.
+
+    A silence is unusual once the hours since the user's last active hour
+    include at least `BASELINE_DEVIATION_HOURS` of expected activity per
+    their circadian baseline (`activity_baseline`) — e.g. someone active
+    every weekday morning who stays silent all morning, hours before their
+    `threshold_hours` runs out. Only users not yet due and with at least
+    `BASELINE_MIN_WEEKS` of history are considered.
+
+    Scores only change on hour boundaries: this is a no-op unless an hour
+    passed since `since` (the previous sweep), and only silences that
+    crossed the limit in between are returned, so each is flagged once.
+
+    Returns:
+        `(user_id, missed active hours)` pairs.
+    """
+    hour = floor_hour(as_of)
+    previous = floor_hour(since) if since is not None else hour - timedelta(hours=1)
+    if previous >= hour:
+        return []
+    if stats is None:
+        stats = SweepStats()
+
+    limit = settings.BASELINE_DEVIATION_HOURS
+    open_event = (
+        select(PulseEvent.id)
+        .where(PulseEvent.user_id == User.id, is_const(PulseEvent.status, PulseStatus.OPEN))
+        .exists()
+    )
+    with stats.phase("baseline_deviation"):
+        rows = (
+            await db.execute(
+                select(
+                    User.id,
+                    User.last_active_at,
+                    ActivityBaseline.profile,
+                    ActivityBaseline.observed_since,
+                    ActivityBaseline.observed_through,
+                )
+                .join(ActivityBaseline, ActivityBaseline.user_id == User.id)
+                .join(MonitoringPolicy, User.id == MonitoringPolicy.user_id)
+                .where(
+                    User.is_active == True,
+                    User.is_deceased == False,
+                    MonitoringPolicy.is_active == True,
+                    # Missing `limit` expected hours takes at least `limit` silent hours.
+                    User.last_active_at < hour - timedelta(hours=limit),
+                    User.next_check_due_at >= as_of,
+                    not_(open_event),
+                    _shard_clause(User.id, shard),
+                )
+            )
+        ).all()
+        min_history = timedelta(weeks=settings.BASELINE_MIN_WEEKS)
+        rows = [row for row in rows if row.observed_through - row.observed_since >= min_history]
+        if not rows:
+            return []
+
+        profiles = np.stack(
+            [
+                activity_baseline.normalized(
+                    activity_baseline.decode(row.profile), row.observed_since, row.observed_through
+                )
+                for row in rows
+            ]
+        )
+        # Silence = whole hours after the last active hour; the current
+        # partial hour is not counted.
+        first = np.array([activity_baseline.hour_index(row.last_active_at) + 1 for row in rows])
+        buckets = activity_baseline.bucket_of_hour(first)
+        missed = activity_baseline.missed_active_hours(
+            profiles, buckets, activity_baseline.hour_index(hour) - first
+        )
+        missed_before = activity_baseline.missed_active_hours(
+            profiles, buckets, activity_baseline.hour_index(previous) - first
+        )
+        crossed = (missed >= limit) & (missed_before < limit)
+
+    flagged = [(rows[i].id, float(missed[i])) for i in np.flatnonzero(crossed)]
+    stats.unusual_silences += len(flagged)
+    for user_id, hours in flagged:
+        logger.info(
+            "pulse_unusual_silence",
+            extra={"user_id": str(user_id), "missed_active_hours": round(hours, 1)},
+        )
+    return flagged
+
+
+async def enqueue_notifications(
+    db: AsyncSession,
+    kind: OutboxKind,
+    targets: list[tuple[UUID, UUID]],
+    now: datetime,
+) -> None:
+    """Write one outbox row per `(event_id, user_id)`. Does not commit.
+
+    Delivery happens later in `notification_dispatcher`; callers commit
+    these rows together with the PulseEvent change that caused them.
+    Users with a high activity risk score (`activity_risk`) get priority,
+    so their alerts are claimed first when the outbox has a backlog.
+    """
+    if not targets:
+        return
+    urgent = await activity_risk.high_risk_users(db, {user_id for _, user_id in targets})
+    await db.execute(
+        insert(NotificationOutbox),
+        [
+            {
+                "id": uuid4(),
+                "kind": kind,
+                "event_id": event_id,
+                "user_id": user_id,
+                "status": OutboxStatus.PENDING,
+                "attempts": 0,
+                "next_attempt_at": now,
+                "priority": 1 if user_id in urgent else 0,
+                "created_at": now,
+            }
+            for event_id, user_id in targets
+        ],
+    )
+
+
+async def check_escalations(
+    db: AsyncSession,
+    shard: Shard | None = None,
+    stats: SweepStats | None = None,
+) -> list[PulseEvent]:
+    """Escalate due soft checks from SOFT_CHECK -> GUARDIAN_ALERT.
+
+    A single `UPDATE ... RETURNING` over the partial index on
+    `escalate_at` (OPEN + SOFT_CHECK only): only events that are actually
+    due are touched, no join to User/MonitoringPolicy. `escalate_at` is
+    NULL when the owner's policy has escalation disabled.
+    """
+    if stats is None:
+        stats = SweepStats()
+    now = clock.utcnow()
+
+    with stats.phase("escalation"):
+        result = await db.scalars(
+            update(PulseEvent)
+            .where(
+                is_const(PulseEvent.status, PulseStatus.OPEN),
+                is_const(PulseEvent.current_stage, PulseStage.SOFT_CHECK),
+                PulseEvent.escalate_at < now,
+                _shard_clause(PulseEvent.user_id, shard),
+            )
+            .values(current_stage=PulseStage.GUARDIAN_ALERT, guardian_notified_at=now)
+            .returning(PulseEvent)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        escalated_events = list(result.all())
+
+    for event in escalated_events:
+        logger.debug(
+            "pulse_event_escalated",
+            extra={"event_id": str(event.id), "user_id": str(event.user_id)},
+        )
+
+    with stats.phase("notification_enqueue"):
+        # Guardian alerts go out via the outbox, committed with the stage change.
+        await enqueue_notifications(
+            db,
+            OutboxKind.GUARDIAN_ALERT,
+            [(event.id, event.user_id) for event in escalated_events],
+            now,
+        )
+
+    with stats.phase("escalation"):
+        await db.commit()
+    stats.escalated += len(escalated_events)
+    for event in escalated_events:
+        publish_pulse(event.user_id, event.id, PulseStatus.OPEN, PulseStage.GUARDIAN_ALERT)
     return escalated_events
 
 
-async def run_inactivity_check(db: AsyncSession) -> list[PulseEvent]:
+def _policy_value(column):
+    """Correlated lookup of the event owner's MonitoringPolicy column."""
+    return (
+        select(column)
+        .where(MonitoringPolicy.user_id == PulseEvent.user_id)
+        .scalar_subquery()
+    )
+
+
+async def advance_stale_events(
+    db: AsyncSession,
+    now: datetime,
+    shard: Shard | None = None,
+    stats: SweepStats | None = None,
+) -> tuple[list[UUID], list[UUID]]:
+    """Move stale OPEN events forward with two `UPDATE ... RETURNING` statements.
+
+    1. GUARDIAN_ALERT → EMERGENCY once `policy.emergency_delay_minutes`
+       passed since the guardians were alerted. Only the rows that changed
+       get an EMERGENCY_ALERT outbox row.
+    2. Any OPEN event older than `policy.event_expiry_hours` → EXPIRED
+       (`resolution_method="auto_timeout"`). Keeps the OPEN working set —
+       and every query that filters on it — bounded. The owner's
+       `next_check_due_at` is re-armed from their last activity (no
+       earlier than `now`): if they are still inactive the next
+       (incremental) sweep opens a fresh SOFT_CHECK, if they were active
+       recently (heartbeats don't resolve events) the next check waits
+       for their threshold.
+
+    Returns:
+        `(emergency event ids, expired event ids)`. Commits.
+    """
+    if stats is None:
+        stats = SweepStats()
+
+    with stats.phase("stage_progression"):
+        emergency = (
+            await db.execute(
+                update(PulseEvent)
+                .where(
+                    is_const(PulseEvent.status, PulseStatus.OPEN),
+                    is_const(PulseEvent.current_stage, PulseStage.GUARDIAN_ALERT),
+                    add_minutes(
+                        PulseEvent.guardian_notified_at,
+                        _policy_value(MonitoringPolicy.emergency_delay_minutes),
+                    )
+                    < now,
+                    _shard_clause(PulseEvent.user_id, shard),
+                )
+                .values(current_stage=PulseStage.EMERGENCY, emergency_at=now)
+                .returning(PulseEvent.id, PulseEvent.user_id)
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+
+    with stats.phase("notification_enqueue"):
+        await enqueue_notifications(db, OutboxKind.EMERGENCY_ALERT, emergency, now)
+
+    with stats.phase("stage_progression"):
+        expired = (
+            await db.execute(
+                update(PulseEvent)
+                .where(
+                    is_const(PulseEvent.status, PulseStatus.OPEN),
+                    add_minutes(
+                        PulseEvent.created_at,
+                        _policy_value(MonitoringPolicy.event_expiry_hours) * 60,
+                    )
+                    < now,
+                    _shard_clause(PulseEvent.user_id, shard),
+                )
+                .values(
+                    status=PulseStatus.EXPIRED,
+                    resolved_at=now,
+                    resolution_method="auto_timeout",
+                )
+                .returning(PulseEvent.id, PulseEvent.user_id)
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+        rearmed = []
+        if expired:
+            rearmed = (
+                await db.execute(
+                    update(User)
+                    .where(User.id.in_([user_id for _, user_id in expired]))
+                    .values(next_check_due_at=_rearmed_due_expr(now))
+                    .returning(User.id, User.next_check_due_at)
+                    .execution_options(synchronize_session=False)
+                )
+            ).all()
+        await db.commit()
+
+    for event_id, user_id in emergency:
+        publish_pulse(user_id, event_id, PulseStatus.OPEN, PulseStage.EMERGENCY)
+    for event_id, user_id in expired:
+        pulse_deadlines.discard(("event", event_id))
+        publish_pulse(user_id, event_id, PulseStatus.EXPIRED)
+    for user_id, due_at in rearmed:
+        pulse_deadlines.schedule(("user", user_id), due_at, now=now)
+    stats.emergencies += len(emergency)
+    stats.expired += len(expired)
+    if emergency or expired:
+        logger.info(
+            "pulse_events_progressed",
+            extra={"emergencies": len(emergency), "expired": len(expired)},
+        )
+    return [event_id for event_id, _ in emergency], [event_id for event_id, _ in expired]
+
+
+async def run_inactivity_check(
+    db: AsyncSession,
+    shard: Shard | None = None,
+    stats: SweepStats | None = None,
+    full: bool = False,
+) -> list[PulseEvent]:
     """Main pulse engine loop - check all users for inactivity.
     
     This should be called periodically by the scheduler.
+
+    Args:
+        db: Database session.
+        shard: Optional `(index, count)` to sweep only one hash shard of
+            users (multi-worker deployments; see scheduler).
+        stats: Optional `SweepStats` to fill with per-phase timings and
+            counters. The caller logs / records it (the scheduler knows
+            whether the sweep overran its interval).
+        full: Ignore the watermark and evaluate every user (safety net).
+            Otherwise only users that could have become due since the
+            previous run are evaluated — after downtime the window simply
+            covers the whole outage (a day or more = full evaluation).
     
     Returns:
         List of newly created PulseEvents.
     """
-    now = datetime.utcnow()
-    current_time = now.time()
-    created_events: list[PulseEvent] = []
-    
-    # 1. Check for new inactivity
-    users_with_policies = await get_users_to_check(db)
-    
-    for user, policy in users_with_policies:
-        # Skip if within quiet hours
-        if is_within_quiet_hours(current_time, policy.quiet_start, policy.quiet_end):
-            continue
-        
-        # Skip if not inactive
-        if not is_user_inactive(user.last_active_at, policy.threshold_hours, now):
-            continue
-        
-        # Skip if already has open event
-        if await has_open_pulse_event(db, user.id):
-            continue
-        
-        # Create new pulse event
-        event = await create_pulse_event(db, user.id)
-        created_events.append(event)
-        print(f"[PulseEngine] Created event {event.id} for user {user.email}")
-        
-        # Send Soft Check-in Notification
-        if event.current_stage == PulseStage.SOFT_CHECK:
-            sent = await send_soft_checkin_notification(user, event.id)
-            if sent:
-                print(f"[PulseEngine] Sent notification to {user.email}")
-            else:
-                print(f"[PulseEngine] Failed to send notification to {user.email}")
-    
-    # 2. Check for escalations
-    await check_escalations(db)
+    started = perf.perf_counter()
+    now = clock.utcnow()
+
+    # 1. Check for new inactivity (single set-based statement). Delivery is
+    #    asynchronous via the notification outbox.
+    watermark = watermark_name(shard)
+    as_of = sweep_cutoff(now)
+    since = None if full else await get_watermark(db, watermark)
+    created_events = await create_due_pulse_events(
+        db, now, shard, stats, since=since, as_of=as_of
+    )
+    # Advanced only after the events are committed: a crash in between
+    # replays the window, and the insert is idempotent.
+    await advance_watermark(db, watermark, as_of)
+    await db.commit()
+
+    for event in created_events:
+        logger.debug(
+            "pulse_event_created",
+            extra={"event_id": str(event.id), "user_id": str(event.user_id)},
+        )
+
+    # 2. Silences much longer than the user's usual rhythm (hourly)
+    await find_unusual_silences(db, as_of, shard, since, stats)
+
+    # 3. Check for escalations
+    await check_escalations(db, shard, stats)
+
+    # 4. EMERGENCY / EXPIRED progression for events nobody answered
+    await advance_stale_events(db, clock.utcnow(), shard, stats)
 
+    if stats is not None:
+        stats.total_ms += (perf.perf_counter() - started) * 1000
     return created_events
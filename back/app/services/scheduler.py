@@ -1,59 +1,203 @@
 """Background schedulers.
 
-Two independent asyncio loops:
-- `PulseScheduler` — every 10 min, inactivity-check sweep (Guardian Pulse).
+Eight independent asyncio loops:
+- `PulseScheduler` — inactivity-check sweep (Guardian Pulse). Fires at the
+  exact soft-check / escalation deadlines held in `pulse_deadlines`, plus
+  a 10 min reconciliation sweep that re-seeds the queue and catches
+  anything the queue missed (quiet hours ending, restarts, other workers).
+- `NotificationDispatcher` — drains the notification outbox the pulse
+  sweep writes to (claims batches with `FOR UPDATE SKIP LOCKED`, so it
+  is safe on every worker without an advisory lock).
+- `SignalIngestWriter` — drains the activity signal ingest queue in
+  batches (COPY on Postgres), early when a full batch is waiting, and
+  once more on shutdown.
+- `HeartbeatFlusher` — writes the heartbeat write-behind buffer
+  (`heartbeat_buffer`) every few seconds, early when it fills up, and
+  once more on shutdown.
+- `StatusNotifyBridge` — Postgres only: LISTEN/NOTIFY bridge that
+  carries status stream updates (`status_stream`) across workers.
 - `AccountPurgeScheduler` — every 24h, hard-delete accounts whose
   30-day grace period elapsed (PIPA 잊혀질 권리, PRD §6 NFR).
+- `ActivityRollupScheduler` — every 10 min, roll closed hours of
+  `activity_signals` up into `activity_rollups`, fold them into the
+  per-user circadian baselines and score activity risk (hourly).
+- `SignalRetentionScheduler` — every 24h, create upcoming monthly
+  `activity_signals` partitions, drop expired ones and prune batch
+  upload idempotency keys.
 
-No external dependencies — pure asyncio so it works in single-instance
-setups. Multi-instance: add a distributed lock (Redis SETNX or Postgres
-advisory lock) so only one worker runs each sweep.
+No external dependencies — pure asyncio. Every worker runs every loop;
+Postgres advisory locks (`app.db.advisory_lock`) make sure each sweep —
+or each of the `PULSE_SHARD_COUNT` hash shards of the pulse sweep — is
+processed by exactly one worker at a time. A dead worker's locks are
+released with its connection, so the other workers take its shards over
+on their next tick.
 """
 
 import asyncio
 import logging
-from datetime import datetime
+import time
+from datetime import timedelta
 from typing import Callable, Coroutine, Any
 
-from app.db.session import async_session
-from app.services import account_service, pulse_engine
+from app.core import clock
+from app.core.config import settings
+from app.db.advisory_lock import (
+    ACCOUNT_PURGE_LOCK,
+    ACTIVITY_ROLLUP_LOCK,
+    PULSE_SHARD_LOCK,
+    SIGNAL_RETENTION_LOCK,
+    try_advisory_lock,
+)
+from app.db.session import async_session, engine
+from app.services import (
+    account_service,
+    activity_baseline,
+    activity_risk,
+    activity_rollup,
+    notification_dispatcher,
+    pulse_engine,
+    signal_retention,
+)
+from app.services.deadline_queue import DeadlineQueue, pulse_deadlines
+from app.services.heartbeat_buffer import HeartbeatBuffer, heartbeat_buffer
+from app.services.notification_fanout import FanoutResult
+from app.services.signal_ingest import SignalIngestQueue, signal_ingest_queue
+from app.services.status_stream import CHANNEL, StatusHub, StatusUpdate, status_hub
 
 logger = logging.getLogger(__name__)
 
-# Scheduler interval in seconds (10 minutes)
+# Reconciliation sweep interval in seconds (10 minutes)
 CHECK_INTERVAL_SECONDS = 10 * 60
 
+# Full (non-incremental) pulse sweep as a safety net, once a day.
+FULL_SWEEP_INTERVAL_SECONDS = 24 * 60 * 60
+
+# Deadlines that land within this many seconds of each other share a sweep.
+DEADLINE_COALESCE_SECONDS = 1.0
+
 # Account purge sweep interval (24h). 매일 영구 삭제 후보 처리.
 PURGE_INTERVAL_SECONDS = 24 * 60 * 60
 
+# Hourly activity rollup job interval (10 min).
+ROLLUP_INTERVAL_SECONDS = 10 * 60
+
+# activity_signals partition maintenance / retention interval (24h).
+RETENTION_INTERVAL_SECONDS = 24 * 60 * 60
+
+# Status NOTIFY bridge: max wait between sends, reconnect delay (seconds).
+STATUS_NOTIFY_INTERVAL_SECONDS = 1.0
+STATUS_BRIDGE_RETRY_SECONDS = 5.0
+
 
 class PulseScheduler:
-    """Background scheduler for running periodic inactivity checks."""
+    """Background scheduler for inactivity checks.
+
+    Sleeps until the earliest deadline in `deadlines` (or the next
+    reconciliation tick, whichever comes first). Both paths run the same
+    set-based `run_inactivity_check`; only the reconciliation tick
+    re-seeds the queue from the DB for the next window.
+    """
     
-    def __init__(self, interval_seconds: int = CHECK_INTERVAL_SECONDS):
+    def __init__(
+        self,
+        interval_seconds: int = CHECK_INTERVAL_SECONDS,
+        deadlines: DeadlineQueue = pulse_deadlines,
+        shard_count: int | None = None,
+    ):
         self.interval_seconds = interval_seconds
+        self.shard_count = max(1, shard_count or settings.PULSE_SHARD_COUNT)
+        self.deadlines = deadlines
+        self.deadlines.horizon_seconds = interval_seconds
         self._task: asyncio.Task | None = None
         self._running = False
     
-    async def _run_check(self) -> None:
-        """Execute a single inactivity check cycle."""
-        try:
-            async with async_session() as db:
-                events = await pulse_engine.run_inactivity_check(db)
-                if events:
-                    logger.info(f"[PulseScheduler] Created {len(events)} PulseEvent(s)")
-                else:
-                    logger.debug("[PulseScheduler] No inactive users detected")
-        except Exception as e:
-            logger.error(f"[PulseScheduler] Error during check: {e}")
+    async def _run_check(self, *, reseed: bool, full: bool = False) -> None:
+        """Execute a single inactivity check cycle over every shard we can lock.
+
+        Incremental (watermark window) unless `full`.
+        """
+        upcoming: list = []
+        sweep = pulse_engine.SweepStats()
+        shards_swept = 0
+        started = time.perf_counter()
+        for index in range(self.shard_count):
+            shard = (index, self.shard_count) if self.shard_count > 1 else None
+            try:
+                async with try_advisory_lock(engine, PULSE_SHARD_LOCK, index) as db:
+                    if db is None:
+                        logger.debug(f"[PulseScheduler] Shard {index} held by another worker")
+                        continue
+                    shard_stats = pulse_engine.SweepStats()
+                    events = await pulse_engine.run_inactivity_check(
+                        db, shard, shard_stats, full=full
+                    )
+                    sweep.merge(shard_stats)
+                    shards_swept += 1
+                    if reseed or events:
+                        # New events bring new escalation deadlines.
+                        now = clock.utcnow()
+                        upcoming += await pulse_engine.get_upcoming_deadlines(
+                            db, now, now + timedelta(seconds=self.interval_seconds), shard
+                        )
+            except Exception as e:
+                logger.error(f"[PulseScheduler] Error during check (shard {index}): {e}")
+
+        # Wall time of the whole cycle (shards run back to back).
+        sweep.total_ms = (time.perf_counter() - started) * 1000
+        sweep.overrun = sweep.total_ms / 1000 > self.interval_seconds
+        log = logger.warning if sweep.overrun else logger.info
+        log(
+            "pulse_sweep_done",
+            extra={
+                "reseed": reseed,
+                "full": full,
+                "shards_swept": shards_swept,
+                **sweep.as_dict(),
+            },
+        )
+        sweep.record()
+
+        # Deliver the alerts this sweep just queued without waiting a poll.
+        outbox_dispatcher.wake()
+
+        if reseed:
+            # Shards owned by other workers drop out of our queue.
+            self.deadlines.replace_all(upcoming)
+        else:
+            for key, due_at in upcoming:
+                self.deadlines.schedule(key, due_at)
     
     async def _scheduler_loop(self) -> None:
         """Main scheduler loop - runs indefinitely."""
         logger.info(f"[PulseScheduler] Started with interval={self.interval_seconds}s")
+        next_reconcile = clock.utcnow()
+        # Startup relies on the watermark to replay downtime; the periodic
+        # full sweep only guards against anything the window logic misses.
+        next_full = next_reconcile + timedelta(seconds=FULL_SWEEP_INTERVAL_SECONDS)
         
         while self._running:
-            await self._run_check()
-            await asyncio.sleep(self.interval_seconds)
+            now = clock.utcnow()
+            if now >= next_reconcile:
+                full = now >= next_full
+                await self._run_check(reseed=True, full=full)
+                next_reconcile = now + timedelta(seconds=self.interval_seconds)
+                if full:
+                    next_full = now + timedelta(seconds=FULL_SWEEP_INTERVAL_SECONDS)
+            elif self.deadlines.pop_due(pulse_engine.sweep_cutoff(now)):
+                # Only pop what the sweep can see: it judges inactivity at
+                # the cutoff, a deadline popped before that would be lost.
+                await self._run_check(reseed=False)
+
+            wake_at = next_reconcile
+            deadline = self.deadlines.next_deadline()
+            if deadline is not None:
+                # Sweep comparisons are strict (`due < cutoff`) — fire just
+                # after the cutoff passes the deadline.
+                deadline += timedelta(
+                    seconds=settings.HEARTBEAT_MAX_STALENESS_SECONDS + DEADLINE_COALESCE_SECONDS
+                )
+                wake_at = min(wake_at, deadline)
+            await self.deadlines.wait((wake_at - clock.utcnow()).total_seconds())
     
     def start(self) -> None:
         """Start the background scheduler."""
@@ -74,6 +218,245 @@ class PulseScheduler:
         logger.info("[PulseScheduler] Scheduler stopped")
 
 
+class NotificationDispatcher:
+    """Background loop that delivers `notification_outbox` rows.
+
+    Drains full batches back-to-back; when the outbox is empty it sleeps
+    `interval_seconds` or until `wake()` (called after a pulse sweep).
+    """
+
+    def __init__(self, interval_seconds: float | None = None):
+        self.interval_seconds = interval_seconds or settings.OUTBOX_POLL_INTERVAL_SECONDS
+        self._task: asyncio.Task | None = None
+        self._running = False
+        self._wakeup = asyncio.Event()
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def _drain(self) -> FanoutResult:
+        """Dispatch until the outbox has no full batch left.
+
+        Returns the sent / failed / timed-out counts of every batch, also
+        logged once per drain (one drain follows each pulse sweep).
+        """
+        total = FanoutResult()
+        try:
+            while True:
+                async with async_session() as db:
+                    claimed, result = await notification_dispatcher.dispatch_batch(db)
+                total = total.merge(result)
+                if claimed < settings.OUTBOX_BATCH_SIZE:
+                    break
+        except Exception as e:
+            logger.error(
+                "notification_dispatch_failed",
+                extra={"error": str(e)},
+                exc_info=True,
+            )
+        if total.total:
+            logger.info("notification_outbox_drained", extra=total.as_dict())
+        return total
+
+    async def _dispatch_loop(self) -> None:
+        logger.info(
+            "notification_dispatcher_started",
+            extra={"interval_seconds": self.interval_seconds},
+        )
+        while self._running:
+            self._wakeup.clear()
+            await self._drain()
+            await clock.wait(self._wakeup, self.interval_seconds)
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._dispatch_loop())
+
+    def stop(self) -> None:
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+
+class SignalIngestWriter:
+    """Background loop that writes the activity signal ingest queue.
+
+    Drains every `interval_seconds`, or as soon as a full batch is
+    waiting. `stop()` cancels the loop and drains once more.
+    """
+
+    def __init__(
+        self,
+        queue: SignalIngestQueue = signal_ingest_queue,
+        interval_seconds: float | None = None,
+    ):
+        self.queue = queue
+        self.interval_seconds = interval_seconds or settings.SIGNAL_INGEST_FLUSH_INTERVAL_SECONDS
+        self._task: asyncio.Task | None = None
+        self._running = False
+
+    async def flush(self) -> None:
+        try:
+            async with async_session() as db:
+                written = await self.queue.flush(db)
+            if written:
+                logger.debug("signal_ingest_flushed", extra={"written": written})
+        except Exception as e:
+            # Failed batch is back at the front of the queue; next tick retries.
+            logger.error(
+                "signal_ingest_flush_failed",
+                extra={"error": str(e), "queued": len(self.queue)},
+                exc_info=True,
+            )
+
+    async def _write_loop(self) -> None:
+        logger.info(
+            "signal_ingest_writer_started",
+            extra={"interval_seconds": self.interval_seconds},
+        )
+        while self._running:
+            await clock.wait(self.queue.ready, self.interval_seconds)
+            await self.flush()
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._write_loop())
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+
+class HeartbeatFlusher:
+    """Background loop that flushes the heartbeat write-behind buffer.
+
+    Flushes every `interval_seconds`, or as soon as the buffer signals it
+    is full. `stop()` cancels the loop and performs a final flush so a
+    graceful shutdown loses nothing.
+    """
+
+    def __init__(
+        self,
+        buffer: HeartbeatBuffer = heartbeat_buffer,
+        interval_seconds: float | None = None,
+    ):
+        self.buffer = buffer
+        self.interval_seconds = interval_seconds or settings.HEARTBEAT_FLUSH_INTERVAL_SECONDS
+        self._task: asyncio.Task | None = None
+        self._running = False
+
+    async def flush(self) -> None:
+        try:
+            async with async_session() as db:
+                users = await self.buffer.flush(db)
+            if users:
+                logger.debug("heartbeat_buffer_flushed", extra={"users": users})
+        except Exception as e:
+            # Entries were put back; next tick retries.
+            logger.error(
+                "heartbeat_buffer_flush_failed",
+                extra={"error": str(e), "pending_users": len(self.buffer)},
+                exc_info=True,
+            )
+
+    async def _flush_loop(self) -> None:
+        logger.info(
+            "heartbeat_flusher_started",
+            extra={"interval_seconds": self.interval_seconds},
+        )
+        while self._running:
+            await clock.wait(self.buffer.full, self.interval_seconds)
+            await self.flush()
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+
+class StatusNotifyBridge:
+    """Carries status stream updates across workers via Postgres LISTEN/NOTIFY.
+
+    Holds one dedicated connection that LISTENs on `status_stream.CHANNEL`
+    and sends the hub's outgoing updates with `pg_notify` (one
+    executemany per wake-up). Every notification received — this
+    worker's own included — is delivered to local subscribers. While
+    disconnected the hub falls back to local delivery.
+    """
+
+    def __init__(self, hub: StatusHub = status_hub):
+        self.hub = hub
+        self._task: asyncio.Task | None = None
+        self._running = False
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            self.hub.deliver(StatusUpdate.from_payload(payload))
+        except (ValueError, KeyError) as e:
+            logger.warning("status_notify_malformed", extra={"error": str(e)})
+
+    async def _bridge(self) -> None:
+        async with engine.connect() as conn:
+            raw = (await conn.get_raw_connection()).driver_connection
+            await raw.add_listener(CHANNEL, self._on_notify)
+            self.hub.set_remote(True)
+            logger.info("status_notify_bridge_listening", extra={"channel": CHANNEL})
+            try:
+                while self._running:
+                    await clock.wait(self.hub.outgoing_ready, STATUS_NOTIFY_INTERVAL_SECONDS)
+                    updates = self.hub.take_outgoing()
+                    if updates:
+                        await raw.executemany(
+                            "SELECT pg_notify($1, $2)",
+                            [(CHANNEL, update.to_payload()) for update in updates],
+                        )
+            finally:
+                self.hub.set_remote(False)
+                await raw.remove_listener(CHANNEL, self._on_notify)
+
+    async def _bridge_loop(self) -> None:
+        while self._running:
+            try:
+                await self._bridge()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    "status_notify_bridge_failed",
+                    extra={"error": str(e)},
+                    exc_info=True,
+                )
+                await clock.sleep(STATUS_BRIDGE_RETRY_SECONDS)
+
+    def start(self) -> None:
+        if self._running or engine.dialect.name != "postgresql":
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._bridge_loop())
+
+    def stop(self) -> None:
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+
 class AccountPurgeScheduler:
     """Sweeps users whose 30-day deletion grace has expired and hard-deletes them.
 
@@ -88,7 +471,10 @@ class AccountPurgeScheduler:
 
     async def _run_sweep(self) -> None:
         try:
-            async with async_session() as db:
+            async with try_advisory_lock(engine, ACCOUNT_PURGE_LOCK) as db:
+                if db is None:
+                    logger.debug("account_purge_sweep_skipped (locked by another worker)")
+                    return
                 purged = await account_service.purge_expired_deletions(db)
                 if purged:
                     logger.info(
@@ -111,7 +497,134 @@ class AccountPurgeScheduler:
         )
         while self._running:
             await self._run_sweep()
-            await asyncio.sleep(self.interval_seconds)
+            await clock.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._scheduler_loop())
+
+    def stop(self) -> None:
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+
+class ActivityRollupScheduler:
+    """Rolls closed hours of `activity_signals` into `activity_rollups`.
+
+    Each tick repeats `activity_rollup.roll_up` until it reaches the
+    cutoff, so a backlog (first deploy, outage) is caught up in one tick
+    in `MAX_ROLLUP_SPAN` steps, then folds the new hours into the
+    circadian baselines (`activity_baseline.update_baselines`) and, once
+    per rolled-up hour, re-scores every monitored user
+    (`activity_risk.score_users`).
+    """
+
+    def __init__(self, interval_seconds: int = ROLLUP_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self._task: asyncio.Task | None = None
+        self._running = False
+
+    async def _run_sweep(self) -> None:
+        try:
+            async with try_advisory_lock(engine, ACTIVITY_ROLLUP_LOCK) as db:
+                if db is None:
+                    logger.debug("activity_rollup_skipped (locked by another worker)")
+                    return
+                rows = 0
+                while True:
+                    result = await activity_rollup.roll_up(db)
+                    rows += result.rows
+                    if result.caught_up:
+                        break
+                baselines = await activity_baseline.update_baselines(db)
+                risk = await activity_risk.score_users(db)
+                logger.debug(
+                    "activity_rollup_done",
+                    extra={
+                        "rows": rows,
+                        "baselines": baselines,
+                        "risk_scored": risk.users,
+                        "high_risk": risk.high_risk,
+                        "risk_seconds": round(risk.seconds, 3),
+                        "watermark": str(result.upto),
+                    },
+                )
+        except Exception as e:
+            logger.error(
+                "activity_rollup_failed",
+                extra={"error": str(e)},
+                exc_info=True,
+            )
+
+    async def _scheduler_loop(self) -> None:
+        logger.info(
+            "activity_rollup_scheduler_started",
+            extra={"interval_seconds": self.interval_seconds},
+        )
+        while self._running:
+            await self._run_sweep()
+            await clock.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._scheduler_loop())
+
+    def stop(self) -> None:
+        self._running = False
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+
+class SignalRetentionScheduler:
+    """Daily `activity_signals` partition maintenance (see `signal_retention`).
+
+    Runs once at startup (so next month's partition exists even after a
+    long outage) and then every `interval_seconds`.
+    """
+
+    def __init__(self, interval_seconds: int = RETENTION_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self._task: asyncio.Task | None = None
+        self._running = False
+
+    async def _run_sweep(self) -> None:
+        try:
+            async with try_advisory_lock(engine, SIGNAL_RETENTION_LOCK) as db:
+                if db is None:
+                    logger.debug("signal_retention_skipped (locked by another worker)")
+                    return
+                result = await signal_retention.run_retention(engine, db)
+                logger.info(
+                    "signal_retention_done",
+                    extra={
+                        "partitions_created": result.created,
+                        "partitions_dropped": result.dropped,
+                        "brin_indexed": result.brin_indexed,
+                        "client_keys_pruned": result.client_keys_pruned,
+                    },
+                )
+        except Exception as e:
+            logger.error(
+                "signal_retention_failed",
+                extra={"error": str(e)},
+                exc_info=True,
+            )
+
+    async def _scheduler_loop(self) -> None:
+        logger.info(
+            "signal_retention_scheduler_started",
+            extra={"interval_seconds": self.interval_seconds},
+        )
+        while self._running:
+            await self._run_sweep()
+            await clock.sleep(self.interval_seconds)
 
     def start(self) -> None:
         if self._running:
@@ -128,16 +641,35 @@ class AccountPurgeScheduler:
 
 # Global scheduler instances
 pulse_scheduler = PulseScheduler()
+outbox_dispatcher = NotificationDispatcher()
+signal_ingest_writer = SignalIngestWriter()
+heartbeat_flusher = HeartbeatFlusher()
+status_notify_bridge = StatusNotifyBridge()
 account_purge_scheduler = AccountPurgeScheduler()
+activity_rollup_scheduler = ActivityRollupScheduler()
+signal_retention_scheduler = SignalRetentionScheduler()
 
 
 async def start_scheduler() -> None:
     """Start background schedulers (called on app startup)."""
     pulse_scheduler.start()
+    outbox_dispatcher.start()
+    signal_ingest_writer.start()
+    heartbeat_flusher.start()
+    status_notify_bridge.start()
     account_purge_scheduler.start()
+    activity_rollup_scheduler.start()
+    signal_retention_scheduler.start()
 
 
 async def stop_scheduler() -> None:
     """Stop background schedulers (called on app shutdown)."""
     pulse_scheduler.stop()
+    outbox_dispatcher.stop()
+    status_notify_bridge.stop()
     account_purge_scheduler.stop()
+    activity_rollup_scheduler.stop()
+    signal_retention_scheduler.stop()
+    # Last: persist signals / heartbeats accepted until now.
+    await signal_ingest_writer.stop()
+    await heartbeat_flusher.stop()
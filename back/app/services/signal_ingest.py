@@ -0,0 +1,250 @@
+"""Bulk ingestion pipeline for `activity_signals` rows.
+
+Signals are the highest-volume write in the app (every heartbeat, app
+open, touch burst). Instead of one ORM object + commit per request, the
+API puts rows on this bounded in-process queue and the
+`SignalIngestWriter` loop (scheduler) writes them in batches:
+
+- Postgres: asyncpg `COPY activity_signals (...) FROM STDIN` (binary) —
+  no per-row parse/plan, by far the cheapest bulk path.
+- Other dialects (SQLite in tests): one multi-row INSERT per batch.
+
+Backpressure: when the DB can't keep up and the queue reaches
+`SIGNAL_INGEST_QUEUE_MAX`, `submit()` rejects with 503 + Retry-After
+instead of growing memory without bound. Clients already retry
+heartbeats; `last_active_at` is not affected by the rejection path
+because the request fails before anything is buffered.
+
+A batch that fails to write goes back to the front of the queue and is
+retried on the next tick. After `SIGNAL_INGEST_MAX_ATTEMPTS` failures it
+is written row by row instead, so one bad row (user purged meanwhile, no
+partition for its timestamp) can't block every heartbeat behind it: rows
+the DB rejects as invalid are logged and dropped (dead-lettered), any
+other error is treated as an outage and the rest goes back to the front.
+Queue depth, accepted / rejected / dropped counts, batch size and flush
+latency are exported on `/metrics`.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.activity_signal import ActivitySignal, SignalType
+from app.services.activity_rollup import add_late_signals
+
+logger = logging.getLogger(__name__)
+
+INGESTED = metrics.counter(
+    "inrem_signals_ingested_total",
+    "Activity signals accepted into the ingest queue",
+)
+REJECTED = metrics.counter(
+    "inrem_signals_rejected_total",
+    "Activity signals rejected with 503 because the ingest queue was full",
+)
+DROPPED = metrics.counter(
+    "inrem_signals_dropped_total",
+    "Activity signals dropped because the DB rejected the row itself",
+)
+WRITTEN = metrics.counter(
+    "inrem_signals_written_total",
+    "Activity signals written to the DB, by method (copy / insert)",
+)
+QUEUE_DEPTH = metrics.gauge(
+    "inrem_signal_ingest_queue_depth",
+    "Activity signals waiting in the ingest queue",
+)
+BATCH_SIZE = metrics.histogram(
+    "inrem_signal_ingest_batch_size",
+    "Rows per ingest batch write",
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+FLUSH_SECONDS = metrics.histogram(
+    "inrem_signal_ingest_flush_seconds",
+    "Duration of one ingest batch write (incl. commit)",
+)
+
+COLUMNS = ("id", "user_id", "signal_type", "timestamp", "device_info")
+
+
+@dataclass(frozen=True)
+class QueuedSignal:
+    """One accepted signal, not yet persisted. `id` is the future row id."""
+
+    id: UUID
+    user_id: UUID
+    signal_type: SignalType
+    timestamp: datetime
+    device_info: str | None = None
+
+    @classmethod
+    def new(
+        cls,
+        user_id: UUID,
+        signal_type: SignalType,
+        timestamp: datetime,
+        device_info: str | None = None,
+    ) -> "QueuedSignal":
+        return cls(uuid4(), user_id, signal_type, timestamp, device_info)
+
+
+class SignalIngestQueue:
+    """Bounded FIFO of signals, drained in batches of `batch_size`."""
+
+    def __init__(self, max_size: int | None = None, batch_size: int | None = None) -> None:
+        self.max_size = max_size or settings.SIGNAL_INGEST_QUEUE_MAX
+        self.batch_size = batch_size or settings.SIGNAL_INGEST_BATCH_SIZE
+        self._queue: deque[QueuedSignal] = deque()
+        self._flush_lock = asyncio.Lock()
+        # Consecutive failed writes of the batch at the head of the queue.
+        self._failures = 0
+        # Set once a full batch is waiting — wakes the writer early.
+        self.ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def submit(self, signals: list[QueuedSignal]) -> None:
+        """Enqueue `signals` (all or nothing). Raises 503 when full."""
+        if len(self._queue) + len(signals) > self.max_size:
+            REJECTED.inc(len(signals))
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="일시적으로 요청이 많아요. 잠시 후 다시 시도해 주세요.",
+                headers={"Retry-After": "1"},
+            )
+        self._queue.extend(signals)
+        INGESTED.inc(len(signals))
+        QUEUE_DEPTH.set(len(self._queue))
+        if len(self._queue) >= self.batch_size:
+            self.ready.set()
+
+    def _take(self) -> list[QueuedSignal]:
+        n = min(self.batch_size, len(self._queue))
+        return [self._queue.popleft() for _ in range(n)]
+
+    async def flush(self, db: AsyncSession) -> int:
+        """Write queued signals batch by batch (one commit each).
+
+        Stops when the queue is empty. On error the failed batch is put
+        back at the front and the error re-raised; once it has failed
+        `SIGNAL_INGEST_MAX_ATTEMPTS` times it goes through
+        `_write_rows()` instead.
+        """
+        written = 0
+        async with self._flush_lock:
+            self.ready.clear()
+            while self._queue:
+                batch = self._take()
+                size = len(batch)
+                started = time.perf_counter()
+                try:
+                    if self._failures >= settings.SIGNAL_INGEST_MAX_ATTEMPTS:
+                        written += await self._write_rows(db, batch)
+                    else:
+                        await write_signals(db, batch)
+                        await db.commit()
+                        written += size
+                except Exception:
+                    await db.rollback()
+                    self._failures += 1
+                    self._queue.extendleft(reversed(batch))
+                    raise
+                finally:
+                    FLUSH_SECONDS.observe(time.perf_counter() - started)
+                    QUEUE_DEPTH.set(len(self._queue))
+                BATCH_SIZE.observe(size)
+                self._failures = 0
+        return written
+
+    async def _write_rows(self, db: AsyncSession, batch: list[QueuedSignal]) -> int:
+        """Write `batch` one row per transaction, dropping invalid rows.
+
+        Rows rejected with an integrity / data error are logged and
+        dropped. Handled rows are removed from `batch`, so on any other
+        error the caller puts back only the rows still to write.
+        """
+        written = 0
+        while batch:
+            signal = batch[0]
+            try:
+                await write_signals(db, [signal], copy=False)
+                await db.commit()
+                written += 1
+            except (IntegrityError, DataError) as e:
+                await db.rollback()
+                DROPPED.inc()
+                logger.error(
+                    "signal_ingest_row_dropped",
+                    extra={
+                        "signal_id": str(signal.id),
+                        "user_id": str(signal.user_id),
+                        "signal_type": signal.signal_type.value,
+                        "timestamp": signal.timestamp.isoformat(),
+                        "error": str(e.orig),
+                    },
+                )
+            del batch[0]
+        return written
+
+
+async def write_signals(
+    db: AsyncSession,
+    signals: list[QueuedSignal],
+    *,
+    copy: bool = True,
+) -> None:
+    """Persist `signals` in one round trip. Does not commit.
+
+    Signals older than the rollup watermark (a backlog after a DB outage)
+    are added to `activity_rollups` in the same transaction. `copy=False`
+    forces the INSERT path, whose errors come wrapped as SQLAlchemy
+    exceptions.
+    """
+    if not signals:
+        return
+    if copy and db.get_bind().dialect.name == "postgresql":
+        await _copy_signals(db, signals)
+        WRITTEN.inc(len(signals), method="copy")
+    else:
+        await db.execute(
+            insert(ActivitySignal),
+            [dict(zip(COLUMNS, _record(s))) for s in signals],
+        )
+        WRITTEN.inc(len(signals), method="insert")
+    await add_late_signals(db, ((s.user_id, s.timestamp, s.signal_type) for s in signals))
+
+
+def _record(signal: QueuedSignal) -> tuple:
+    return (signal.id, signal.user_id, signal.signal_type, signal.timestamp, signal.device_info)
+
+
+async def _copy_signals(db: AsyncSession, signals: list[QueuedSignal]) -> None:
+    """asyncpg binary COPY on the session's connection (same transaction)."""
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    # SQLEnum stores enum *names*; COPY bypasses the SQLAlchemy type, so
+    # pass the label the column actually holds.
+    records = [
+        (s.id, s.user_id, s.signal_type.name, s.timestamp, s.device_info) for s in signals
+    ]
+    await raw.driver_connection.copy_records_to_table(
+        ActivitySignal.__tablename__,
+        records=records,
+        columns=list(COLUMNS),
+    )
+
+
+signal_ingest_queue = SignalIngestQueue()
@@ -0,0 +1,190 @@
+"""Partition maintenance and retention for `activity_signals`.
+
+On Postgres `activity_signals` is range-partitioned by month on
+`timestamp` (`activity_signals_y2026m10`, ...). A daily job:
+
+1. creates the next `SIGNAL_PARTITIONS_AHEAD` monthly partitions, so
+   inserts never hit a missing range (there is no DEFAULT partition —
+   it would block `DETACH ... CONCURRENTLY`);
+2. retires months older than `SIGNAL_RETENTION_MONTHS`:
+   `ALTER TABLE ... DETACH PARTITION ... CONCURRENTLY` + `DROP TABLE`.
+   No DELETE, no dead tuples, no vacuum debt — table size and index
+   bloat stay flat however much history accumulates;
+3. optionally adds a BRIN index on `timestamp` to closed (past) months —
+   a few pages instead of a B-tree for range scans over old history;
+4. prunes `signal_client_keys` rows no batch upload retry can carry any
+   more.
+
+DDL runs on its own AUTOCOMMIT connection (`CONCURRENTLY` cannot run in a
+transaction block). Everything but step 4 is a no-op on other dialects
+(SQLite tests have a plain table).
+"""
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.core import clock
+from app.core.config import settings
+from app.models.activity_signal import ActivitySignal, SignalClientKey
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = ActivitySignal.__tablename__
+_PARTITION_RE = re.compile(rf"^{PARENT_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+@dataclass
+class RetentionResult:
+    """What one maintenance run changed."""
+
+    created: list[str] = field(default_factory=list)
+    dropped: list[str] = field(default_factory=list)
+    brin_indexed: list[str] = field(default_factory=list)
+    client_keys_pruned: int = 0
+
+
+def month_floor(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    years, index = divmod(month.month - 1 + months, 12)
+    return month.replace(year=month.year + years, month=index + 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"{PARENT_TABLE}_y{month:%Y}m{month:%m}"
+
+
+def partition_month(name: str) -> datetime | None:
+    """Month a partition covers, parsed from its name (None if not ours)."""
+    match = _PARTITION_RE.match(name)
+    if match is None:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1)
+
+
+def expired_partitions(names: list[str], now: datetime, retention_months: int) -> list[str]:
+    """Partitions whose whole month is older than the retention window."""
+    cutoff = add_months(month_floor(now), -retention_months)
+    return sorted(
+        name
+        for name in names
+        if (month := partition_month(name)) is not None and add_months(month, 1) <= cutoff
+    )
+
+
+def closed_partitions(names: list[str], now: datetime) -> list[str]:
+    """Partitions of months that have fully passed (no more writes expected)."""
+    current = month_floor(now)
+    return sorted(
+        name
+        for name in names
+        if (month := partition_month(name)) is not None and add_months(month, 1) <= current
+    )
+
+
+async def _partition_tables(conn: AsyncConnection) -> tuple[set[str], set[str]]:
+    """`(all partition-named tables, those still attached to the parent)`.
+
+    A table can be detached-but-not-dropped after a crash mid-retention;
+    it shows up in the first set only and is dropped on the next run.
+    """
+    existing = await conn.execute(
+        text("SELECT relname FROM pg_class WHERE relkind = 'r' AND relname LIKE :prefix"),
+        {"prefix": f"{PARENT_TABLE}\\_y%"},
+    )
+    attached = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :parent"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    names = {name for (name,) in existing if partition_month(name) is not None}
+    return names, {name for (name,) in attached}
+
+
+async def maintain_partitions(engine: AsyncEngine, now: datetime | None = None) -> RetentionResult:
+    """Steps 1-3 of the module docstring. Postgres only; no-op elsewhere."""
+    result = RetentionResult()
+    if now is None:
+        now = clock.utcnow()
+    async with engine.connect() as conn:
+        if conn.dialect.name != "postgresql":
+            return result
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        names, attached = await _partition_tables(conn)
+
+        for offset in range(settings.SIGNAL_PARTITIONS_AHEAD + 1):
+            month = add_months(month_floor(now), offset)
+            name = partition_name(month)
+            if name in names:
+                continue
+            await conn.execute(
+                text(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {PARENT_TABLE} '
+                    f"FOR VALUES FROM ('{month:%Y-%m-%d}') "
+                    f"TO ('{add_months(month, 1):%Y-%m-%d}')"
+                )
+            )
+            result.created.append(name)
+            names.add(name)
+            attached.add(name)
+
+        for name in expired_partitions(sorted(names), now, settings.SIGNAL_RETENTION_MONTHS):
+            if name in attached:
+                await conn.execute(
+                    text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}" CONCURRENTLY')
+                )
+            await conn.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+            result.dropped.append(name)
+            names.discard(name)
+
+        if settings.SIGNAL_BRIN_CLOSED_PARTITIONS:
+            for name in closed_partitions(sorted(names & attached), now):
+                index = f"{name}_timestamp_brin"
+                exists = await conn.scalar(text("SELECT to_regclass(:index)"), {"index": index})
+                if exists is not None:
+                    continue
+                await conn.execute(
+                    text(
+                        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{index}" '
+                        f'ON "{name}" USING brin ("timestamp")'
+                    )
+                )
+                result.brin_indexed.append(name)
+    return result
+
+
+async def prune_client_keys(db: AsyncSession, now: datetime | None = None) -> int:
+    """Delete idempotency keys older than any accepted batch signal. Commits."""
+    if now is None:
+        now = clock.utcnow()
+    # Signals older than SIGNAL_BATCH_MAX_AGE_HOURS are dropped on upload
+    # anyway; one extra day covers uploads in flight.
+    cutoff = now - timedelta(hours=settings.SIGNAL_BATCH_MAX_AGE_HOURS) - timedelta(days=1)
+    result = await db.execute(delete(SignalClientKey).where(SignalClientKey.created_at < cutoff))
+    await db.commit()
+    return result.rowcount or 0
+
+
+async def run_retention(
+    engine: AsyncEngine,
+    db: AsyncSession,
+    now: datetime | None = None,
+) -> RetentionResult:
+    """Full daily job: partition maintenance + client key pruning."""
+    if now is None:
+        now = clock.utcnow()
+    result = await maintain_partitions(engine, now)
+    result.client_keys_pruned = await prune_client_keys(db, now)
+    return result
@@ -1,77 +1,310 @@
 """Service for recording user activity signals."""
 
-from datetime import datetime
-from uuid import UUID
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Sequence
+from uuid import UUID, uuid4
 
+from fastapi import HTTPException, status
+from sqlalchemy import insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import update
 
-from app.models.user import User
-from app.models.activity_signal import ActivitySignal, SignalType
+from app.core import clock
+from app.core.config import settings
+from app.db.expressions import dialect_insert
+from app.models.activity_signal import ActivitySignal, SignalClientKey, SignalType
+from app.schemas.signal import HeartbeatBatchItem
+from app.services.activity_rollup import add_late_signals, hourly_counts
+from app.services.heartbeat_buffer import heartbeat_buffer
+from app.services.signal_ingest import QueuedSignal, signal_ingest_queue
 
 
-async def record_heartbeat(
-    db: AsyncSession,
+def buffer_heartbeat(
     user_id: UUID,
     signal_type: SignalType = SignalType.HEARTBEAT,
     device_info: str | None = None,
-) -> tuple[ActivitySignal, datetime]:
-    """Record a heartbeat signal and update user's last_active_at.
-    
+) -> QueuedSignal:
+    """Accept a heartbeat without a DB round trip.
+
+    The signal row goes to the bulk ingest queue (`signal_ingest`) and
+    `last_active_at` to the write-behind buffer (`heartbeat_buffer`);
+    both are persisted by their background writers within seconds.
+
+    Raises:
+        HTTPException 503: the ingest queue is full (backpressure).
+
+    Returns:
+        The queued signal (its `id` becomes the signal row id).
+    """
+    signal = QueuedSignal.new(user_id, signal_type, clock.utcnow(), device_info)
+    signal_ingest_queue.submit([signal])  # may raise 503 — nothing buffered yet
+    heartbeat_buffer.add(user_id, signal.timestamp)
+    return signal
+
+
+@dataclass
+class BatchUploadResult:
+    """Outcome of `record_heartbeat_batch`."""
+    accepted: int = 0
+    duplicates: int = 0
+    dropped: int = 0
+    last_active_at: datetime | None = None
+
+
+def _to_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def record_heartbeat_batch(
+    db: AsyncSession,
+    user_id: UUID,
+    items: list[HeartbeatBatchItem],
+) -> BatchUploadResult:
+    """Store signals a device recorded while offline.
+
+    - Timestamps are clamped against the server clock: future values
+      (device clock ahead) become `now`; values older than
+      `SIGNAL_BATCH_MAX_AGE_HOURS` are dropped.
+    - Deduplicated by `client_key`: repeats inside the batch are skipped,
+      keys already stored (a retried upload) are filtered out by
+      `INSERT ... ON CONFLICT DO NOTHING RETURNING` on `signal_client_keys`,
+      then the remaining signals go out as one multi-row INSERT (same
+      transaction).
+    - `last_active_at` advances to the latest newly stored timestamp via
+      the write-behind buffer (which never moves it backwards).
+
+    Unlike single heartbeats this bypasses the ingest queue — dedup needs
+    the conflict check, and the caller needs the accepted count.
+
     Args:
         db: Database session.
-        user_id: ID of the user sending the heartbeat.
-        signal_type: Type of activity signal.
-        device_info: Optional device information.
-        
+        user_id: ID of the uploading user.
+        items: Signals from the request body.
+
     Returns:
-        Tuple of (created ActivitySignal, updated last_active_at timestamp).
+        Accepted / duplicate / dropped counts and the new last_active_at.
     """
-    now = datetime.utcnow()
-    
-    # Create activity signal record
-    signal = ActivitySignal(
-        user_id=user_id,
-        signal_type=signal_type,
-        timestamp=now,
-        device_info=device_info,
-    )
-    db.add(signal)
-    
-    # Update user's last_active_at
-    await db.execute(
-        update(User)
-        .where(User.id == user_id)
-        .values(last_active_at=now)
+    now = clock.utcnow()
+    oldest = now - timedelta(hours=settings.SIGNAL_BATCH_MAX_AGE_HOURS)
+    result = BatchUploadResult()
+
+    rows: dict[str, dict] = {}
+    for item in items:
+        if item.client_key in rows:
+            result.duplicates += 1
+            continue
+        timestamp = min(_to_naive_utc(item.timestamp), now)
+        if timestamp < oldest:
+            result.dropped += 1
+            continue
+        rows[item.client_key] = {
+            "id": uuid4(),
+            "user_id": user_id,
+            "signal_type": item.signal_type,
+            "timestamp": timestamp,
+            "device_info": item.device_info,
+            "client_key": item.client_key,
+        }
+    if not rows:
+        return result
+
+    # Claim the keys first; only signals whose key was new are stored.
+    claimed = set(
+        (
+            await db.execute(
+                dialect_insert(db, SignalClientKey)
+                .values(
+                    [{"user_id": user_id, "client_key": key, "created_at": now} for key in rows]
+                )
+                .on_conflict_do_nothing(index_elements=["user_id", "client_key"])
+                .returning(SignalClientKey.client_key)
+            )
+        ).scalars().all()
     )
-    
+    inserted = [row for key, row in rows.items() if key in claimed]
+    if inserted:
+        await db.execute(insert(ActivitySignal), inserted)
+        # Offline history lands in hours the rollup job may have passed.
+        await add_late_signals(
+            db, ((row["user_id"], row["timestamp"], row["signal_type"]) for row in inserted)
+        )
     await db.commit()
-    await db.refresh(signal)
-    
-    return signal, now
+
+    result.accepted = len(inserted)
+    result.duplicates += len(rows) - len(inserted)
+    if inserted:
+        result.last_active_at = max(row["timestamp"] for row in inserted)
+        heartbeat_buffer.add(user_id, result.last_active_at)
+    return result
 
 
 async def get_user_signals(
     db: AsyncSession,
     user_id: UUID,
     limit: int = 10,
+    *,
+    before: tuple[datetime, UUID] | None = None,
+    since: datetime | None = None,
+    signal_types: Sequence[SignalType] | None = None,
 ) -> list[ActivitySignal]:
-    """Get recent activity signals for a user.
-    
+    """Get activity signals for a user, newest first.
+
     Args:
         db: Database session.
         user_id: ID of the user.
         limit: Maximum number of signals to return.
-        
+        before: Keyset cursor — only signals strictly older than this
+            `(timestamp, id)`; ties on `timestamp` are broken by `id`.
+        since: Only signals at or after this instant.
+        signal_types: Only these signal types.
+
     Returns:
-        List of recent ActivitySignal records.
+        List of ActivitySignal records.
     """
-    from sqlalchemy import select
-    
+    stmt = select(ActivitySignal).where(ActivitySignal.user_id == user_id)
+    if before is not None:
+        # Row-value comparison: one range on (user_id, timestamp DESC, id DESC).
+        stmt = stmt.where(tuple_(ActivitySignal.timestamp, ActivitySignal.id) < tuple_(*before))
+    if since is not None:
+        stmt = stmt.where(ActivitySignal.timestamp >= since)
+    if signal_types:
+        stmt = stmt.where(ActivitySignal.signal_type.in_(signal_types))
     result = await db.execute(
-        select(ActivitySignal)
-        .where(ActivitySignal.user_id == user_id)
-        .order_by(ActivitySignal.timestamp.desc())
-        .limit(limit)
+        stmt.order_by(ActivitySignal.timestamp.desc(), ActivitySignal.id.desc()).limit(limit)
     )
     return list(result.scalars().all())
+
+
+HistoryResolution = Literal["raw", "hour", "day"]
+
+BUCKET_WIDTH: dict[str, timedelta] = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+
+@dataclass
+class ActivityBucket:
+    """Signal counts of one hour / day of a down-sampled history page."""
+    start: datetime
+    counts: dict[SignalType, int] = field(default_factory=dict)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+@dataclass
+class HistoryPage:
+    """One page of `get_signal_history` (`signals` or `buckets`, by resolution)."""
+    signals: list[ActivitySignal] = field(default_factory=list)
+    buckets: list[ActivityBucket] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+def encode_cursor(timestamp: datetime, signal_id: UUID | None = None) -> str:
+    """Opaque page cursor: `timestamp|id` (id omitted for bucket pages)."""
+    raw = timestamp.isoformat() + ("|" + signal_id.hex if signal_id else "")
+    return urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID | None]:
+    """Inverse of `encode_cursor`. Raises 400 on anything malformed."""
+    try:
+        raw = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, _, signal_id = raw.partition("|")
+        return datetime.fromisoformat(timestamp), UUID(signal_id) if signal_id else None
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 cursor 입니다.",
+        )
+
+
+def _floor(value: datetime, width: timedelta) -> datetime:
+    if width >= timedelta(days=1):
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+async def get_signal_history(
+    db: AsyncSession,
+    user_id: UUID,
+    *,
+    cursor: str | None = None,
+    limit: int = 50,
+    since: datetime | None = None,
+    signal_types: Sequence[SignalType] | None = None,
+    resolution: HistoryResolution = "raw",
+) -> HistoryPage:
+    """One page of a user's activity history, newest first.
+
+    Every page is an index range seek, so its cost does not depend on how
+    deep into the history the cursor points:
+
+    - `raw`: up to `limit` signals older than the cursor's
+      `(timestamp, id)`, on the `(user_id, timestamp DESC, id DESC)` index.
+    - `hour` / `day`: counts for the `limit` buckets (UTC) before the
+      cursor, from `activity_rollups` (`activity_rollup.hourly_counts` —
+      raw signals only for the not-yet-rolled tail). Empty buckets are
+      omitted; the first page includes the current partial bucket.
+
+    Args:
+        db: Database session.
+        user_id: Whose history.
+        cursor: `next_cursor` of the previous page; None = newest.
+        limit: Signals (raw) or buckets per page.
+        since: Stop paging at this instant.
+        signal_types: Only these signal types.
+        resolution: `raw`, `hour` or `day`.
+
+    Returns:
+        The page; `next_cursor` is None on the last one.
+    """
+    before = decode_cursor(cursor) if cursor else None
+
+    if resolution == "raw":
+        if before is not None and before[1] is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="잘못된 cursor 입니다.",
+            )
+        signals = await get_user_signals(
+            db, user_id, limit, before=before, since=since, signal_types=signal_types
+        )
+        next_cursor = None
+        if len(signals) == limit:
+            last = signals[-1]
+            next_cursor = encode_cursor(last.timestamp, last.id)
+        return HistoryPage(signals=signals, next_cursor=next_cursor)
+
+    width = BUCKET_WIDTH[resolution]
+    end = before[0] if before else _floor(clock.utcnow(), width) + width
+    start = end - limit * width
+    if since is not None:
+        start = max(start, _floor(since, width))
+    if start >= end:
+        return HistoryPage()
+
+    wanted = set(signal_types) if signal_types else None
+    buckets: dict[datetime, ActivityBucket] = {}
+    for hour, signal_type, count in await hourly_counts(db, user_id, start, end):
+        if wanted is not None and signal_type not in wanted:
+            continue
+        bucket_start = _floor(hour, width)
+        bucket = buckets.setdefault(bucket_start, ActivityBucket(bucket_start))
+        bucket.counts[signal_type] = bucket.counts.get(signal_type, 0) + count
+
+    next_cursor = None
+    if since is None or start > since:
+        older = await db.scalar(
+            select(ActivitySignal.timestamp)
+            .where(ActivitySignal.user_id == user_id, ActivitySignal.timestamp < start)
+            .limit(1)
+        )
+        if older is not None:
+            next_cursor = encode_cursor(start)
+    return HistoryPage(
+        buckets=sorted(buckets.values(), key=lambda b: b.start, reverse=True),
+        next_cursor=next_cursor,
+    )
@@ -0,0 +1,221 @@
+"""Push-based Pulse status for `GET /signal/stream` (Server-Sent Events).
+
+HomeScreen used to poll `/signal/status` — a JWT decode and a user
+SELECT per poll. The stream authenticates once, sends a snapshot, then
+pushes changes as they happen:
+
+- `activity` — `last_active_at` / `next_check_due_at`, published by the
+  heartbeat flush (`heartbeat_buffer`) and `/pulse/respond`.
+- `pulse` — the user's open PulseEvent changing stage or closing,
+  published by the pulse engine and `/pulse/respond`.
+
+Fan-out:
+
+- `StatusHub` is the in-process pub/sub. A subscription keeps only the
+  latest update per kind (a status is a snapshot — intermediate values
+  are useless to the client) behind one `asyncio.Event`, so an idle
+  client costs an Event and a keepalive timer, and a slow one can't grow
+  a queue.
+- Across workers (Postgres): while the `StatusNotifyBridge` loop
+  (scheduler) is LISTENing, `publish()` hands updates to it instead; it
+  sends them with `pg_notify` in batches (coalesced per user and kind)
+  and delivers every notification it receives — its own included — to
+  local subscribers. Without the bridge (SQLite, bridge reconnecting)
+  updates are delivered locally only.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator
+from uuid import UUID
+
+from app.core import clock
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.pulse_event import PulseStage, PulseStatus
+
+CHANNEL = "inrem_status"
+
+SUBSCRIBERS = metrics.gauge(
+    "inrem_status_stream_subscribers",
+    "Open /signal/stream connections on this worker",
+)
+UPDATES = metrics.counter(
+    "inrem_status_updates_total",
+    "Status updates published, by kind and route (local / notify)",
+)
+
+
+def iso(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+@dataclass(frozen=True)
+class StatusUpdate:
+    """One change to a user's Pulse status. `data` is JSON-ready."""
+
+    user_id: UUID
+    kind: str  # "activity" | "pulse"
+    data: dict[str, Any]
+
+    def to_payload(self) -> str:
+        """NOTIFY payload (well under the 8000-byte limit)."""
+        return json.dumps({"u": self.user_id.hex, "k": self.kind, "d": self.data})
+
+    @classmethod
+    def from_payload(cls, payload: str) -> "StatusUpdate":
+        raw = json.loads(payload)
+        return cls(UUID(raw["u"]), raw["k"], raw["d"])
+
+
+class Subscription:
+    """One stream's view of a user: latest pending update per kind."""
+
+    def __init__(self, user_id: UUID) -> None:
+        self.user_id = user_id
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._changed = asyncio.Event()
+
+    def push(self, update: StatusUpdate) -> None:
+        self._pending[update.kind] = update.data
+        self._changed.set()
+
+    async def next(self, timeout: float) -> list[tuple[str, dict[str, Any]]]:
+        """Updates since the last call; `[]` after `timeout` seconds without any."""
+        if not self._pending:
+            await clock.wait(self._changed, timeout)
+        self._changed.clear()
+        updates = list(self._pending.items())
+        self._pending.clear()
+        return updates
+
+
+class StatusHub:
+    """In-process pub/sub of `StatusUpdate`s, keyed by user."""
+
+    def __init__(self) -> None:
+        self._subscribers: dict[UUID, set[Subscription]] = {}
+        # Waiting for the bridge to NOTIFY, coalesced per (user, kind).
+        self._outgoing: dict[tuple[UUID, str], StatusUpdate] = {}
+        self.outgoing_ready = asyncio.Event()
+        self._remote = False
+
+    def __len__(self) -> int:
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    def count(self, user_id: UUID) -> int:
+        return len(self._subscribers.get(user_id, ()))
+
+    @contextmanager
+    def subscribe(self, user_id: UUID) -> Iterator[Subscription]:
+        subscription = Subscription(user_id)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        SUBSCRIBERS.set(len(self))
+        try:
+            yield subscription
+        finally:
+            subs = self._subscribers.get(user_id)
+            if subs is not None:
+                subs.discard(subscription)
+                if not subs:
+                    del self._subscribers[user_id]
+            SUBSCRIBERS.set(len(self))
+
+    def publish(self, update: StatusUpdate) -> None:
+        """Deliver `update` to its user's streams on every worker."""
+        if self._remote:
+            self._outgoing[(update.user_id, update.kind)] = update
+            self.outgoing_ready.set()
+            UPDATES.inc(kind=update.kind, route="notify")
+        else:
+            self.deliver(update)
+            UPDATES.inc(kind=update.kind, route="local")
+
+    def deliver(self, update: StatusUpdate) -> None:
+        """Push to this worker's subscribers only (bridge / local mode)."""
+        for subscription in self._subscribers.get(update.user_id, ()):
+            subscription.push(update)
+
+    def take_outgoing(self) -> list[StatusUpdate]:
+        self.outgoing_ready.clear()
+        updates = list(self._outgoing.values())
+        self._outgoing.clear()
+        return updates
+
+    def set_remote(self, remote: bool) -> None:
+        """Bridge (dis)connected. Going local delivers what was still queued."""
+        self._remote = remote
+        if not remote:
+            for update in self.take_outgoing():
+                self.deliver(update)
+
+
+status_hub = StatusHub()
+
+
+def publish_activity(
+    user_id: UUID,
+    last_active_at: datetime | None,
+    next_check_due_at: datetime | None,
+) -> None:
+    status_hub.publish(
+        StatusUpdate(
+            user_id,
+            "activity",
+            {"last_active_at": iso(last_active_at), "next_check_due_at": iso(next_check_due_at)},
+        )
+    )
+
+
+def publish_pulse(
+    user_id: UUID,
+    event_id: UUID,
+    status: PulseStatus,
+    stage: PulseStage | None = None,
+) -> None:
+    status_hub.publish(
+        StatusUpdate(
+            user_id,
+            "pulse",
+            {
+                "event_id": str(event_id),
+                "status": status.value,
+                "stage": stage.value if stage is not None else None,
+            },
+        )
+    )
+
+
+def format_event(name: str, data: dict[str, Any]) -> str:
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+async def sse_events(
+    user_id: UUID,
+    snapshot: dict[str, Any],
+    authorized: Callable[[], Awaitable[bool]] | None = None,
+) -> AsyncIterator[str]:
+    """The `/signal/stream` body: snapshot, then updates and keepalives.
+
+    Subscribes before sending the snapshot so nothing published in
+    between is lost. Ends (and unsubscribes) when the client disconnects,
+    or at a keepalive once `authorized()` returns False — the client's
+    reconnect then has to authenticate again.
+    """
+    with status_hub.subscribe(user_id) as subscription:
+        yield "retry: 5000\n" + format_event("status", snapshot)
+        while True:
+            updates = await subscription.next(settings.STATUS_STREAM_KEEPALIVE_SECONDS)
+            if not updates:
+                if authorized is not None and not await authorized():
+                    return
+                # Comment line: keeps proxies / mobile networks from
+                # closing an idle connection.
+                yield ": keepalive\n\n"
+                continue
+            for kind, data in updates:
+                yield format_event(kind, data)
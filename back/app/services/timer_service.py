@@ -1,9 +1,10 @@
-from datetime import datetime, timedelta, timezone
+from datetime import timedelta, timezone
 from uuid import UUID
 
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import clock
 from app.repositories import timer_repository
 from app.models.timer_status import TimerStatus, TimerState
 from app.models.user_config import UserConfig
@@ -25,8 +26,8 @@ async def reset_timer(db: AsyncSession, user_id: UUID) -> TimerStatus:
          raise HTTPException(status_code=400, detail="Timer is disabled for this user")
 
     # 2. Calculate new deadline
-    # Use naive UTC to match database convention (datetime.utcnow)
-    now = datetime.utcnow()
+    # Naive UTC to match database convention (see app.core.clock)
+    now = clock.utcnow()
     deadline = now + timedelta(seconds=config.period)
 
     # 3. Get or Create Status
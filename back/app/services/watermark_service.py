@@ -0,0 +1,51 @@
+"""High-water marks for incremental background sweeps (`sweep_watermarks`).
+
+A sweep reads its watermark, processes only what changed in
+`[watermark, now)`, then advances the watermark to `now`. Advancing is
+a plain upsert: a crash before it simply replays the same window, so
+sweeps must be idempotent (the pulse sweep is — see
+`pulse_engine.create_due_pulse_events`).
+"""
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import clock
+from app.db.expressions import dialect_insert
+from app.models.sweep_watermark import SweepWatermark
+
+
+async def get_watermark(
+    db: AsyncSession,
+    name: str,
+    *,
+    for_update: bool = False,
+    shared: bool = False,
+) -> datetime | None:
+    """Last processed instant of sweep `name`, or None if it never ran.
+
+    `for_update` / `shared` lock the row (`FOR UPDATE` / `FOR SHARE`) until
+    the transaction ends — for writers that must not interleave with the
+    sweep advancing it (see `activity_rollup`). No-op on SQLite.
+    """
+    stmt = select(SweepWatermark.watermark).where(SweepWatermark.name == name)
+    if for_update or shared:
+        stmt = stmt.with_for_update(read=shared and not for_update)
+    result = await db.execute(stmt)
+    return result.scalar_one_or_none()
+
+
+async def advance_watermark(db: AsyncSession, name: str, value: datetime) -> None:
+    """Upsert the watermark of sweep `name`. Does not commit."""
+    stmt = dialect_insert(db, SweepWatermark).values(
+        name=name, watermark=value, updated_at=clock.utcnow()
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[SweepWatermark.name],
+            set_={"watermark": stmt.excluded.watermark, "updated_at": stmt.excluded.updated_at},
+        )
+    )
@@ -10,3 +10,55 @@ async def async_client():
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
         yield client
+
+
+@pytest_asyncio.fixture
+async def sqlite_engine():
+    """In-memory SQLite engine with the full schema.
+
+    Postgres JSONB 는 SQLite 가 컴파일 못 하므로 `records.metadata_info`
+    만 fixture 안에서 generic JSON 으로 swap (test_account_cascade 와 동일).
+    """
+    from sqlalchemy import JSON
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.db.base import Base
+    from app.models.record import Record
+
+    orig_type = Record.__table__.c.metadata_info.type
+    Record.__table__.c.metadata_info.type = JSON()
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", echo=False)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        yield engine
+    finally:
+        Record.__table__.c.metadata_info.type = orig_type
+        await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db_session(sqlite_engine):
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    factory = async_sessionmaker(sqlite_engine, expire_on_commit=False)
+    async with factory() as s:
+        yield s
+
+
+@pytest_asyncio.fixture
+async def make_user(db_session):
+    """Factory for committed `User` rows; keyword arguments set columns."""
+    from uuid import uuid4
+
+    from app.models.user import User
+
+    async def _make(**columns) -> User:
+        user = User(
+            id=uuid4(), email=f"{uuid4().hex[:8]}@inrem.test", password_hash="x", **columns
+        )
+        db_session.add(user)
+        await db_session.commit()
+        return user
+
+    return _make
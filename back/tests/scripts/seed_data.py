@@ -12,6 +12,7 @@ from app.models.user import User
 from app.models.guardian import Guardian
 from app.models.monitoring_policy import MonitoringPolicy
 from app.core.security import get_password_hash
+from app.services import pulse_engine
 
 async def seed_data(ward_email: str, guardian_email: str):
     async with async_session_factory() as db:
@@ -44,6 +45,9 @@ async def seed_data(ward_email: str, guardian_email: str):
         # 3. Create Monitoring Policy for Ward
         policy = MonitoringPolicy(user_id=ward.id)
         db.add(policy)
+        await db.flush()
+        # Schedule the first inactivity check (the sweep reads next_check_due_at).
+        await pulse_engine.refresh_next_check_due(db, ward.id)
         
         # 4. Link Guardian
         link = Guardian(
@@ -0,0 +1,86 @@
+"""Policy what-if simulator CLI.
+
+Replays stored `activity_signals` under the current policies (baseline)
+and under a candidate configuration, and prints both side by side.
+
+Usage:
+    # What if NORMAL went from 12h to 8h and guardians waited 90 min?
+    python tests/scripts/simulate_policy.py --days 90 --normal 8 --escalation-delay 90
+
+    python tests/scripts/simulate_policy.py --start 2026-07-01 --end 2026-10-01 \\
+        --relaxed 36 --strict 4 --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add app directory to path
+sys.path.append(os.getcwd())
+
+from app.db.session import async_session
+from app.models.monitoring_policy import SensitivityLevel
+from app.services.policy_simulator import CandidatePolicy, simulate
+
+
+async def run(args: argparse.Namespace) -> dict:
+    end = datetime.fromisoformat(args.end) if args.end else datetime.utcnow()
+    start = datetime.fromisoformat(args.start) if args.start else end - timedelta(days=args.days)
+    thresholds = {
+        level: hours
+        for level, hours in (
+            (SensitivityLevel.RELAXED, args.relaxed),
+            (SensitivityLevel.NORMAL, args.normal),
+            (SensitivityLevel.STRICT, args.strict),
+        )
+        if hours is not None
+    }
+    candidate = CandidatePolicy(
+        thresholds=thresholds,
+        escalation_delay_minutes=args.escalation_delay,
+        emergency_delay_minutes=args.emergency_delay,
+        event_expiry_hours=args.expiry,
+    )
+    window = timedelta(hours=args.false_alarm_hours)
+
+    report = {"start": start.isoformat(), "end": end.isoformat()}
+    for name, policy in (("baseline", None), ("candidate", candidate)):
+        started = time.perf_counter()
+        async with async_session() as db:
+            result = await simulate(
+                db, start, end, policy, false_alarm_window=window, chunk_users=args.chunk
+            )
+        report[name] = {**result.as_dict(), "seconds": round(time.perf_counter() - started, 2)}
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay activity history under a candidate policy")
+    parser.add_argument("--days", type=int, default=30, help="window length when --start is omitted")
+    parser.add_argument("--start", help="ISO date/time (UTC)")
+    parser.add_argument("--end", help="ISO date/time (UTC), default now")
+    parser.add_argument("--relaxed", type=int, help="RELAXED threshold_hours")
+    parser.add_argument("--normal", type=int, help="NORMAL threshold_hours")
+    parser.add_argument("--strict", type=int, help="STRICT threshold_hours")
+    parser.add_argument("--escalation-delay", type=int, help="escalation_delay_minutes for everyone")
+    parser.add_argument("--emergency-delay", type=int, help="emergency_delay_minutes for everyone")
+    parser.add_argument("--expiry", type=int, help="event_expiry_hours for everyone")
+    parser.add_argument("--false-alarm-hours", type=float, default=24.0)
+    parser.add_argument("--chunk", type=int, default=2_000, help="users per batch")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"📊 Replay {report['start']} → {report['end']}")
+        keys = [k for k in report["baseline"] if k != "seconds"]
+        print(f"{'':<14}{'baseline':>12}{'candidate':>12}{'delta':>10}")
+        for key in keys:
+            base, cand = report["baseline"][key], report["candidate"][key]
+            print(f"{key:<14}{base:>12}{cand:>12}{cand - base:>+10}")
+        print(f"⏱  {report['baseline']['seconds']}s / {report['candidate']['seconds']}s")
@@ -43,6 +43,9 @@ async def trigger_escalation(email: str, minutes: int):
         # Default delay is usually 60 mins. Let's move it back by 'minutes' + 60
         past_time = datetime.utcnow() - timedelta(minutes=minutes + 60)
         event.soft_check_sent_at = past_time
+        # The escalation sweep selects on the stored deadline, not on
+        # soft_check_sent_at — move it into the past as well.
+        event.escalate_at = datetime.utcnow() - timedelta(minutes=1)
         
         await db.commit()
         print(f"✅ Event timer advanced. Soft check sent at: {past_time}")
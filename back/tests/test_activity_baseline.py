@@ -0,0 +1,166 @@
+"""Tests for the circadian baseline engine (NumPy core + in-memory SQLite)."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.models.activity_baseline import ActivityBaseline
+from app.models.activity_signal import ActivitySignal, SignalType
+from app.models.monitoring_policy import MonitoringPolicy
+from app.services import activity_baseline, activity_rollup, pulse_engine
+from app.services.activity_baseline import (
+    BUCKETS,
+    bucket_of,
+    decode,
+    encode,
+    fold,
+    missed_active_hours,
+    observe,
+)
+
+MONDAY = datetime(2026, 10, 5)
+
+
+def test_buckets_start_on_monday_utc():
+    assert bucket_of(MONDAY) == 0
+    assert bucket_of(MONDAY + timedelta(hours=9, minutes=59)) == 9
+    assert bucket_of(MONDAY - timedelta(minutes=1)) == BUCKETS - 1
+
+
+def test_fold_matches_scalar_updates():
+    rng = np.random.default_rng(7)
+    alpha = activity_baseline.decay_rate(3.0)
+    start = 101
+    activity = rng.random(5 * BUCKETS + 37) < 0.3
+    initial = rng.random(BUCKETS)
+
+    expected = initial.copy()
+    for i, active in enumerate(activity):
+        observe(expected, (start + i) % BUCKETS, active, alpha)
+
+    np.testing.assert_allclose(fold(initial, start, activity, alpha), expected, rtol=1e-12)
+    assert len(encode(expected)) == BUCKETS * 4
+    np.testing.assert_allclose(decode(encode(expected)), expected, rtol=1e-6)
+
+
+def test_missed_active_hours_wraps_the_week():
+    rng = np.random.default_rng(3)
+    profiles = rng.random((4, BUCKETS))
+    starts = np.array([0, 160, 50, 5])
+    hours = np.array([10, 20, 400, -3])
+
+    result = missed_active_hours(profiles, starts, hours)
+
+    for i in range(4):
+        brute = sum(profiles[i][(starts[i] + h) % BUCKETS] for h in range(max(hours[i], 0)))
+        assert result[i] == pytest.approx(brute)
+
+
+@pytest.mark.asyncio
+async def test_update_baselines_folds_rollups_incrementally(db_session, make_user):
+    user = await make_user()
+    # Active 09:00 every day for three weeks.
+    db_session.add_all(
+        [
+            ActivitySignal(
+                user_id=user.id,
+                signal_type=SignalType.APP_OPEN,
+                timestamp=MONDAY + timedelta(days=d, hours=9, minutes=15),
+            )
+            for d in range(21)
+        ]
+    )
+    await db_session.commit()
+    now = MONDAY + timedelta(days=21, hours=1)
+    while not (await activity_rollup.roll_up(db_session, now)).caught_up:
+        pass
+
+    assert await activity_baseline.update_baselines(db_session) == 1
+    baseline = await db_session.get(ActivityBaseline, user.id)
+    assert (baseline.observed_since, baseline.observed_through) == (
+        MONDAY + timedelta(hours=9),
+        MONDAY + timedelta(days=21),
+    )
+    profile = activity_baseline.normalized(
+        decode(baseline.profile), baseline.observed_since, baseline.observed_through
+    )
+    assert profile[9] == pytest.approx(1.0, rel=1e-5)
+    assert profile[24 + 9] == pytest.approx(1.0, rel=1e-5)
+    assert profile[10] == 0.0
+
+    # Nothing new rolled up → nothing to fold.
+    assert await activity_baseline.update_baselines(db_session) == 0
+
+    # Rebuilding from scratch gives the same profile.
+    rebuilt = await activity_baseline.rebuild_baseline(db_session, user.id)
+    np.testing.assert_allclose(decode(rebuilt.profile), decode(baseline.profile))
+
+
+async def _monitored_user(db, make_user, last_active_at, threshold=24):
+    user = await make_user(
+        is_active=True,
+        is_deceased=False,
+        last_active_at=last_active_at,
+        next_check_due_at=last_active_at + timedelta(hours=threshold),
+    )
+    db.add(
+        MonitoringPolicy(
+            id=uuid4(),
+            user_id=user.id,
+            threshold_hours=threshold,
+            is_active=True,
+            quiet_start=time(0, 0),
+            quiet_end=time(0, 0),
+        )
+    )
+    # Four weeks (= one half-life) of "active every day 08:00–20:00": the
+    # raw EWMA has reached half of the normalized 1.0.
+    daily = np.zeros(BUCKETS)
+    for day in range(7):
+        daily[day * 24 + 8 : day * 24 + 20] = 1.0
+    db.add(
+        ActivityBaseline(
+            user_id=user.id,
+            profile=encode(daily * 0.5),
+            observed_since=MONDAY - timedelta(weeks=4),
+            observed_through=MONDAY,
+        )
+    )
+    await db.commit()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_unusual_silence_flagged_once_before_threshold(
+    db_session, monkeypatch, make_user
+):
+    monkeypatch.setattr(settings, "BASELINE_DEVIATION_HOURS", 2.5)
+    last = MONDAY + timedelta(hours=8, minutes=30)
+    silent = await _monitored_user(db_session, make_user, last)
+    await _monitored_user(db_session, make_user, MONDAY + timedelta(hours=10, minutes=5))
+
+    def at(hours):
+        return MONDAY + timedelta(hours=hours)
+
+    # 11:xx — 09:00 and 10:00 missed: 2 expected active hours, below the limit.
+    assert await pulse_engine.find_unusual_silences(db_session, at(11.5), since=at(10.5)) == []
+    # Same hour as the previous sweep → scores can't have changed.
+    assert await pulse_engine.find_unusual_silences(db_session, at(12.2), since=at(12.1)) == []
+
+    stats = pulse_engine.SweepStats()
+    flagged = await pulse_engine.find_unusual_silences(
+        db_session, at(12.1), since=at(11.9), stats=stats
+    )
+    assert [user_id for user_id, _ in flagged] == [silent.id]
+    assert flagged[0][1] == pytest.approx(3.0)
+    assert stats.unusual_silences == 1
+
+    # Already past the limit an hour earlier → not flagged again.
+    assert await pulse_engine.find_unusual_silences(db_session, at(13.1), since=at(12.9)) == []
+    # Hard threshold reached → left to the regular soft check.
+    flagged = await pulse_engine.find_unusual_silences(db_session, at(33), since=at(8))
+    assert silent.id not in [user_id for user_id, _ in flagged]
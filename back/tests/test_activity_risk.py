@@ -0,0 +1,143 @@
+"""Tests for batch activity risk scoring and outbox priority (in-memory SQLite)."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.activity_baseline import ActivityBaseline
+from app.models.activity_rollup import ActivityRollup
+from app.models.activity_signal import SignalType
+from app.models.monitoring_policy import MonitoringPolicy
+from app.models.notification_outbox import NotificationOutbox, OutboxKind
+from app.models.pulse_event import PulseEvent, PulseStage, PulseStatus
+from app.models.user import User
+from app.services import activity_risk, notification_dispatcher, pulse_engine
+from app.services.activity_baseline import BUCKETS, encode
+from app.services.activity_rollup import ROLLUP_WATERMARK
+from app.services.watermark_service import advance_watermark
+
+MONDAY = datetime(2026, 10, 5)
+
+
+def test_risk_scores_only_count_missing_activity():
+    expected = np.full((3, 24), 0.5)
+    observed = np.zeros((3, 24))
+    observed[1, :12] = 1.0
+    observed[2] = 1.0
+
+    scores = activity_risk.risk_scores(expected, observed)
+
+    assert scores[0] == pytest.approx(12 / np.sqrt(24 * 0.25 + 1))
+    assert scores[1] == 0.0
+    assert scores[2] == 0.0
+
+
+async def _monitored_user(db, *, weeks=4, active_hours=()):
+    user = User(
+        id=uuid4(),
+        email=f"{uuid4().hex[:8]}@inrem.test",
+        password_hash="x",
+        is_active=True,
+        is_deceased=False,
+    )
+    db.add(user)
+    await db.flush()
+    db.add(
+        MonitoringPolicy(
+            id=uuid4(),
+            user_id=user.id,
+            threshold_hours=24,
+            is_active=True,
+            quiet_start=time(0, 0),
+            quiet_end=time(0, 0),
+        )
+    )
+    # Usually active 08:00–20:00 (p = 0.9 once normalized for `weeks`).
+    daily = np.zeros(BUCKETS)
+    for day in range(7):
+        daily[day * 24 + 8 : day * 24 + 20] = 0.9
+    db.add(
+        ActivityBaseline(
+            user_id=user.id,
+            profile=encode(daily * (1 - 0.5 ** (weeks / 4))),
+            observed_since=MONDAY - timedelta(weeks=weeks),
+            observed_through=MONDAY,
+        )
+    )
+    db.add_all(
+        ActivityRollup(
+            user_id=user.id,
+            hour=MONDAY + timedelta(hours=h),
+            signal_type=SignalType.HEARTBEAT,
+            count=3,
+        )
+        for h in active_hours
+    )
+    await db.commit()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_score_users_in_chunks(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "ACTIVITY_RISK_CHUNK_USERS", 2)
+    usual = await _monitored_user(db_session, active_hours=range(8, 20))
+    silent = await _monitored_user(db_session)
+    half = await _monitored_user(db_session, active_hours=range(8, 14))
+    new = await _monitored_user(db_session, weeks=1)
+    await advance_watermark(db_session, ROLLUP_WATERMARK, MONDAY + timedelta(days=1))
+    await db_session.commit()
+
+    result = await activity_risk.score_users(db_session)
+
+    assert (result.users, result.chunks, result.high_risk) == (4, 2, 2)
+    scores = dict(
+        (await db_session.execute(select(ActivityBaseline.user_id, ActivityBaseline.risk_score))).all()
+    )
+    assert scores[usual.id] == 0.0
+    assert scores[silent.id] > scores[half.id] >= settings.ACTIVITY_RISK_PRIORITY_SCORE
+    assert scores[new.id] is None  # less than BASELINE_MIN_WEEKS of history
+
+    # Same rolled-up hour → already scored.
+    assert (await activity_risk.score_users(db_session)).users == 0
+
+
+@pytest.mark.asyncio
+async def test_high_risk_alerts_are_claimed_first(db_session):
+    calm = await _monitored_user(db_session)
+    risky = await _monitored_user(db_session)
+    calm_row = await db_session.get(ActivityBaseline, calm.id)
+    calm_row.risk_score = 0.0
+    risky_row = await db_session.get(ActivityBaseline, risky.id)
+    risky_row.risk_score = 5.0
+    now = datetime.utcnow()
+    events = [
+        PulseEvent(
+            id=uuid4(),
+            user_id=user.id,
+            status=PulseStatus.OPEN,
+            current_stage=PulseStage.SOFT_CHECK,
+            created_at=now,
+        )
+        for user in (calm, risky)
+    ]
+    db_session.add_all(events)
+    await db_session.commit()
+
+    # The calm user's alert is older, yet the risky one is claimed first.
+    await pulse_engine.enqueue_notifications(
+        db_session, OutboxKind.SOFT_CHECKIN, [(events[0].id, calm.id)], now - timedelta(minutes=5)
+    )
+    await pulse_engine.enqueue_notifications(
+        db_session, OutboxKind.SOFT_CHECKIN, [(events[1].id, risky.id)], now
+    )
+    await db_session.commit()
+
+    claimed = await notification_dispatcher.claim_batch(db_session, now, limit=1)
+    assert [(row.user_id, row.priority) for row in claimed] == [(risky.id, 1)]
+    rows = (await db_session.execute(select(NotificationOutbox.priority))).scalars().all()
+    assert sorted(rows) == [0, 1]
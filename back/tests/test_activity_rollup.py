@@ -0,0 +1,169 @@
+"""Tests for the incremental hourly activity rollups (in-memory SQLite)."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, select
+
+from app.models.activity_rollup import ActivityRollup
+from app.models.activity_signal import ActivitySignal, SignalType
+from app.schemas.signal import HeartbeatBatchItem
+from app.services import activity_rollup, signal_service
+from app.services.heartbeat_buffer import HeartbeatBuffer
+from app.services.watermark_service import get_watermark
+
+NOW = datetime(2026, 10, 17, 12, 20)
+
+
+def _signal(user, timestamp, signal_type=SignalType.HEARTBEAT):
+    return ActivitySignal(user_id=user.id, signal_type=signal_type, timestamp=timestamp)
+
+
+async def _rollups(db, user):
+    rows = await db.execute(
+        select(ActivityRollup.hour, ActivityRollup.signal_type, ActivityRollup.count)
+        .where(ActivityRollup.user_id == user.id)
+        .order_by(ActivityRollup.hour, ActivityRollup.signal_type)
+    )
+    return [tuple(row) for row in rows.all()]
+
+
+@pytest.mark.asyncio
+async def test_roll_up_aggregates_closed_hours_only(db_session, make_user):
+    user = await make_user()
+    db_session.add_all(
+        [
+            _signal(user, datetime(2026, 10, 17, 10, 5)),
+            _signal(user, datetime(2026, 10, 17, 10, 55)),
+            _signal(user, datetime(2026, 10, 17, 10, 30), SignalType.APP_OPEN),
+            _signal(user, datetime(2026, 10, 17, 11, 50)),
+            # 12:00 hour is still open.
+            _signal(user, datetime(2026, 10, 17, 12, 10)),
+        ]
+    )
+    await db_session.commit()
+
+    result = await activity_rollup.roll_up(db_session, NOW)
+
+    assert (result.since, result.upto, result.caught_up) == (
+        datetime(2026, 10, 17, 10),
+        datetime(2026, 10, 17, 12),
+        True,
+    )
+    assert await _rollups(db_session, user) == [
+        (datetime(2026, 10, 17, 10), SignalType.APP_OPEN, 1),
+        (datetime(2026, 10, 17, 10), SignalType.HEARTBEAT, 2),
+        (datetime(2026, 10, 17, 11), SignalType.HEARTBEAT, 1),
+    ]
+    assert await get_watermark(db_session, activity_rollup.ROLLUP_WATERMARK) == datetime(
+        2026, 10, 17, 12
+    )
+
+    # Nothing new is closed → no-op.
+    again = await activity_rollup.roll_up(db_session, NOW)
+    assert again.rows == 0 and again.upto == datetime(2026, 10, 17, 12)
+
+
+@pytest.mark.asyncio
+async def test_roll_up_waits_for_settle_window(db_session, make_user):
+    user = await make_user()
+    db_session.add(_signal(user, datetime(2026, 10, 17, 11, 59)))
+    await db_session.commit()
+
+    # 12:02 — the 11:00 hour ended less than ACTIVITY_ROLLUP_SETTLE_SECONDS ago.
+    result = await activity_rollup.roll_up(db_session, datetime(2026, 10, 17, 12, 2))
+
+    assert result.upto == datetime(2026, 10, 17, 11)
+    assert await _rollups(db_session, user) == []
+
+
+@pytest.mark.asyncio
+async def test_first_roll_up_seeds_watermark_then_catches_up_in_spans(
+    db_session, sqlite_engine, make_user
+):
+    user = await make_user()
+    db_session.add(_signal(user, datetime(2026, 10, 16, 12, 30)))
+    await db_session.commit()
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("INSERT"):
+            statements.append(statement)
+
+    event.listen(sqlite_engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        first = await activity_rollup.roll_up(db_session, NOW)
+    finally:
+        event.remove(sqlite_engine.sync_engine, "before_cursor_execute", _record)
+
+    # The row writers lock on exists before anything is aggregated.
+    assert ["sweep_watermarks" in s for s in statements[:2]] == [True, False]
+    assert (first.since, first.caught_up) == (datetime(2026, 10, 16, 12), False)
+    assert first.upto == first.since + activity_rollup.MAX_ROLLUP_SPAN
+
+    results = [first]
+    while not results[-1].caught_up:
+        results.append(await activity_rollup.roll_up(db_session, NOW))
+    assert len(results) == timedelta(hours=24) // activity_rollup.MAX_ROLLUP_SPAN
+    assert await _rollups(db_session, user) == [
+        (datetime(2026, 10, 16, 12), SignalType.HEARTBEAT, 1)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_late_batch_upload_is_added_to_rolled_hours(db_session, monkeypatch, make_user):
+    monkeypatch.setattr(signal_service, "heartbeat_buffer", HeartbeatBuffer())
+    user = await make_user()
+    now = datetime.utcnow()
+    db_session.add(_signal(user, now - timedelta(hours=3)))
+    await db_session.commit()
+    await activity_rollup.roll_up(db_session, now)
+    watermark = await get_watermark(db_session, activity_rollup.ROLLUP_WATERMARK)
+
+    late = now - timedelta(hours=3)
+    items = [
+        HeartbeatBatchItem(client_key="late-1", timestamp=late),
+        HeartbeatBatchItem(client_key="late-2", timestamp=late),
+        HeartbeatBatchItem(client_key="fresh", timestamp=now),
+    ]
+    await signal_service.record_heartbeat_batch(db_session, user.id, items)
+
+    rolled = {hour: count for hour, _, count in await _rollups(db_session, user)}
+    assert rolled[activity_rollup.floor_hour(late)] == 3
+    assert all(hour < watermark for hour in rolled)
+
+
+@pytest.mark.asyncio
+async def test_hourly_counts_merges_rollups_with_partial_hour(db_session, make_user):
+    user = await make_user()
+    other = await make_user()
+    db_session.add_all(
+        [
+            _signal(user, datetime(2026, 10, 17, 9, 15)),
+            _signal(user, datetime(2026, 10, 17, 11, 40), SignalType.TOUCH_EVENT),
+            _signal(user, datetime(2026, 10, 17, 12, 5)),
+            _signal(user, datetime(2026, 10, 17, 12, 15)),
+            _signal(other, datetime(2026, 10, 17, 12, 5)),
+        ]
+    )
+    await db_session.commit()
+    await activity_rollup.roll_up(db_session, NOW)
+
+    # Rolled row tampered with: proves closed hours are read from the rollup.
+    row = await db_session.get(
+        ActivityRollup, (user.id, datetime(2026, 10, 17, 9), SignalType.HEARTBEAT)
+    )
+    row.count = 7
+    await db_session.commit()
+
+    counts = await activity_rollup.hourly_counts(
+        db_session, user.id, datetime(2026, 10, 17, 9, 30), NOW
+    )
+
+    assert [(hour, t, n) for hour, t, n in counts] == [
+        (datetime(2026, 10, 17, 9), SignalType.HEARTBEAT, 7),
+        (datetime(2026, 10, 17, 11), SignalType.TOUCH_EVENT, 1),
+        (datetime(2026, 10, 17, 12), SignalType.HEARTBEAT, 2),
+    ]
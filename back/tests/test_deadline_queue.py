@@ -0,0 +1,46 @@
+"""Unit tests for the in-memory pulse deadline queue."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from app.services.deadline_queue import DeadlineQueue
+
+NOW = datetime(2026, 10, 17, 12, 0, 0)
+
+
+def test_pop_due_returns_keys_in_deadline_order():
+    q = DeadlineQueue(horizon_seconds=600)
+    q.schedule("b", NOW + timedelta(seconds=20), now=NOW)
+    q.schedule("a", NOW + timedelta(seconds=10), now=NOW)
+    q.schedule("c", NOW + timedelta(seconds=300), now=NOW)
+
+    assert q.next_deadline() == NOW + timedelta(seconds=10)
+    assert q.pop_due(NOW + timedelta(seconds=30)) == ["a", "b"]
+    assert len(q) == 1
+
+
+def test_reschedule_supersedes_previous_deadline():
+    q = DeadlineQueue(horizon_seconds=600)
+    q.schedule("user", NOW + timedelta(seconds=10), now=NOW)
+    q.schedule("user", NOW + timedelta(seconds=120), now=NOW)
+
+    assert q.pop_due(NOW + timedelta(seconds=60)) == []
+    assert q.next_deadline() == NOW + timedelta(seconds=120)
+
+
+def test_deadline_beyond_horizon_invalidates_entry():
+    """A heartbeat pushes the due time ~12h out → drop the pending entry."""
+    q = DeadlineQueue(horizon_seconds=600)
+    q.schedule("user", NOW + timedelta(seconds=10), now=NOW)
+    q.schedule("user", NOW + timedelta(hours=12), now=NOW)
+
+    assert q.next_deadline() is None
+    assert q.pop_due(NOW + timedelta(days=1)) == []
+
+
+def test_replace_all_resets_queue():
+    q = DeadlineQueue(horizon_seconds=600)
+    q.schedule("stale", NOW + timedelta(seconds=5), now=NOW)
+    q.replace_all([("x", NOW + timedelta(seconds=50))])
+
+    assert q.pop_due(NOW + timedelta(seconds=60)) == ["x"]
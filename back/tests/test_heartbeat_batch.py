@@ -0,0 +1,74 @@
+"""Tests for the offline heartbeat batch upload (in-memory SQLite)."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+
+from app.models.activity_signal import ActivitySignal, SignalType
+from app.schemas.signal import HeartbeatBatchItem
+from app.services import signal_service
+from app.services.heartbeat_buffer import HeartbeatBuffer
+
+
+@pytest.fixture
+def buffer(monkeypatch):
+    buffer = HeartbeatBuffer()
+    monkeypatch.setattr(signal_service, "heartbeat_buffer", buffer)
+    return buffer
+
+
+@pytest.mark.asyncio
+async def test_batch_dedupes_and_survives_retries(db_session, buffer, make_user):
+    user = await make_user()
+    now = datetime.utcnow()
+    items = [
+        HeartbeatBatchItem(client_key=f"k{i}", timestamp=now - timedelta(hours=5 - i))
+        for i in range(5)
+    ]
+    items.append(HeartbeatBatchItem(client_key="k0", timestamp=now))  # repeated in batch
+
+    first = await signal_service.record_heartbeat_batch(db_session, user.id, items)
+    retry = await signal_service.record_heartbeat_batch(db_session, user.id, items)
+
+    assert (first.accepted, first.duplicates, first.dropped) == (5, 1, 0)
+    assert first.last_active_at == now - timedelta(hours=1)
+    assert (retry.accepted, retry.duplicates, retry.last_active_at) == (0, 6, None)
+    stored = (
+        await db_session.execute(select(ActivitySignal).where(ActivitySignal.user_id == user.id))
+    ).scalars().all()
+    assert sorted(s.client_key for s in stored) == ["k0", "k1", "k2", "k3", "k4"]
+    # last_active_at goes through the write-behind buffer.
+    assert buffer.pending_last_active(user.id) == now - timedelta(hours=1)
+
+
+@pytest.mark.asyncio
+async def test_batch_clamps_against_server_clock(db_session, buffer, make_user):
+    user = await make_user()
+    before = datetime.utcnow()
+    items = [
+        HeartbeatBatchItem(client_key="future", timestamp=before + timedelta(hours=3)),
+        HeartbeatBatchItem(client_key="ancient", timestamp=before - timedelta(days=30)),
+        HeartbeatBatchItem(
+            client_key="aware",
+            timestamp=(before - timedelta(hours=2)).replace(tzinfo=timezone.utc).astimezone(
+                timezone(timedelta(hours=9))
+            ),
+            signal_type=SignalType.APP_OPEN,
+        ),
+    ]
+
+    result = await signal_service.record_heartbeat_batch(db_session, user.id, items)
+
+    assert (result.accepted, result.duplicates, result.dropped) == (2, 0, 1)
+    rows = {
+        s.client_key: s
+        for s in (
+            await db_session.execute(select(ActivitySignal).where(ActivitySignal.user_id == user.id))
+        ).scalars()
+    }
+    assert before <= rows["future"].timestamp <= datetime.utcnow()
+    assert rows["aware"].timestamp == before - timedelta(hours=2)
+    assert rows["aware"].signal_type == SignalType.APP_OPEN
+    assert result.last_active_at == rows["future"].timestamp
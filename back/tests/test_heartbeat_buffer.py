@@ -0,0 +1,108 @@
+"""Tests for the heartbeat write-behind buffer (in-memory SQLite)."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+
+from app.models.monitoring_policy import MonitoringPolicy
+from app.models.user import User
+from app.services.heartbeat_buffer import HeartbeatBuffer
+
+
+async def _make_user(db, *, hours_idle: float, threshold: int = 12):
+    last_active_at = datetime.utcnow() - timedelta(hours=hours_idle)
+    user = User(
+        id=uuid4(),
+        email=f"{uuid4().hex[:8]}@inrem.test",
+        password_hash="x",
+        is_active=True,
+        is_deceased=False,
+        last_active_at=last_active_at,
+        next_check_due_at=last_active_at + timedelta(hours=threshold),
+    )
+    db.add(user)
+    await db.flush()
+    db.add(
+        MonitoringPolicy(
+            id=uuid4(),
+            user_id=user.id,
+            threshold_hours=threshold,
+            is_active=True,
+            quiet_start=time(0, 0),
+            quiet_end=time(0, 0),
+        )
+    )
+    await db.commit()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_flush_coalesces_users_into_one_update(db_session, sqlite_engine):
+    users = [await _make_user(db_session, hours_idle=5) for _ in range(3)]
+    buffer = HeartbeatBuffer(max_entries=100)
+    base = datetime.utcnow()
+    for i in range(4):
+        for user in users:
+            buffer.add(user.id, now=base + timedelta(seconds=i))
+    assert len(buffer) == 3
+    assert buffer.pending_last_active(users[0].id) == base + timedelta(seconds=3)
+
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(sqlite_engine.sync_engine, "before_cursor_execute", _count)
+    try:
+        result = await buffer.flush(db_session)
+    finally:
+        event.remove(sqlite_engine.sync_engine, "before_cursor_execute", _count)
+
+    assert result == 3
+    # A single UPDATE ... FROM (VALUES ...) (emitted as a CTE).
+    assert sum(s.lstrip().upper().startswith(("WITH", "UPDATE")) for s in statements) == 1
+    assert len(buffer) == 0 and buffer.pending_last_active(users[0].id) is None
+
+    for user in users:
+        await db_session.refresh(user)
+        assert user.last_active_at == base + timedelta(seconds=3)
+        due = user.last_active_at + timedelta(hours=12)
+        assert user.next_check_due_at == due.replace(microsecond=0)  # SQLite datetime()
+
+
+@pytest.mark.asyncio
+async def test_flush_never_moves_activity_backwards(db_session):
+    user = await _make_user(db_session, hours_idle=0)
+    stored = user.last_active_at
+    buffer = HeartbeatBuffer()
+    buffer.add(user.id, now=stored - timedelta(minutes=1))
+
+    assert await buffer.flush(db_session) == 1
+    await db_session.refresh(user)
+    assert user.last_active_at == stored
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_puts_entries_back():
+    buffer = HeartbeatBuffer(max_entries=2)
+    user_id = uuid4()
+    first = datetime.utcnow()
+    buffer.add(user_id, now=first)
+    assert not buffer.full.is_set()
+    buffer.add(uuid4(), now=first)
+    assert buffer.full.is_set()
+
+    db = AsyncMock()
+    db.execute.side_effect = RuntimeError("db down")
+    with pytest.raises(RuntimeError):
+        await buffer.flush(db)
+    db.rollback.assert_awaited()
+
+    # A newer heartbeat accepted meanwhile still wins after the restore.
+    buffer.add(user_id, now=first + timedelta(seconds=5))
+    assert len(buffer) == 2
+    assert buffer.pending_last_active(user_id) == first + timedelta(seconds=5)
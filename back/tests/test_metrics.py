@@ -0,0 +1,61 @@
+"""In-process metrics registry + `/metrics` exposition."""
+from __future__ import annotations
+
+import pytest
+
+from app.core.config import settings
+from app.core.metrics import MetricsRegistry
+
+
+def test_counter_gauge_histogram_render_prometheus_text():
+    registry = MetricsRegistry()
+    hits = registry.counter("hits_total", "Hits")
+    hits.inc(kind="a")
+    hits.inc(2, kind="a")
+    registry.gauge("temp", "Temperature").set(1.5)
+    hist = registry.histogram("lat_seconds", "Latency", buckets=(0.1, 1))
+    hist.observe(0.05)
+    hist.observe(0.5)
+    hist.observe(5)
+
+    text = registry.render()
+
+    assert "# TYPE hits_total counter" in text
+    assert 'hits_total{kind="a"} 3' in text
+    assert "temp 1.5" in text
+    assert 'lat_seconds_bucket{le="0.1"} 1' in text
+    assert 'lat_seconds_bucket{le="1"} 2' in text
+    assert 'lat_seconds_bucket{le="+Inf"} 3' in text
+    assert "lat_seconds_count 3" in text
+    assert "lat_seconds_sum 5.55" in text
+
+
+def test_registry_returns_same_metric_and_rejects_type_clash():
+    registry = MetricsRegistry()
+    assert registry.counter("x_total", "X") is registry.counter("x_total", "X")
+    with pytest.raises(ValueError):
+        registry.gauge("x_total", "X")
+    with pytest.raises(ValueError):
+        registry.counter("x_total", "X").inc(-1)
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_exposes_pulse_metrics(async_client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-me")
+    response = await async_client.get(
+        "/metrics", headers={"Authorization": "Bearer scrape-me"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE inrem_pulse_sweep_phase_seconds histogram" in response.text
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_requires_token(async_client, monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert (await async_client.get("/metrics")).status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-me")
+    assert (await async_client.get("/metrics")).status_code == 401
+    response = await async_client.get("/metrics", headers={"Authorization": "Bearer nope"})
+    assert response.status_code == 401
@@ -0,0 +1,241 @@
+"""Tests for the notification outbox dispatcher (in-memory SQLite)."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.guardian import Guardian
+from app.models.notification_outbox import NotificationOutbox, OutboxKind, OutboxStatus
+from app.models.pulse_event import PulseEvent, PulseStage, PulseStatus
+from app.models.user import User
+from app.services import notification_dispatcher
+
+NOW = datetime(2026, 10, 17, 12, 0, 0)
+
+
+async def _ward_with_event(db, kind: OutboxKind, *, guardians: int = 0):
+    ward = User(id=uuid4(), email=f"{uuid4().hex[:8]}@x.com", password_hash="x", fcm_token="t")
+    db.add(ward)
+    await db.flush()
+    for _ in range(guardians):
+        g = User(id=uuid4(), email=f"{uuid4().hex[:8]}@x.com", password_hash="x", fcm_token="g")
+        db.add(g)
+        await db.flush()
+        db.add(Guardian(id=uuid4(), ward_id=ward.id, guardian_id=g.id))
+    pulse = PulseEvent(
+        id=uuid4(),
+        user_id=ward.id,
+        status=PulseStatus.OPEN,
+        current_stage=notification_dispatcher.KIND_STAGE[kind],
+        created_at=NOW,
+    )
+    db.add(pulse)
+    await db.flush()
+    row = NotificationOutbox(
+        id=uuid4(),
+        kind=kind,
+        event_id=pulse.id,
+        user_id=ward.id,
+        status=OutboxStatus.PENDING,
+        attempts=0,
+        next_attempt_at=NOW,
+        created_at=NOW,
+    )
+    db.add(row)
+    await db.commit()
+    return row
+
+
+@pytest.mark.asyncio
+async def test_dispatch_marks_rows_sent(db_session):
+    soft = await _ward_with_event(db_session, OutboxKind.SOFT_CHECKIN)
+    alert = await _ward_with_event(db_session, OutboxKind.GUARDIAN_ALERT, guardians=2)
+
+    with patch(
+        "app.services.notification_dispatcher.send_soft_checkin_notification",
+        new=AsyncMock(return_value=True),
+    ) as send_soft, patch(
+        "app.services.notification_dispatcher.send_guardian_notification",
+        new=AsyncMock(return_value=2),
+    ) as send_alert:
+        claimed, result = await notification_dispatcher.dispatch_batch(db_session, NOW)
+
+    assert claimed == 2
+    assert result.sent == 2
+    send_soft.assert_awaited_once()
+    assert len(send_alert.await_args.args[1]) == 2  # both guardians
+    for row in (soft, alert):
+        await db_session.refresh(row)
+        assert row.status == OutboxStatus.SENT
+        assert row.sent_at == NOW
+
+
+@pytest.mark.asyncio
+async def test_dispatch_retries_with_backoff_then_fails(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 2)
+    row = await _ward_with_event(db_session, OutboxKind.SOFT_CHECKIN)
+
+    with patch(
+        "app.services.notification_dispatcher.send_soft_checkin_notification",
+        new=AsyncMock(return_value=False),
+    ):
+        await notification_dispatcher.dispatch_batch(db_session, NOW)
+        await db_session.refresh(row)
+        assert row.status == OutboxStatus.PENDING
+        assert row.attempts == 1
+        assert row.next_attempt_at == NOW + timedelta(seconds=30)
+
+        # Not due yet → not claimed.
+        claimed, _ = await notification_dispatcher.dispatch_batch(db_session, NOW)
+        assert claimed == 0
+
+        await notification_dispatcher.dispatch_batch(db_session, NOW + timedelta(minutes=1))
+        await db_session.refresh(row)
+        assert row.status == OutboxStatus.FAILED
+        assert row.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_dispatch_query_count_is_constant(db_session, sqlite_engine):
+    for _ in range(5):
+        await _ward_with_event(db_session, OutboxKind.GUARDIAN_ALERT, guardians=1)
+
+    selects: list[str] = []
+
+    def _count(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(sqlite_engine.sync_engine, "before_cursor_execute", _count)
+    try:
+        with patch(
+            "app.services.notification_dispatcher.send_guardian_notification",
+            new=AsyncMock(return_value=1),
+        ):
+            claimed, _ = await notification_dispatcher.dispatch_batch(db_session, NOW)
+    finally:
+        event.remove(sqlite_engine.sync_engine, "before_cursor_execute", _count)
+
+    assert claimed == 5
+    # Claim + wards/events + one joined guardian lookup, regardless of batch size.
+    assert len(selects) == 3
+
+
+@pytest.mark.asyncio
+async def test_dispatch_sends_emergency_to_guardians(db_session):
+    row = await _ward_with_event(db_session, OutboxKind.EMERGENCY_ALERT, guardians=2)
+
+    with patch(
+        "app.services.notification_dispatcher.send_emergency_notification",
+        new=AsyncMock(return_value=3),
+    ) as send_emergency:
+        claimed, result = await notification_dispatcher.dispatch_batch(db_session, NOW)
+
+    assert (claimed, result.sent) == (1, 1)
+    assert len(send_emergency.await_args.args[1]) == 2
+    await db_session.refresh(row)
+    assert row.status == OutboxStatus.SENT
+
+
+@pytest.mark.asyncio
+async def test_guardian_alert_without_guardians_fails_at_once(db_session):
+    row = await _ward_with_event(db_session, OutboxKind.GUARDIAN_ALERT, guardians=0)
+
+    with patch(
+        "app.services.notification_dispatcher.send_guardian_notification",
+        new=AsyncMock(return_value=1),
+    ) as send_alert:
+        claimed, _ = await notification_dispatcher.dispatch_batch(db_session, NOW)
+
+    assert claimed == 1
+    send_alert.assert_not_awaited()
+    await db_session.refresh(row)
+    assert (row.status, row.attempts) == (OutboxStatus.FAILED, 1)
+    assert row.last_error == "no guardians to alert"
+
+
+@pytest.mark.asyncio
+async def test_rows_of_closed_or_advanced_events_are_not_sent(db_session):
+    resolved = await _ward_with_event(db_session, OutboxKind.GUARDIAN_ALERT, guardians=1)
+    advanced = await _ward_with_event(db_session, OutboxKind.SOFT_CHECKIN)
+    # The ward answered /pulse/respond after the alert was queued; the
+    # other event escalated before its soft check went out.
+    event = await db_session.get(PulseEvent, resolved.event_id)
+    event.status = PulseStatus.RESOLVED
+    event = await db_session.get(PulseEvent, advanced.event_id)
+    event.current_stage = PulseStage.GUARDIAN_ALERT
+    await db_session.commit()
+
+    with patch(
+        "app.services.notification_dispatcher.send_guardian_notification",
+        new=AsyncMock(return_value=1),
+    ) as send_alert, patch(
+        "app.services.notification_dispatcher.send_soft_checkin_notification",
+        new=AsyncMock(return_value=True),
+    ) as send_soft:
+        claimed, result = await notification_dispatcher.dispatch_batch(db_session, NOW)
+
+    assert (claimed, result.sent) == (2, 0)
+    send_alert.assert_not_awaited()
+    send_soft.assert_not_awaited()
+    for row in (resolved, advanced):
+        await db_session.refresh(row)
+        assert (row.status, row.last_error) == (OutboxStatus.FAILED, "event closed")
+
+
+@pytest.mark.asyncio
+async def test_claim_leases_rows_and_reclaims_expired_leases(db_session):
+    leased = await _ward_with_event(db_session, OutboxKind.SOFT_CHECKIN)
+    abandoned = await _ward_with_event(db_session, OutboxKind.SOFT_CHECKIN)
+
+    [claimed] = await notification_dispatcher.claim_batch(db_session, NOW, limit=1)
+    lease_end = NOW + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+    assert (claimed.status, claimed.attempts, claimed.next_attempt_at) == (
+        OutboxStatus.SENDING,
+        1,
+        lease_end,
+    )
+    # Committed: a second claim skips the leased row.
+    [other] = await notification_dispatcher.claim_batch(db_session, NOW, limit=10)
+    assert {claimed.id, other.id} == {leased.id, abandoned.id}
+    assert await notification_dispatcher.claim_batch(db_session, NOW, limit=10) == []
+
+    # Both dispatchers died; once the lease runs out the rows are sent.
+    with patch(
+        "app.services.notification_dispatcher.send_soft_checkin_notification",
+        new=AsyncMock(return_value=True),
+    ):
+        claimed_count, _ = await notification_dispatcher.dispatch_batch(db_session, lease_end)
+    assert claimed_count == 2
+    for row in (leased, abandoned):
+        await db_session.refresh(row)
+        assert (row.status, row.attempts) == (OutboxStatus.SENT, 2)
+
+
+@pytest.mark.asyncio
+async def test_drain_merges_batch_results(db_session, sqlite_engine, monkeypatch):
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.services import scheduler
+
+    monkeypatch.setattr(settings, "OUTBOX_BATCH_SIZE", 2)
+    monkeypatch.setattr(
+        scheduler, "async_session", async_sessionmaker(sqlite_engine, expire_on_commit=False)
+    )
+    for _ in range(3):
+        row = await _ward_with_event(db_session, OutboxKind.SOFT_CHECKIN)
+        row.next_attempt_at = datetime.utcnow() - timedelta(minutes=1)  # due for the loop
+    await db_session.commit()
+
+    with patch(
+        "app.services.notification_dispatcher.send_soft_checkin_notification",
+        new=AsyncMock(side_effect=[True, False, True]),
+    ):
+        total = await scheduler.NotificationDispatcher()._drain()
+
+    assert total.as_dict() == {"sent": 2, "failed": 1, "timed_out": 0}
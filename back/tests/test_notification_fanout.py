@@ -0,0 +1,48 @@
+"""Tests for the bounded-concurrency notification fan-out."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services.notification_fanout import fan_out
+
+
+@pytest.mark.asyncio
+async def test_fan_out_aggregates_sent_failed_and_timed_out():
+    async def ok():
+        return True
+
+    async def rejected():
+        return False
+
+    async def boom():
+        raise RuntimeError("provider down")
+
+    async def hang():
+        await asyncio.sleep(5)
+        return True
+
+    result = await fan_out([ok, ok, rejected, boom, hang], concurrency=10, timeout=0.05)
+
+    assert result.as_dict() == {"sent": 2, "failed": 2, "timed_out": 1}
+    assert result.total == 5
+
+
+@pytest.mark.asyncio
+async def test_fan_out_respects_concurrency_limit():
+    in_flight = 0
+    peak = 0
+
+    async def call():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return True
+
+    result = await fan_out([call] * 20, concurrency=3, timeout=1)
+
+    assert result.sent == 20
+    assert peak == 3
@@ -0,0 +1,103 @@
+"""Policy what-if simulator — vectorized replay of the pulse engine rules."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.models.activity_signal import ActivitySignal
+from app.models.monitoring_policy import MonitoringPolicy, SensitivityLevel
+from app.models.user import User
+from app.services.policy_simulator import (
+    CandidatePolicy,
+    build_policy_arrays,
+    defer_past_quiet_hours,
+    replay_gaps,
+    simulate,
+)
+from app.services.pulse_batch import US_PER_HOUR, time_to_us
+
+T0 = datetime(2026, 9, 1, 8, 0)
+T0_US = int(np.datetime64(T0, "us").astype(np.int64))
+NO_QUIET = (time(0, 0), time(0, 0))
+
+
+def _policy(threshold=12, quiet=NO_QUIET, expiry=72):
+    return build_policy_arrays(
+        [(SensitivityLevel.NORMAL, threshold, quiet[0], quiet[1], True, 60, 120, expiry)],
+        None,
+    )
+
+
+def _replay(hours: list[float], end_hours: float, policy):
+    signal_us = np.array([T0_US + int(h * US_PER_HOUR) for h in hours], dtype=np.int64)
+    return replay_gaps(
+        np.zeros(len(hours), dtype=np.int64),
+        signal_us,
+        T0_US + int(end_hours * US_PER_HOUR),
+        policy,
+        start_us=T0_US,
+        false_alarm_window_us=24 * US_PER_HOUR,
+    )
+
+
+def test_escalation_followed_by_return_is_a_false_alarm():
+    result = _replay([0, 14, 20], end_hours=30, policy=_policy())
+
+    assert (result.soft_checks, result.escalations, result.emergencies) == (1, 1, 0)
+    assert result.false_alarms == 1
+    assert result.users_alerted == 1
+
+
+def test_long_silence_repeats_cycles_after_expiry():
+    result = _replay([0], end_hours=200, policy=_policy())
+
+    # Opens at 12h, 84h, 156h (expiry re-arms immediately); each escalates
+    # at +1h and reaches EMERGENCY at +3h. Never resumed → no false alarm.
+    assert (result.soft_checks, result.escalations, result.emergencies) == (3, 3, 3)
+    assert result.false_alarms == 0
+
+
+def test_due_time_inside_quiet_hours_waits_for_quiet_end():
+    due = np.array([T0_US - 6 * US_PER_HOUR], dtype=np.int64)  # 02:00
+    qs = np.array([time_to_us(time(23, 0))])
+    qe = np.array([time_to_us(time(7, 0))])
+
+    opened = defer_past_quiet_hours(due, qs, qe)
+
+    assert opened[0] == T0_US - US_PER_HOUR + 1  # 07:00:00.000001
+
+
+@pytest.mark.asyncio
+async def test_simulate_compares_candidate_with_stored_policies(db_session):
+    user = User(id=uuid4(), email="sim@inrem.test", password_hash="x")
+    db_session.add(user)
+    await db_session.flush()
+    db_session.add(
+        MonitoringPolicy(
+            id=uuid4(),
+            user_id=user.id,
+            threshold_hours=12,
+            quiet_start=NO_QUIET[0],
+            quiet_end=NO_QUIET[1],
+        )
+    )
+    # Before the window (seed), then a 10h gap and an 8h gap.
+    for hours in (-2, 8, 16):
+        db_session.add(
+            ActivitySignal(id=uuid4(), user_id=user.id, timestamp=T0 + timedelta(hours=hours))
+        )
+    await db_session.commit()
+    end = T0 + timedelta(hours=20)
+
+    baseline = await simulate(db_session, T0, end)
+    stricter = await simulate(
+        db_session, T0, end, CandidatePolicy(thresholds={SensitivityLevel.NORMAL: 6})
+    )
+
+    assert (baseline.users, baseline.soft_checks) == (1, 0)
+    assert stricter.soft_checks == 2
+    assert stricter.escalations == 2
+    assert stricter.false_alarms == 2
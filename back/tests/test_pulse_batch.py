@@ -0,0 +1,74 @@
+"""Property tests: vectorized pulse rules must match the scalar functions exactly."""
+from __future__ import annotations
+
+import random
+from datetime import datetime, time, timedelta
+
+import numpy as np
+import pytest
+
+from app.services import pulse_batch
+from app.services.pulse_engine import is_user_inactive, is_within_quiet_hours
+
+NOW = datetime(2026, 10, 17, 12, 34, 56, 789012)
+
+
+def _random_time(rng: random.Random) -> time:
+    # Bias towards boundaries — that's where off-by-one bugs live.
+    if rng.random() < 0.3:
+        return rng.choice([time(0, 0), time(7, 0), time(23, 0), time(23, 59, 59, 999999)])
+    return time(rng.randrange(24), rng.randrange(60), rng.randrange(60), rng.randrange(10**6))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_quiet_hours_mask_matches_scalar(seed):
+    rng = random.Random(seed)
+    n = 2000
+    starts = [_random_time(rng) for _ in range(n)]
+    ends = [_random_time(rng) for _ in range(n)]
+    currents = [rng.choice([starts[i], ends[i], _random_time(rng)]) for i in range(n)]
+
+    mask = pulse_batch.quiet_hours_mask(
+        pulse_batch.times_to_us(currents),
+        pulse_batch.times_to_us(starts),
+        pulse_batch.times_to_us(ends),
+    )
+
+    expected = [is_within_quiet_hours(c, s, e) for c, s, e in zip(currents, starts, ends)]
+    assert mask.tolist() == expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_inactive_mask_matches_scalar(seed):
+    rng = random.Random(seed)
+    n = 2000
+    thresholds = [rng.randint(1, 168) for _ in range(n)]
+    last_active = []
+    for hours in thresholds:
+        roll = rng.random()
+        if roll < 0.05:
+            last_active.append(None)
+        elif roll < 0.25:
+            # Exactly on / one microsecond around the threshold.
+            delta = timedelta(hours=hours) + timedelta(microseconds=rng.choice([-1, 0, 1]))
+            last_active.append(NOW - delta)
+        else:
+            last_active.append(NOW - timedelta(seconds=rng.uniform(-3600, 200 * 3600)))
+
+    mask = pulse_batch.inactive_mask(
+        pulse_batch.datetimes_to_array(last_active), np.array(thresholds), NOW
+    )
+
+    expected = [is_user_inactive(la, th, NOW) for la, th in zip(last_active, thresholds)]
+    assert mask.tolist() == expected
+
+
+def test_soft_check_due_mask_combines_both_rules():
+    last = pulse_batch.datetimes_to_array([NOW - timedelta(hours=20)] * 2 + [None])
+    thresholds = np.array([12, 12, 12])
+    starts = pulse_batch.times_to_us([time(0, 0), time(12, 0), time(0, 0)])
+    ends = pulse_batch.times_to_us([time(1, 0), time(13, 0), time(1, 0)])
+
+    mask = pulse_batch.soft_check_due_mask(last, thresholds, starts, ends, NOW)
+
+    assert mask.tolist() == [True, False, True]
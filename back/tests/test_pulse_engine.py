@@ -0,0 +1,461 @@
+"""Integration tests for the set-based pulse engine sweep (in-memory SQLite)."""
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, select, update
+
+from app.core.config import settings
+from app.models.monitoring_policy import MonitoringPolicy
+from app.models.notification_outbox import NotificationOutbox, OutboxKind, OutboxStatus
+from app.models.pulse_event import PulseEvent, PulseStage, PulseStatus
+from app.models.user import User
+from app.services import pulse_engine, signal_service, watermark_service
+from app.services.heartbeat_buffer import HeartbeatBuffer
+from app.services.signal_ingest import SignalIngestQueue
+
+# Quiet hours that never overlap "now" in these tests.
+NO_QUIET = {"quiet_start": time(0, 0), "quiet_end": time(0, 0)}
+
+
+async def _make_user(db, *, hours_idle: float, threshold: int = 12, **policy_kw):
+    last_active_at = datetime.utcnow() - timedelta(hours=hours_idle)
+    user = User(
+        id=uuid4(),
+        email=f"{uuid4().hex[:8]}@inrem.test",
+        password_hash="x",
+        is_active=True,
+        is_deceased=False,
+        fcm_token="tok",
+        last_active_at=last_active_at,
+        next_check_due_at=last_active_at + timedelta(hours=threshold),
+    )
+    db.add(user)
+    await db.flush()
+    db.add(
+        MonitoringPolicy(
+            id=uuid4(),
+            user_id=user.id,
+            threshold_hours=threshold,
+            is_active=True,
+            **{**NO_QUIET, **policy_kw},
+        )
+    )
+    await db.commit()
+    return user
+
+
+async def _outbox(db, kind):
+    rows = await db.execute(select(NotificationOutbox).where(NotificationOutbox.kind == kind))
+    return list(rows.scalars().all())
+
+
+@pytest.mark.asyncio
+async def test_sweep_creates_events_only_for_inactive_users(db_session):
+    idle = await _make_user(db_session, hours_idle=13)
+    await _make_user(db_session, hours_idle=1)
+
+    events = await pulse_engine.run_inactivity_check(db_session)
+
+    assert [e.user_id for e in events] == [idle.id]
+    assert events[0].status == PulseStatus.OPEN
+    assert events[0].current_stage == PulseStage.SOFT_CHECK
+    assert events[0].soft_check_sent_at is not None
+    # Notification queued in the outbox, not sent inline.
+    queued = await _outbox(db_session, OutboxKind.SOFT_CHECKIN)
+    assert [(r.event_id, r.status) for r in queued] == [(events[0].id, OutboxStatus.PENDING)]
+
+
+@pytest.mark.asyncio
+async def test_sweep_skips_quiet_hours_and_existing_open_event(db_session):
+    now_t = datetime.utcnow().time()
+    start = (datetime.combine(datetime.utcnow().date(), now_t) - timedelta(hours=1)).time()
+    end = (datetime.combine(datetime.utcnow().date(), now_t) + timedelta(hours=1)).time()
+    await _make_user(db_session, hours_idle=20, quiet_start=start, quiet_end=end)
+    other = await _make_user(db_session, hours_idle=20)
+
+    assert len(await pulse_engine.run_inactivity_check(db_session, full=True)) == 1
+    # Second sweep must not duplicate the still-OPEN event.
+    assert await pulse_engine.run_inactivity_check(db_session, full=True) == []
+
+    rows = (await db_session.execute(select(PulseEvent))).scalars().all()
+    assert [r.user_id for r in rows] == [other.id]
+
+
+@pytest.mark.asyncio
+async def test_sweep_query_count_is_constant(db_session, sqlite_engine):
+    for _ in range(25):
+        await _make_user(db_session, hours_idle=30)
+
+    statements: list[str] = []
+
+    def _count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(sqlite_engine.sync_engine, "before_cursor_execute", _count)
+    try:
+        events = await pulse_engine.create_due_pulse_events(db_session, datetime.utcnow())
+    finally:
+        event.remove(sqlite_engine.sync_engine, "before_cursor_execute", _count)
+
+    assert len(events) == 25
+    # INSERT ... SELECT ... RETURNING, one risk-score lookup for outbox
+    # priority, one batched outbox INSERT, one SELECT to load events/users.
+    assert len(statements) == 4
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_and_policy_change_keep_due_time_current(db_session, monkeypatch):
+    user = await _make_user(db_session, hours_idle=30, threshold=12)
+    queue, buffer = SignalIngestQueue(), HeartbeatBuffer()
+    monkeypatch.setattr(signal_service, "signal_ingest_queue", queue)
+    monkeypatch.setattr(signal_service, "heartbeat_buffer", buffer)
+
+    now = signal_service.buffer_heartbeat(user.id).timestamp
+    assert await queue.flush(db_session) == 1
+    assert await buffer.flush(db_session) == 1
+    await db_session.refresh(user)
+    assert user.next_check_due_at == (now + timedelta(hours=12)).replace(microsecond=0)
+
+    policy = (
+        await db_session.execute(
+            select(MonitoringPolicy).where(MonitoringPolicy.user_id == user.id)
+        )
+    ).scalar_one()
+    policy.threshold_hours = 24
+    due = await pulse_engine.refresh_next_check_due(db_session, user.id)
+    assert due == (now + timedelta(hours=24)).replace(microsecond=0)
+
+    # Freshly active again → not due.
+    assert await pulse_engine.run_inactivity_check(db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_never_active_user_is_due_threshold_after_policy_creation(db_session):
+    user = await _make_user(db_session, hours_idle=0, threshold=12)
+    user.last_active_at = None
+    user.next_check_due_at = None
+    await db_session.commit()
+    now = datetime.utcnow().replace(microsecond=0)
+
+    due = await pulse_engine.refresh_next_check_due(db_session, user.id, now)
+    await db_session.commit()
+
+    assert due == now + timedelta(hours=12)
+    [created] = await pulse_engine.create_due_pulse_events(
+        db_session, now + timedelta(hours=12, minutes=1)
+    )
+    assert created.user_id == user.id
+
+
+@pytest.mark.asyncio
+async def test_upcoming_deadlines_cover_soft_checks_and_escalations(db_session):
+    now = datetime.utcnow()
+    soon = await _make_user(db_session, hours_idle=11.9, threshold=12)
+    await _make_user(db_session, hours_idle=1, threshold=12)  # due in ~11h
+    idle = await _make_user(db_session, hours_idle=30)
+    db_session.add(
+        PulseEvent(
+            id=uuid4(),
+            user_id=idle.id,
+            status=PulseStatus.OPEN,
+            current_stage=PulseStage.SOFT_CHECK,
+            created_at=now - timedelta(minutes=55),
+            soft_check_sent_at=now - timedelta(minutes=55),
+            escalate_at=now + timedelta(minutes=5),
+        )
+    )
+    await db_session.commit()
+
+    upcoming = await pulse_engine.get_upcoming_deadlines(
+        db_session, now, now + timedelta(minutes=10)
+    )
+
+    kinds = {key[0]: key[1] for key, _ in upcoming}
+    assert len(upcoming) == 2
+    assert kinds["user"] == soon.id
+    assert "event" in kinds
+
+
+@pytest.mark.asyncio
+async def test_shards_partition_the_population(db_session):
+    users = [await _make_user(db_session, hours_idle=30) for _ in range(12)]
+    now = datetime.utcnow()
+
+    seen: list = []
+    for index in range(3):
+        events = await pulse_engine.create_due_pulse_events(db_session, now, (index, 3))
+        seen += [e.user_id for e in events]
+
+    assert sorted(seen) == sorted(u.id for u in users)
+
+
+@pytest.mark.asyncio
+async def test_advisory_lock_is_noop_on_sqlite(sqlite_engine):
+    from app.db.advisory_lock import PULSE_SHARD_LOCK, try_advisory_lock
+
+    async with try_advisory_lock(sqlite_engine, PULSE_SHARD_LOCK, 0) as db:
+        assert db is not None
+        assert await pulse_engine.run_inactivity_check(db, (0, 2)) == []
+
+
+@pytest.mark.asyncio
+async def test_escalation_queues_guardian_alerts_with_stage_change(db_session):
+    now = datetime.utcnow()
+    wards = [await _make_user(db_session, hours_idle=30) for _ in range(3)]
+    for ward in wards:
+        db_session.add(
+            PulseEvent(
+                id=uuid4(),
+                user_id=ward.id,
+                status=PulseStatus.OPEN,
+                current_stage=PulseStage.SOFT_CHECK,
+                created_at=now - timedelta(hours=2),
+                soft_check_sent_at=now - timedelta(hours=2),
+                escalate_at=now - timedelta(hours=1),
+            )
+        )
+    await db_session.commit()
+
+    escalated = await pulse_engine.check_escalations(db_session)
+
+    assert len(escalated) == 3
+    assert all(e.current_stage == PulseStage.GUARDIAN_ALERT for e in escalated)
+    queued = await _outbox(db_session, OutboxKind.GUARDIAN_ALERT)
+    assert {r.user_id for r in queued} == {w.id for w in wards}
+
+
+@pytest.mark.asyncio
+async def test_partial_index_predicates_are_inlined(db_session, sqlite_engine):
+    """Status/stage constants must be SQL literals, or a generic plan can't use the partial index."""
+    statements: list[str] = []
+
+    def _capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(sqlite_engine.sync_engine, "before_cursor_execute", _capture)
+    try:
+        await pulse_engine.check_escalations(db_session)
+    finally:
+        event.remove(sqlite_engine.sync_engine, "before_cursor_execute", _capture)
+
+    [escalation] = [s for s in statements if s.lstrip().upper().startswith("UPDATE")]
+    assert "status = 'OPEN'" in escalation
+    assert "current_stage = 'SOFT_CHECK'" in escalation
+
+
+@pytest.mark.asyncio
+async def test_sweep_stats_count_phases_and_outcomes(db_session):
+    now_t = datetime.utcnow().time()
+    today = datetime.utcnow().date()
+    start = (datetime.combine(today, now_t) - timedelta(hours=1)).time()
+    end = (datetime.combine(today, now_t) + timedelta(hours=1)).time()
+    await _make_user(db_session, hours_idle=20, quiet_start=start, quiet_end=end)
+    await _make_user(db_session, hours_idle=13)
+    await _make_user(db_session, hours_idle=1)
+
+    stats = pulse_engine.SweepStats()
+    events = await pulse_engine.run_inactivity_check(db_session, stats=stats)
+
+    assert len(events) == 1
+    assert stats.users_evaluated == 2
+    assert stats.quiet_hours_skipped == 1
+    assert stats.newly_inactive == 1
+    assert stats.escalated == 0
+    assert stats.max_detection_lag_seconds >= 3600 - 5
+    assert {"candidate_selection", "event_creation", "notification_enqueue", "escalation"} <= set(
+        stats.phase_ms
+    )
+    assert stats.total_ms >= sum(stats.phase_ms.values()) * 0.99
+
+    before = pulse_engine.SWEEP_USERS.value(outcome="newly_inactive")
+    stats.record()
+    assert pulse_engine.SWEEP_USERS.value(outcome="newly_inactive") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_stale_events_advance_to_emergency_or_expire(db_session):
+    now = datetime.utcnow()
+    alerted = await _make_user(db_session, hours_idle=30)
+    fresh = await _make_user(db_session, hours_idle=30)
+    stale = await _make_user(db_session, hours_idle=100, event_expiry_hours=48)
+    rows = {
+        alerted.id: dict(stage=PulseStage.GUARDIAN_ALERT, age=timedelta(hours=5), notified=timedelta(hours=3)),
+        fresh.id: dict(stage=PulseStage.GUARDIAN_ALERT, age=timedelta(hours=2), notified=timedelta(minutes=30)),
+        stale.id: dict(stage=PulseStage.SOFT_CHECK, age=timedelta(hours=50), notified=None),
+    }
+    for user_id, spec in rows.items():
+        db_session.add(
+            PulseEvent(
+                id=uuid4(),
+                user_id=user_id,
+                status=PulseStatus.OPEN,
+                current_stage=spec["stage"],
+                created_at=now - spec["age"],
+                soft_check_sent_at=now - spec["age"],
+                guardian_notified_at=spec["notified"] and now - spec["notified"],
+            )
+        )
+    await db_session.commit()
+
+    stats = pulse_engine.SweepStats()
+    emergency, expired = await pulse_engine.advance_stale_events(db_session, now, stats=stats)
+
+    events = {
+        e.user_id: e for e in (await db_session.execute(select(PulseEvent))).scalars()
+    }
+    assert emergency == [events[alerted.id].id]
+    assert expired == [events[stale.id].id]
+    assert events[alerted.id].current_stage == PulseStage.EMERGENCY
+    assert events[alerted.id].emergency_at is not None
+    assert events[fresh.id].current_stage == PulseStage.GUARDIAN_ALERT
+    assert events[stale.id].status == PulseStatus.EXPIRED
+    assert events[stale.id].resolution_method == "auto_timeout"
+    # Notifications only for rows that changed stage.
+    queued = await _outbox(db_session, OutboxKind.EMERGENCY_ALERT)
+    assert [r.user_id for r in queued] == [alerted.id]
+    assert (stats.emergencies, stats.expired) == (1, 1)
+
+    # Idempotent: nothing left to advance.
+    assert await pulse_engine.advance_stale_events(db_session, now) == ([], [])
+
+
+@pytest.mark.asyncio
+async def test_open_event_insert_is_idempotent_under_races(db_session):
+    user = await _make_user(db_session, hours_idle=30)
+    now = datetime.utcnow()
+
+    def _row():
+        return {
+            "id": uuid4(),
+            "user_id": user.id,
+            "status": PulseStatus.OPEN,
+            "current_stage": PulseStage.SOFT_CHECK,
+            "created_at": now,
+        }
+
+    # Simulates a second worker whose SELECT ran before the first commit:
+    # the partial unique index turns its insert into a no-op.
+    stmt = pulse_engine._insert_open_event(db_session).returning(PulseEvent.id)
+    assert len((await db_session.execute(stmt, [_row()])).all()) == 1
+    assert (await db_session.execute(stmt, [_row()])).all() == []
+    await db_session.commit()
+
+    # Closed events don't count against the index.
+    await db_session.execute(
+        update(PulseEvent).where(PulseEvent.user_id == user.id).values(status=PulseStatus.RESOLVED)
+    )
+    assert len((await db_session.execute(stmt, [_row()])).all()) == 1
+
+
+@pytest.mark.asyncio
+async def test_escalate_at_set_on_creation_and_policy_change(db_session):
+    user = await _make_user(db_session, hours_idle=13, escalation_delay_minutes=30)
+    [event] = await pulse_engine.run_inactivity_check(db_session)
+    assert event.escalate_at is not None
+    # SQLite add_minutes drops microseconds.
+    expected = event.soft_check_sent_at + timedelta(minutes=30)
+    assert abs((event.escalate_at - expected).total_seconds()) < 1
+
+    policy = (
+        await db_session.execute(
+            select(MonitoringPolicy).where(MonitoringPolicy.user_id == user.id)
+        )
+    ).scalar_one()
+    policy.escalation_delay_minutes = 0
+    await pulse_engine.refresh_escalate_at(db_session, user.id)
+    await db_session.commit()
+    await db_session.refresh(event)
+    assert event.escalate_at <= datetime.utcnow()
+    assert [e.id for e in await pulse_engine.check_escalations(db_session)] == [event.id]
+
+    # Escalation disabled → NULL, never picked up.
+    other = await _make_user(db_session, hours_idle=13, escalation_enabled=False)
+    created = await pulse_engine.create_due_pulse_events(db_session, datetime.utcnow())
+    assert [(e.user_id, e.escalate_at) for e in created] == [(other.id, None)]
+
+
+@pytest.mark.asyncio
+async def test_incremental_sweep_only_sees_the_watermark_window(db_session):
+    now = datetime.utcnow()
+    since = now - timedelta(minutes=10)
+    crossed = await _make_user(db_session, hours_idle=12.05)  # due ~3 min ago
+    await _make_user(db_session, hours_idle=14)  # due 2h ago: handled by an earlier run
+
+    created = await pulse_engine.create_due_pulse_events(db_session, now, since=since)
+    assert [e.user_id for e in created] == [crossed.id]
+
+    # Catch-up after a day of downtime re-evaluates everyone.
+    created = await pulse_engine.create_due_pulse_events(
+        db_session, now, since=now - timedelta(days=2)
+    )
+    assert len(created) == 1
+
+
+@pytest.mark.asyncio
+async def test_incremental_sweep_picks_up_users_whose_quiet_hours_ended(db_session):
+    day = datetime.utcnow().date()
+    since = datetime.combine(day, time(6, 55))
+    now = datetime.combine(day, time(7, 5))
+    user = await _make_user(db_session, hours_idle=0, quiet_start=time(23, 0), quiet_end=time(7, 0))
+    user.next_check_due_at = datetime.combine(day, time(3, 0))  # became due at night
+    await db_session.commit()
+
+    created = await pulse_engine.create_due_pulse_events(db_session, now, since=since)
+    assert [e.user_id for e in created] == [user.id]
+
+
+@pytest.mark.asyncio
+async def test_watermark_is_persisted_and_expiry_rearms_due_time(db_session, monkeypatch):
+    # Re-armed due time is "now"; judge it without the heartbeat staleness lag.
+    monkeypatch.setattr(settings, "HEARTBEAT_MAX_STALENESS_SECONDS", 0)
+    user = await _make_user(db_session, hours_idle=13, event_expiry_hours=1)
+    [event] = await pulse_engine.run_inactivity_check(db_session)
+    assert await watermark_service.get_watermark(db_session, "pulse_sweep") is not None
+
+    # Nothing new in the next window — the user already has an open event.
+    assert await pulse_engine.run_inactivity_check(db_session) == []
+
+    event.created_at = datetime.utcnow() - timedelta(hours=2)
+    await db_session.commit()
+    _, expired = await pulse_engine.advance_stale_events(db_session, datetime.utcnow())
+    assert expired == [event.id]
+
+    # Still inactive → the re-armed due time lands in the next window.
+    [again] = await pulse_engine.run_inactivity_check(db_session)
+    assert again.user_id == user.id and again.id != event.id
+
+
+@pytest.mark.asyncio
+async def test_expiry_does_not_refire_for_recently_active_user(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "HEARTBEAT_MAX_STALENESS_SECONDS", 0)
+    user = await _make_user(db_session, hours_idle=13, event_expiry_hours=1)
+    [event] = await pulse_engine.run_inactivity_check(db_session)
+
+    # Active again (heartbeats don't resolve the event), then it times out.
+    active_at = datetime.utcnow() - timedelta(minutes=1)
+    await pulse_engine.mark_user_active(db_session, user.id, active_at)
+    event.created_at = datetime.utcnow() - timedelta(hours=2)
+    await db_session.commit()
+    _, expired = await pulse_engine.advance_stale_events(db_session, datetime.utcnow())
+    assert expired == [event.id]
+
+    await db_session.refresh(user)
+    assert user.next_check_due_at == (active_at + timedelta(hours=12)).replace(microsecond=0)
+    assert await pulse_engine.run_inactivity_check(db_session) == []
+
+
+@pytest.mark.asyncio
+async def test_sweep_waits_out_heartbeat_staleness(db_session):
+    """Due within the last HEARTBEAT_MAX_STALENESS_SECONDS → not judged yet."""
+    staleness = settings.HEARTBEAT_MAX_STALENESS_SECONDS
+    await _make_user(db_session, hours_idle=12 + staleness / 2 / 3600)
+    late = await _make_user(db_session, hours_idle=12 + staleness * 2 / 3600)
+
+    events = await pulse_engine.run_inactivity_check(db_session)
+
+    assert [e.user_id for e in events] == [late.id]
+    watermark = await watermark_service.get_watermark(db_session, "pulse_sweep")
+    assert watermark <= datetime.utcnow() - timedelta(seconds=staleness)
@@ -0,0 +1,158 @@
+"""Tests for keyset-paginated activity history (in-memory SQLite)."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.deps import get_current_user
+from app.db.session import get_db
+from app.main import app
+from app.models.activity_signal import ActivitySignal, SignalType
+from app.models.guardian import Guardian
+from app.services import activity_rollup, signal_service
+
+
+async def _signals(db, user, timestamps, signal_type=SignalType.HEARTBEAT):
+    rows = [
+        ActivitySignal(id=uuid4(), user_id=user.id, signal_type=signal_type, timestamp=ts)
+        for ts in timestamps
+    ]
+    db.add_all(rows)
+    await db.commit()
+    return rows
+
+
+@pytest.mark.asyncio
+async def test_raw_pages_walk_history_without_gaps_or_repeats(db_session, make_user):
+    user = await make_user()
+    base = datetime(2026, 10, 1, 12, 0)
+    # Duplicate timestamps: ties must be broken by id across page borders.
+    rows = await _signals(
+        db_session, user, [base + timedelta(minutes=i // 2) for i in range(11)]
+    )
+    await _signals(db_session, await make_user(), [base])
+
+    seen: list[UUID] = []
+    cursor = None
+    pages = 0
+    while True:
+        page = await signal_service.get_signal_history(db_session, user.id, cursor=cursor, limit=4)
+        seen.extend(s.id for s in page.signals)
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    expected = sorted(rows, key=lambda r: (r.timestamp, r.id), reverse=True)
+    assert seen == [r.id for r in expected]
+    assert pages == 3
+
+
+@pytest.mark.asyncio
+async def test_raw_history_filters_by_type_and_since(db_session, make_user):
+    user = await make_user()
+    base = datetime(2026, 10, 1, 12, 0)
+    await _signals(db_session, user, [base, base + timedelta(hours=2)])
+    opens = await _signals(
+        db_session, user, [base + timedelta(hours=1), base + timedelta(hours=3)], SignalType.APP_OPEN
+    )
+
+    page = await signal_service.get_signal_history(
+        db_session,
+        user.id,
+        signal_types=[SignalType.APP_OPEN],
+        since=base + timedelta(minutes=90),
+    )
+
+    assert [s.id for s in page.signals] == [opens[1].id]
+    assert page.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_bucketed_history_reads_rollups(db_session, make_user):
+    user = await make_user()
+    await _signals(
+        db_session,
+        user,
+        [
+            datetime(2026, 10, 14, 9, 5),
+            datetime(2026, 10, 15, 9, 5),
+            datetime(2026, 10, 15, 9, 40),
+            datetime(2026, 10, 16, 22, 0),
+        ],
+    )
+    await _signals(db_session, user, [datetime(2026, 10, 16, 8, 0)], SignalType.APP_OPEN)
+    await activity_rollup.roll_up(db_session, datetime(2026, 10, 17, 0, 30))
+
+    cursor = signal_service.encode_cursor(datetime(2026, 10, 17))
+    page = await signal_service.get_signal_history(
+        db_session, user.id, cursor=cursor, limit=2, resolution="day"
+    )
+    assert [(b.start, b.total) for b in page.buckets] == [
+        (datetime(2026, 10, 16), 2),
+        (datetime(2026, 10, 15), 2),
+    ]
+    assert page.buckets[0].counts == {SignalType.APP_OPEN: 1, SignalType.HEARTBEAT: 1}
+
+    older = await signal_service.get_signal_history(
+        db_session, user.id, cursor=page.next_cursor, limit=2, resolution="day"
+    )
+    assert [(b.start, b.total) for b in older.buckets] == [(datetime(2026, 10, 14), 1)]
+    assert older.next_cursor is None
+
+    hourly = await signal_service.get_signal_history(
+        db_session,
+        user.id,
+        cursor=cursor,
+        limit=48,
+        resolution="hour",
+        signal_types=[SignalType.HEARTBEAT],
+    )
+    assert [(b.start, b.total) for b in hourly.buckets] == [
+        (datetime(2026, 10, 16, 22), 1),
+        (datetime(2026, 10, 15, 9), 2),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_malformed_cursor_is_rejected(db_session, make_user):
+    user = await make_user()
+    with pytest.raises(HTTPException) as exc:
+        await signal_service.get_signal_history(db_session, user.id, cursor="not-a-cursor")
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_history_endpoint_guardian_access(async_client, db_session, make_user):
+    ward = await make_user()
+    guardian = await make_user()
+    stranger = await make_user()
+    db_session.add(Guardian(ward_id=ward.id, guardian_id=guardian.id, created_at=datetime.utcnow()))
+    await db_session.commit()
+    await _signals(db_session, ward, [datetime.utcnow() - timedelta(minutes=5)])
+
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        app.dependency_overrides[get_current_user] = lambda: guardian
+        resp = await async_client.get(
+            "/api/v1/signal/history",
+            params={"ward_id": str(ward.id)},
+            headers={"Authorization": "Bearer test"},
+        )
+        assert resp.status_code == 200
+        body = resp.json()
+        assert [s["user_id"] for s in body["signals"]] == [str(ward.id)]
+        assert body["next_cursor"] is None
+
+        app.dependency_overrides[get_current_user] = lambda: stranger
+        resp = await async_client.get(
+            "/api/v1/signal/history",
+            params={"ward_id": str(ward.id)},
+            headers={"Authorization": "Bearer test"},
+        )
+        assert resp.status_code == 404
+    finally:
+        app.dependency_overrides = {}
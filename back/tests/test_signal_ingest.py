@@ -0,0 +1,136 @@
+"""Tests for the bulk activity-signal ingest queue (in-memory SQLite)."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.db.session import get_db
+from app.main import app
+from app.models.activity_signal import ActivitySignal, SignalType
+from app.models.user import User
+from app.services import signal_service
+from app.services.heartbeat_buffer import HeartbeatBuffer
+from app.services.signal_ingest import QueuedSignal, SignalIngestQueue
+
+
+def _signals(user_id, n: int) -> list[QueuedSignal]:
+    base = datetime.utcnow()
+    return [
+        QueuedSignal.new(user_id, SignalType.HEARTBEAT, base + timedelta(seconds=i))
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_in_batches(db_session, sqlite_engine):
+    user = User(id=uuid4(), email="ingest@inrem.test", password_hash="x")
+    db_session.add(user)
+    await db_session.commit()
+    queue = SignalIngestQueue(max_size=100, batch_size=4)
+    queue.submit(_signals(user.id, 3))
+    assert not queue.ready.is_set()
+    queue.submit(_signals(user.id, 7))
+    assert queue.ready.is_set()
+
+    inserts: list[str] = []
+
+    def _count(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("INSERT"):
+            inserts.append(statement)
+
+    event.listen(sqlite_engine.sync_engine, "before_cursor_execute", _count)
+    try:
+        assert await queue.flush(db_session) == 10
+    finally:
+        event.remove(sqlite_engine.sync_engine, "before_cursor_execute", _count)
+
+    assert len(inserts) == 3  # 4 + 4 + 2, one multi-row INSERT each
+    assert len(queue) == 0 and not queue.ready.is_set()
+    count = await db_session.scalar(select(func.count()).select_from(ActivitySignal))
+    assert count == 10
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_with_503():
+    queue = SignalIngestQueue(max_size=5, batch_size=100)
+    queue.submit(_signals(uuid4(), 4))
+
+    with pytest.raises(HTTPException) as exc:
+        queue.submit(_signals(uuid4(), 2))
+
+    assert exc.value.status_code == 503
+    assert exc.value.headers["Retry-After"] == "1"
+    assert len(queue) == 4  # all or nothing
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_goes_back_to_the_front():
+    queue = SignalIngestQueue(max_size=100, batch_size=3)
+    signals = _signals(uuid4(), 5)
+    queue.submit(signals)
+    db = AsyncMock()
+    db.get_bind = MagicMock()
+    db.get_bind.return_value.dialect.name = "sqlite"
+    db.execute.side_effect = RuntimeError("db down")
+
+    with pytest.raises(RuntimeError):
+        await queue.flush(db)
+
+    assert len(queue) == 5
+    assert queue._take() == signals[:3]
+
+
+@pytest.mark.asyncio
+async def test_poison_row_is_dropped_after_max_attempts(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "SIGNAL_INGEST_MAX_ATTEMPTS", 2)
+    user = User(id=uuid4(), email="poison@inrem.test", password_hash="x")
+    db_session.add(user)
+    await db_session.commit()
+    queue = SignalIngestQueue(max_size=100, batch_size=3)
+    [written] = _signals(user.id, 1)
+    queue.submit([written])
+    assert await queue.flush(db_session) == 1
+
+    # The same row again (e.g. a redelivered signal): the DB rejects it.
+    signals = _signals(user.id, 5)
+    signals[1] = written
+    queue.submit(signals)
+    for _ in range(2):
+        with pytest.raises(IntegrityError):
+            await queue.flush(db_session)
+        assert len(queue) == 5
+
+    # Row by row: the bad row is dropped, everything behind it is written.
+    assert await queue.flush(db_session) == 4
+    assert len(queue) == 0
+    count = await db_session.scalar(select(func.count()).select_from(ActivitySignal))
+    assert count == 5
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_endpoint_applies_backpressure(async_client, monkeypatch):
+    user = User(id=uuid4(), email="hb@inrem.test", is_active=True)
+    buffer = HeartbeatBuffer()
+    monkeypatch.setattr(signal_service, "signal_ingest_queue", SignalIngestQueue(max_size=1))
+    monkeypatch.setattr(signal_service, "heartbeat_buffer", buffer)
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_db] = lambda: AsyncMock()
+    try:
+        ok = await async_client.post("/api/v1/signal/heartbeat", json={})
+        rejected = await async_client.post("/api/v1/signal/heartbeat", json={})
+    finally:
+        app.dependency_overrides = {}
+
+    assert ok.status_code == 200
+    assert rejected.status_code == 503
+    assert rejected.headers["Retry-After"] == "1"
+    # Only the accepted heartbeat moved last_active_at.
+    assert buffer.pending_last_active(user.id).isoformat() == ok.json()["last_active_at"]
@@ -0,0 +1,67 @@
+"""Tests for activity_signals partition maintenance / retention."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from app.models.activity_signal import SignalClientKey
+from app.models.user import User
+from app.services import signal_retention
+from app.services.signal_retention import (
+    add_months,
+    closed_partitions,
+    expired_partitions,
+    partition_month,
+    partition_name,
+)
+
+
+def test_partition_names_round_trip():
+    month = datetime(2026, 1, 1)
+    assert partition_name(month) == "activity_signals_y2026m01"
+    assert partition_month("activity_signals_y2026m01") == month
+    assert partition_month("activity_signals_legacy") is None
+    assert add_months(datetime(2026, 11, 1), 3) == datetime(2027, 2, 1)
+    assert add_months(datetime(2026, 1, 1), -13) == datetime(2024, 12, 1)
+
+
+def test_expired_and_closed_partitions():
+    now = datetime(2026, 10, 17, 12, 0)
+    names = [partition_name(add_months(datetime(2025, 6, 1), i)) for i in range(20)]
+    names.append("activity_signals_something_else")
+
+    # 13 full months kept before October 2026 → September 2025 and later stay.
+    assert expired_partitions(names, now, 13) == [
+        "activity_signals_y2025m06",
+        "activity_signals_y2025m07",
+        "activity_signals_y2025m08",
+    ]
+    closed = closed_partitions(names, now)
+    assert closed[-1] == "activity_signals_y2026m09"
+    assert "activity_signals_y2026m10" not in closed
+
+
+@pytest.mark.asyncio
+async def test_retention_prunes_old_client_keys_and_skips_ddl_on_sqlite(
+    db_session, sqlite_engine
+):
+    user = User(id=uuid4(), email="keys@inrem.test", password_hash="x")
+    db_session.add(user)
+    now = datetime.utcnow()
+    db_session.add_all(
+        [
+            SignalClientKey(user_id=user.id, client_key="old", created_at=now - timedelta(days=9)),
+            SignalClientKey(user_id=user.id, client_key="recent", created_at=now - timedelta(days=2)),
+        ]
+    )
+    await db_session.commit()
+
+    result = await signal_retention.run_retention(sqlite_engine, db_session, now)
+
+    assert (result.created, result.dropped, result.brin_indexed) == ([], [], [])
+    assert result.client_keys_pruned == 1
+    keys = (await db_session.execute(select(SignalClientKey.client_key))).scalars().all()
+    assert keys == ["recent"]
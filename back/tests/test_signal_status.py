@@ -57,14 +57,11 @@ async def test_status_reflects_pending_deletion(async_client, override_deps, moc
 
 
 @pytest.mark.asyncio
-async def test_status_does_not_call_record_heartbeat(async_client, override_deps):
+async def test_status_does_not_buffer_a_heartbeat(async_client, override_deps):
     """Polling endpoint must not register a new activity signal."""
     from unittest.mock import patch
 
-    with patch(
-        "app.services.signal_service.record_heartbeat",
-        new=AsyncMock(),
-    ) as svc:
+    with patch("app.services.signal_service.buffer_heartbeat") as svc:
         resp = await async_client.get(
             "/api/v1/signal/status",
             headers={"Authorization": "Bearer test"},
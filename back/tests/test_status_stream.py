@@ -0,0 +1,175 @@
+"""Tests for the push-based status stream (in-process hub, SSE body)."""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.core.security import access_token_expires_at, create_access_token, create_refresh_token
+from app.db.session import get_db
+from app.main import app
+from app.models.pulse_event import PulseStage, PulseStatus
+from app.models.user import User
+from app.services import status_stream
+from app.services.heartbeat_buffer import HeartbeatBuffer
+from app.services.status_stream import StatusHub, StatusUpdate, status_hub
+
+
+def _activity(user_id, at):
+    return StatusUpdate(user_id, "activity", {"last_active_at": at})
+
+
+@pytest.mark.asyncio
+async def test_subscription_keeps_latest_update_per_kind():
+    hub = StatusHub()
+    user_id = uuid4()
+    with hub.subscribe(user_id) as subscription:
+        hub.publish(_activity(user_id, "a"))
+        hub.publish(_activity(user_id, "b"))
+        hub.publish(StatusUpdate(user_id, "pulse", {"status": "OPEN"}))
+        hub.publish(_activity(uuid4(), "other user"))
+
+        updates = await subscription.next(timeout=1)
+        assert updates == [("activity", {"last_active_at": "b"}), ("pulse", {"status": "OPEN"})]
+        # Nothing new → keepalive tick.
+        assert await subscription.next(timeout=0.01) == []
+        assert hub.count(user_id) == 1
+    assert hub.count(user_id) == 0
+    assert len(hub) == 0
+
+
+def test_payload_round_trip():
+    update = StatusUpdate(uuid4(), "pulse", {"event_id": "e", "status": "OPEN", "stage": None})
+    assert StatusUpdate.from_payload(update.to_payload()) == update
+
+
+@pytest.mark.asyncio
+async def test_remote_mode_queues_for_the_bridge():
+    hub = StatusHub()
+    user_id = uuid4()
+    with hub.subscribe(user_id) as subscription:
+        hub.set_remote(True)
+        hub.publish(_activity(user_id, "a"))
+        hub.publish(_activity(user_id, "b"))
+        assert hub.outgoing_ready.is_set()
+        # Not delivered until it comes back from NOTIFY.
+        assert await subscription.next(timeout=0.01) == []
+        assert hub.take_outgoing() == [_activity(user_id, "b")]
+        assert not hub.outgoing_ready.is_set()
+
+        # Bridge drops: anything still queued is delivered locally.
+        hub.publish(_activity(user_id, "c"))
+        hub.set_remote(False)
+        assert await subscription.next(timeout=0.01) == [("activity", {"last_active_at": "c"})]
+        hub.publish(_activity(user_id, "d"))
+        assert await subscription.next(timeout=0.01) == [("activity", {"last_active_at": "d"})]
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_flush_publishes_activity(db_session):
+    now = datetime.utcnow().replace(microsecond=0)
+    user = User(
+        id=uuid4(),
+        email=f"{uuid4().hex[:8]}@inrem.test",
+        password_hash="x",
+        last_active_at=now - timedelta(hours=1),
+    )
+    db_session.add(user)
+    await db_session.commit()
+
+    buffer = HeartbeatBuffer()
+    buffer.add(user.id, now)
+    with status_hub.subscribe(user.id) as subscription:
+        await buffer.flush(db_session)
+        [(kind, data)] = await subscription.next(timeout=1)
+    assert kind == "activity"
+    assert data["last_active_at"] == now.isoformat()
+
+
+@pytest.mark.asyncio
+async def test_sse_events_snapshot_then_updates(monkeypatch):
+    monkeypatch.setattr(settings, "STATUS_STREAM_KEEPALIVE_SECONDS", 0.01)
+    user_id = uuid4()
+    event_id = uuid4()
+    stream = status_stream.sse_events(user_id, {"last_active_at": None, "pulse": None})
+
+    first = await stream.__anext__()
+    assert first.startswith("retry: 5000\nevent: status\n")
+    assert status_hub.count(user_id) == 1
+
+    assert await stream.__anext__() == ": keepalive\n\n"
+
+    status_stream.publish_pulse(user_id, event_id, PulseStatus.OPEN, PulseStage.SOFT_CHECK)
+    chunk = await stream.__anext__()
+    name, data = chunk.split("\n")[:2]
+    assert name == "event: pulse"
+    assert json.loads(data.removeprefix("data: ")) == {
+        "event_id": str(event_id),
+        "status": "open",
+        "stage": "soft_check",
+    }
+
+    await stream.aclose()
+    assert status_hub.count(user_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_limits_connections_per_user(async_client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "STATUS_STREAM_MAX_PER_USER", 1)
+    user = User(id=uuid4(), email=f"{uuid4().hex[:8]}@inrem.test", password_hash="x")
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        with status_hub.subscribe(user.id):
+            resp = await async_client.get(
+                "/api/v1/signal/stream",
+                headers={"Authorization": "Bearer test"},
+            )
+        assert resp.status_code == 429
+    finally:
+        app.dependency_overrides = {}
+
+
+@pytest.mark.asyncio
+async def test_sse_events_close_once_no_longer_authorized(monkeypatch):
+    monkeypatch.setattr(settings, "STATUS_STREAM_KEEPALIVE_SECONDS", 0.01)
+    user_id = uuid4()
+    checks = iter([True, False])
+
+    async def authorized() -> bool:
+        return next(checks)
+
+    stream = status_stream.sse_events(user_id, {"pulse": None}, authorized)
+    await stream.__anext__()
+    assert await stream.__anext__() == ": keepalive\n\n"
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+    assert status_hub.count(user_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_authorization_rechecks_token_and_user(db_session, sqlite_engine, monkeypatch):
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.api.v1 import signal
+
+    monkeypatch.setattr(signal, "async_session", async_sessionmaker(sqlite_engine))
+    user = User(
+        id=uuid4(), email=f"{uuid4().hex[:8]}@inrem.test", password_hash="x", is_active=True
+    )
+    db_session.add(user)
+    await db_session.commit()
+
+    expires_at = access_token_expires_at(create_access_token(user.id))
+    assert expires_at > datetime.utcnow() + timedelta(minutes=29)
+    assert access_token_expires_at(create_refresh_token(user.id)) is None
+
+    assert await signal._stream_authorized(user.id, expires_at)
+    assert not await signal._stream_authorized(user.id, datetime.utcnow() - timedelta(seconds=1))
+    user.is_active = False
+    await db_session.commit()
+    assert not await signal._stream_authorized(user.id, expires_at)